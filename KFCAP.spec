@@ -0,0 +1,67 @@
+# -*- mode: python ; coding: utf-8 -*-
+"""
+PyInstaller build of KFCAP, used by build.sh.
+
+    pyinstaller --clean --noconfirm KFCAP.spec               # dist/KFCAP(.exe), one file
+    pyinstaller --clean --noconfirm KFCAP.spec -- --onedir   # dist/KFCAP/, one folder
+
+A --onefile executable unpacks the whole bundle to a temporary folder on every launch,
+the --onedir build starts from the unpacked folder. benchmarks/bench_startup.py times both.
+"""
+import argparse
+import os
+import sys
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--onedir", action="store_true", help="Build a folder instead of a single executable")
+options = parser.parse_args()
+
+ROOT = os.path.abspath(SPECPATH)
+sys.path.insert(0, ROOT)
+
+# Regenerate src/utils/parsetab.py if the grammar changed, frozen builds only read it
+from src.utils.parsing import ConditionParser
+ConditionParser(write_tables=True)
+
+# Installed in the build environment (requirements.txt) but never imported by the app
+EXCLUDES = [
+    "astroid", "black", "Cython", "IPython", "isort", "matplotlib", "mypy", "PIL",
+    "pylint", "pytest", "responses", "scipy", "yaml",
+    # Optional pandas backends
+    "pyarrow", "sqlalchemy", "tables", "numba", "xlrd",
+    # Test suites shipped inside the packages
+    "numpy.tests", "pandas.tests",
+]
+
+# yacc imports the tables by name, which the import analysis cannot see
+HIDDEN_IMPORTS = ["src.utils.parsetab"]
+
+# Stripping needs binutils, which Windows builds do not have
+STRIP = sys.platform != "win32"
+
+VERSION_FILE = os.path.join(ROOT, "pyinstaller_version.txt")
+
+a = Analysis(
+    [os.path.join(ROOT, "run.py")],
+    pathex=[ROOT, os.path.join(ROOT, "src")],
+    hiddenimports=HIDDEN_IMPORTS,
+    excludes=EXCLUDES,
+    # Not 2: PLY reads the grammar from the p_ docstrings
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe_options = dict(
+    name="KFCAP",
+    icon=os.path.join(ROOT, "icons", "science.ico"),
+    version=VERSION_FILE if os.path.exists(VERSION_FILE) else None,
+    console=False,
+    strip=STRIP,
+    upx=False,
+)
+
+if options.onedir:
+    exe = EXE(pyz, a.scripts, [], exclude_binaries=True, **exe_options)
+    coll = COLLECT(exe, a.binaries, a.datas, strip=STRIP, upx=False, name="KFCAP")
+else:
+    exe = EXE(pyz, a.scripts, a.binaries, a.datas, [], **exe_options)
@@ -0,0 +1,74 @@
+"""Benchmark the row-wise and vectorized deviation checks at 1k, 10k and 100k rows.
+
+Run from the repository root:
+    python benchmarks/bench_check_deviations.py
+"""
+import os
+import sys
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.alert import Alert
+from src.utils.alert_handling import check_deviations
+
+SIZES = [1_000, 10_000, 100_000]
+
+
+def make_records(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    bp_right = rng.normal(130, 30, n_rows).round()
+    bp_right[rng.random(n_rows) < 0.05] = np.nan
+    return pd.DataFrame({
+        'record_id': [f"ID{i}" for i in range(n_rows)],
+        'wbc_109l': rng.normal(7, 3, n_rows).round(1),
+        'plt_109l': rng.normal(260, 80, n_rows).round(),
+        'hgb_gl': rng.normal(140, 20, n_rows).round(),
+        'mcv_fl': rng.normal(90, 8, n_rows).round(),
+        'bp_right_sys': bp_right,
+        'bp_left_sys': rng.normal(130, 30, n_rows).round(),
+    })
+
+
+def make_project():
+    project_instance = Mock()
+    project_instance.record_label_field = 'record_id'
+    project_instance.alerts = [
+        Alert("Lab", {
+            "wbc_109l": {"condition": "not empty, < 3.5, > 12", "reference_interval": "3.5 < x < 12.0"},
+            "plt_109l": {"condition": "not empty, < 145, > 387", "reference_interval": "145.0 < x < 387.0"},
+            "hgb_gl": {"condition": "not empty, < 117, > 170", "reference_interval": "117.0 < x < 170.0"},
+            "mcv_fl": {"condition": "not empty, < 80, > 100", "reference_interval": "80.0 < x < 100.0"},
+        }, True),
+        Alert("Blood pressure", {
+            "bp_right_sys": {"condition": "not empty, < 80, > 180, abs(bp_right_sys - bp_left_sys) > 20", "reference_interval": "80.0 < x < 180.0"},
+            "bp_left_sys": {"condition": "not empty, < 80, > 180, abs(bp_right_sys - bp_left_sys) > 20", "reference_interval": "80.0 < x < 180.0"},
+        }, True),
+    ]
+    return project_instance
+
+
+def time_call(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    project_instance = make_project()
+    print(f"{'rows':>8} {'row-wise [s]':>14} {'vectorized [s]':>16} {'speed-up':>10}")
+    for n_rows in SIZES:
+        df = make_records(n_rows)
+        rowwise_time, rowwise = time_call(check_deviations, df, project_instance, vectorized=False)
+        vectorized_time, vectorized = time_call(check_deviations, df, project_instance, vectorized=True)
+        assert list(rowwise) == list(vectorized)
+        assert all(set(rowwise[k]) == set(vectorized[k]) for k in rowwise)
+        print(f"{n_rows:>8} {rowwise_time:>14.3f} {vectorized_time:>16.3f} {rowwise_time / vectorized_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
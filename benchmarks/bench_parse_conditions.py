@@ -0,0 +1,68 @@
+"""Benchmark parsing a 500-alert conditions file.
+
+Compares building the PLY lexer and parser for every alert (the previous behaviour)
+with the process wide parser, and with the memoized parse_conditions.
+
+Run from the repository root:
+    python benchmarks/bench_parse_conditions.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.parsing import ConditionParser, cache_info, clear_cache, get_parser, parse_conditions
+
+N_ALERTS = 500
+
+LAB_CONDITION = '''([wbc_109l] <> "" and ([wbc_109l] < 3.5 or [wbc_109l] > 12)) or
+    ([plt_109l] <> "" and ([plt_109l] < 145 or [plt_109l] > 387)) or
+    ([hgb_gl] <> "" and ([hgb_gl] < 117 or [hgb_gl] > 170)) or
+    ([mcv_fl] <> "" and ([mcv_fl] < 80 or [mcv_fl] > 100))'''
+
+BP_CONDITION = '''(([bp_right_sys] <> "" and ([bp_right_sys] < 80 or [bp_right_sys] > 180)) or
+    ([bp_left_sys] <> "" and ([bp_left_sys] < 80 or [bp_left_sys] > 180)) or
+    (abs([bp_right_sys] - [bp_left_sys]) > 20))'''
+
+
+def write_alert_file(path):
+    pd.DataFrame({
+        'alert-title': [f"Alert {i}" for i in range(N_ALERTS)],
+        'alert-condition': [LAB_CONDITION if i % 2 else BP_CONDITION for i in range(N_ALERTS)],
+        'alert-deactivated': ['N'] * N_ALERTS,
+    }).to_csv(path, index=False)
+
+
+def time_per_alert(parse, conditions):
+    start = time.perf_counter()
+    for condition in conditions:
+        parse(condition)
+    return (time.perf_counter() - start) / len(conditions)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'alerts.csv')
+        write_alert_file(path)
+        conditions = pd.read_csv(path)['alert-condition'].tolist()
+
+    # Before: lexer and parser tables built for every alert row
+    before = time_per_alert(lambda condition: ConditionParser(write_tables=False).parse(condition), conditions)
+    # After: the process wide parser is built once
+    after = time_per_alert(get_parser().parse, conditions)
+    # Cached: identical condition strings are parsed once
+    clear_cache()
+    cached = time_per_alert(parse_conditions, conditions)
+
+    print(f"alerts: {len(conditions)}")
+    print(f"per alert, parser built per call: {before * 1e3:8.3f} ms")
+    print(f"per alert, shared parser:         {after * 1e3:8.3f} ms ({before / after:.1f}x)")
+    print(f"per alert, cached parse:          {cached * 1e3:8.3f} ms ({before / cached:.1f}x), {cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
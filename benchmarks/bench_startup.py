@@ -0,0 +1,68 @@
+"""Compare the start-up time of the --onefile and --onedir PyInstaller builds on Linux.
+
+Each artifact is launched with KFCAP_EXIT_AFTER_STARTUP set, so it closes as soon as the
+main menu is shown, and the wall time until the process exits is measured. Needs a
+display; on a headless machine run it under xvfb-run.
+
+Build both artifacts first, then run from the repository root:
+    pyinstaller --clean --noconfirm --distpath dist/onefile KFCAP.spec
+    pyinstaller --clean --noconfirm --distpath dist/onedir KFCAP.spec -- --onedir
+    python benchmarks/bench_startup.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+STARTUP_PROBE_ENV = "KFCAP_EXIT_AFTER_STARTUP"
+
+ARTIFACTS = {
+    "onefile": os.path.join("dist", "onefile", "KFCAP"),
+    "onedir": os.path.join("dist", "onedir", "KFCAP", "KFCAP"),
+}
+
+
+def time_startup(executable, runs):
+    env = dict(os.environ, **{STARTUP_PROBE_ENV: "1"})
+    times = []
+    # The first launch fills the page cache, it is reported separately
+    for _ in range(runs + 1):
+        start = time.perf_counter()
+        subprocess.run([executable], env=env, check=True, timeout=120)
+        times.append(time.perf_counter() - start)
+    return times[0], times[1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--onefile", default=ARTIFACTS["onefile"], help="Path to the --onefile executable")
+    parser.add_argument("--onedir", default=ARTIFACTS["onedir"], help="Path to the executable in the --onedir folder")
+    args = parser.parse_args()
+
+    if not sys.platform.startswith("linux"):
+        parser.error("the builds are compared on Linux")
+
+    medians = {}
+    for variant in ("onefile", "onedir"):
+        executable = getattr(args, variant)
+        if not os.path.exists(executable):
+            print(f"{variant}: {executable} not found, build it first")
+            continue
+        first, times = time_startup(executable, args.runs)
+        medians[variant] = statistics.median(times)
+        print(
+            f"{variant:8} first {first:6.2f} s, median {medians[variant]:6.2f} s, "
+            f"min {min(times):6.2f} s, max {max(times):6.2f} s ({args.runs} runs)"
+        )
+
+    if len(medians) == 2:
+        faster = min(medians, key=medians.get)
+        slower = max(medians, key=medians.get)
+        print(f"{faster} starts {medians[slower] / medians[faster]:.1f}x faster than {slower}")
+
+
+if __name__ == "__main__":
+    main()
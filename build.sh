@@ -1,2 +1,3 @@
 #!/bin/bash
-pyinstaller --onefile --clean --name="KFCAP" --icon=icons/science.ico --noconsole --version-file=pyinstaller_version.txt run.py
\ No newline at end of file
+# Builds dist/KFCAP.exe, or the dist/KFCAP/ folder with --onedir, see KFCAP.spec
+pyinstaller --clean --noconfirm KFCAP.spec -- "$@"
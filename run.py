@@ -1,11 +1,14 @@
+import multiprocessing
 import sys
 import os
 
 # Add the src directory to the system path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-# Run the main application
-from src.GUI.main import main
-
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Worker processes (e.g. read_convert) re-run this script in frozen builds
+    multiprocessing.freeze_support()
+
+    # Run the main application, imported here so worker processes do not open a window
+    from src.GUI.main import main
+    main()
@@ -13,9 +13,12 @@ setup(
     long_description=open("README.md").read(),
     long_description_content_type="text/markdown",
     url="https://github.com/widaeus/KFCAP",
-    packages=find_packages(where="src"),
-    package_dir={"": "src"},
+    # Installed as the src package, the code imports itself as src.*
+    packages=find_packages(include=["src", "src.*"]),
     include_package_data=True,
+    entry_points={
+        "console_scripts": ["kfcap=src.cli:main"],
+    },
     install_requires=[
         "altgraph==0.17.4",
         "certifi==2024.8.30",
@@ -26,10 +29,12 @@ setup(
         "idna==3.10",
         "iniconfig==2.0.0",
         "numpy==2.1.2",
+        "openpyxl==3.1.5",
         "packaging==24.1",
         "pandas==2.2.3",
         "pefile==2023.2.7",
         "pluggy==1.5.0",
+        "ply==3.11",
         "pyinstaller==6.11.0",
         "pyinstaller-hooks-contrib==2024.9",
         "pytest==8.3.3",
@@ -0,0 +1,154 @@
+"""
+Headless entry point for scheduled imports and alert runs, installed as the kfcap command.
+
+    kfcap import DATA_PATH [--force-full] [--report FILE]
+    kfcap alerts ALERTS_CSV [--alert TITLE ...] [--report FILE]
+    kfcap export ALERTS_CSV OUTPUT [--alert TITLE ...]
+
+The API token is read from --token or the KFCAP_API_TOKEN environment variable. Reports
+are written as CSV when the file name ends in .csv, as JSON otherwise, or as JSON to stdout
+without --report. Nothing here imports customtkinter or tkinter, and pandas and the REDCap
+client are only imported once a command runs.
+"""
+import argparse
+import json
+import os
+import sys
+
+# The bundled redcap package imports itself as 'redcap', as in run.py
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.alert_handling import load_csv, check_deviations, create_alerts_from_dataframe, find_study_id, DeviationRecords
+from src.utils.parsing import load_cache, save_cache
+from src.utils.reader_prep import import_data
+from src.utils.token_validation import API_URL
+
+TOKEN_ENV = 'KFCAP_API_TOKEN'
+
+
+def write_report(report, table, path=None):
+    """
+    Writes report as JSON, to stdout if path is None, or table as CSV if path ends in .csv.
+    """
+    if path is None:
+        json.dump(report, sys.stdout, indent=2, default=str)
+        sys.stdout.write('\n')
+    elif path.lower().endswith('.csv'):
+        table.to_csv(path, index=False)
+    else:
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+def run_alerts(project, alerts_csv, titles=None):
+    """
+    Exports the records and checks them against the alerts of alerts_csv, all alerts
+    unless titles is given. Returns deviating_vars, alerts and redcap_data.
+    """
+    redcap_data = project.export_records(format_type="df")
+
+    csv_df = load_csv(alerts_csv)
+    if titles:
+        csv_df = csv_df[csv_df['alert-title'].isin(titles)]
+    load_cache(alerts_csv)
+    alerts = create_alerts_from_dataframe(csv_df, project)
+    save_cache(alerts_csv)
+
+    deviating_vars = check_deviations(redcap_data, project, titles=[alert.title for alert in alerts])
+    return deviating_vars, alerts, redcap_data
+
+
+def command_import(project, args):
+    import pandas as pd
+
+    imported, duplicates = import_data(args.data_path, project, force_full=args.force_full, return_report=True)
+
+    report = {
+        "imported": imported,
+        "duplicates": {
+            kind: [group._asdict() for group in groups] for kind, groups in duplicates._asdict().items()
+        },
+    }
+    rows = [("imported", label, None, None, None, None) for label in imported]
+    for kind, groups in duplicates._asdict().items():
+        for group in groups:
+            for row, source_file in zip(group.rows, group.source_files):
+                rows.append((kind, group.sample_id, group.scan_date, group.scan_time, row, source_file))
+    table = pd.DataFrame(rows, columns=["status", "sample_id", "scan_date", "scan_time", "row", "source_file"])
+
+    write_report(report, table, args.report)
+    print(f"Imported {len(imported)} records", file=sys.stderr)
+
+
+def command_alerts(project, args):
+    import pandas as pd
+
+    deviating_vars, alerts, _ = run_alerts(project, args.alerts_csv, args.alert)
+
+    report = {
+        "alerts": [alert.title for alert in alerts],
+        "deviations": deviating_vars,
+    }
+    table = pd.DataFrame(
+        [(study_id, variable) for study_id, variables in deviating_vars.items() for variable in variables],
+        columns=[find_study_id(project) or "study_id", "variable"]
+    )
+
+    write_report(report, table, args.report)
+    print(f"{len(deviating_vars)} records with deviations", file=sys.stderr)
+
+
+def command_export(project, args):
+    deviating_vars, alerts, redcap_data = run_alerts(project, args.alerts_csv, args.alert)
+
+    records = DeviationRecords(deviating_vars, alerts, redcap_data, find_study_id(project))
+    records.export(args.output)
+    print(f"Exported {len(records)} records with deviations to {args.output}", file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="kfcap", description="Import OLO data and check alerts in REDCap without the GUI.")
+    parser.add_argument("--token", default=os.environ.get(TOKEN_ENV), help=f"REDCap API token, defaults to ${TOKEN_ENV}")
+    parser.add_argument("--url", default=API_URL, help=f"REDCap API URL, defaults to {API_URL}")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import new or changed OLO data files")
+    import_parser.add_argument("data_path", help="Folder with the OLO exports")
+    import_parser.add_argument("--force-full", action="store_true", help="Import every file, ignoring the import manifest")
+    import_parser.add_argument("--report", help="Write the report to this .json or .csv file instead of stdout")
+    import_parser.set_defaults(func=command_import)
+
+    alerts_parser = subparsers.add_parser("alerts", help="List the records deviating from the alerts")
+    alerts_parser.add_argument("alerts_csv", help="Alert definitions exported from REDCap")
+    alerts_parser.add_argument("--alert", action="append", help="Only check this alert title, can be repeated")
+    alerts_parser.add_argument("--report", help="Write the report to this .json or .csv file instead of stdout")
+    alerts_parser.set_defaults(func=command_alerts)
+
+    export_parser = subparsers.add_parser("export", help="Export the deviation table of the alerts")
+    export_parser.add_argument("alerts_csv", help="Alert definitions exported from REDCap")
+    export_parser.add_argument("output", help="Output .xlsx or .csv file")
+    export_parser.add_argument("--alert", action="append", help="Only check this alert title, can be repeated")
+    export_parser.set_defaults(func=command_export)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.token:
+        parser.error(f"an API token is required, pass --token or set {TOKEN_ENV}")
+
+    try:
+        from src.models.project import redcapProj
+
+        project = redcapProj(api_url=args.url, api_token=args.token)
+        args.func(project, args)
+    except Exception as e:
+        print(f"kfcap {args.command} failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,108 @@
+import operator
+import re
+from enum import Enum
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+
+class Operator(Enum):
+    """Operators that can appear in a parsed alert condition."""
+    NOT_EMPTY = "not empty"
+    LT = "<"
+    GT = ">"
+    LTE = "<="
+    GTE = ">="
+    EQ = "="
+    NOTEQ = "<>"
+    ABS_DIFF_GT = "abs"
+
+    @property
+    def comparison(self):
+        """
+        Returns the comparison function for numeric threshold operators, otherwise None.
+        """
+        return _COMPARISONS.get(self)
+
+
+_COMPARISONS = {
+    Operator.LT: operator.lt,
+    Operator.GT: operator.gt,
+    Operator.LTE: operator.le,
+    Operator.GTE: operator.ge,
+}
+
+_SYMBOLS = {
+    "<": Operator.LT,
+    ">": Operator.GT,
+    "<=": Operator.LTE,
+    ">=": Operator.GTE,
+    "=": Operator.EQ,
+    "<>": Operator.NOTEQ,
+    "!=": Operator.NOTEQ,
+}
+
+_CONDITION_RE = re.compile(r'^(<=|>=|<>|!=|<|>|=)\s*(.*)$')
+_ABS_RE = re.compile(r'^abs\((.*?)-(.*?)\)\s*>\s*(.*)$')
+
+
+class Predicate(NamedTuple):
+    """
+    A single compiled alert condition.
+
+    :param operator: The Operator of the condition.
+    :param threshold: The value compared against, None for "not empty".
+    :param paired_with: The (var1, var2) pair for abs() difference conditions.
+    """
+    operator: Operator
+    threshold: Optional[Union[int, float, str]] = None
+    paired_with: Optional[Tuple[str, str]] = None
+
+    def __str__(self):
+        if self.operator is Operator.NOT_EMPTY:
+            return "not empty"
+        if self.operator is Operator.ABS_DIFF_GT:
+            var1, var2 = self.paired_with
+            return f"abs({var1} - {var2}) > {self.threshold}"
+        return f"{self.operator.value} {self.threshold}"
+
+
+def _to_number(value: str) -> Union[int, float, str]:
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
+
+def compile_condition(condition: str) -> List[Predicate]:
+    """
+    Compiles a comma joined condition string ("not empty, < 3.5, > 12") into predicates.
+    Parts that are not recognised are skipped.
+    """
+    predicates = []
+    for cond in condition.split(', '):
+        cond = cond.strip()
+        abs_match = _ABS_RE.match(cond)
+        if abs_match:
+            var1, var2, threshold = (part.strip() for part in abs_match.groups())
+            predicates.append(Predicate(Operator.ABS_DIFF_GT, _to_number(threshold), (var1, var2)))
+        elif cond == "not empty":
+            predicates.append(Predicate(Operator.NOT_EMPTY))
+        else:
+            match = _CONDITION_RE.match(cond)
+            if match:
+                symbol, threshold = match.groups()
+                predicates.append(Predicate(_SYMBOLS[symbol], _to_number(threshold.strip())))
+    return predicates
+
+
+def format_conditions(predicates: List[Predicate]) -> str:
+    """
+    Returns the comma joined, human-readable form of a list of predicates.
+    """
+    return ', '.join(str(predicate) for predicate in predicates)
+
+
 class Alert:
     def __init__(self, title: str, alert_dict: dict, active: bool):
         """
@@ -9,7 +114,32 @@ class Alert:
         """
         self.title = title
         self.alert_dict = alert_dict
-        self.active = active
+        self._active = active
+        self.predicates = self._compile_predicates(alert_dict)
+
+    @staticmethod
+    def _compile_predicates(alert_dict: dict) -> Dict[str, List[Predicate]]:
+        """
+        Uses the "predicates" of each variable if present, otherwise compiles its "condition" string.
+        """
+        predicates = {}
+        for variable, details in alert_dict.items():
+            if details.get("predicates") is not None:
+                predicates[variable] = list(details["predicates"])
+            else:
+                predicates[variable] = compile_condition(details.get("condition", ""))
+        return predicates
+
+    @property
+    def active(self) -> bool:
+        """
+        Read-only, an AlertManager indexes alerts by it. Change it with AlertManager.set_active().
+        """
+        return self._active
+
+    def _set_active(self, active: bool):
+        # Only for AlertManager.set_active(), which re-indexes the alert around it
+        self._active = active
 
     def __str__(self):
         return (f"Alert Title: {self.title}\n"
@@ -29,20 +159,133 @@ class Alert:
         return self.active
     
 class AlertManager:
+    """
+    The alerts of a project, indexed by title and by variable.
+
+    Titles are not unique, an alert file can have several rows with the same title, so
+    every alert is kept and a title can select several of them. The indexes and the
+    active-only views are updated on add_alert, remove_alert and set_active, so lookups
+    never scan the full alert list.
+    """
+
     def __init__(self):
-        self.alerts = []
+        # Insertion number of each alert, selections are returned in this order
+        self._order: Dict[Alert, int] = {}
+        self._by_title: Dict[str, List[Alert]] = {}
+        self._by_variable: Dict[str, Set[Alert]] = {}
+        self._active: Set[Alert] = set()
+        self._active_by_variable: Dict[str, Set[Alert]] = {}
+        self._added = 0
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        return iter(self.alerts)
+
+    def __contains__(self, title):
+        return title in self._by_title
+
+    @property
+    def alerts(self) -> List[Alert]:
+        return list(self._order)
+
+    @property
+    def active_alerts(self) -> List[Alert]:
+        return self._sorted(self._active)
 
     def add_alert(self, alert: Alert):
-        self.alerts.append(alert)
+        """
+        Adds the alert, keeping any earlier alerts with the same title.
+        """
+        if alert in self._order:
+            return
+        self._order[alert] = self._added
+        self._added += 1
+        self._by_title.setdefault(alert.title, []).append(alert)
+        self._index(alert)
+
+    def remove_alert(self, title: str) -> List[Alert]:
+        """
+        Removes and returns all alerts with this title.
+        """
+        alerts = self._by_title.pop(title, [])
+        for alert in alerts:
+            del self._order[alert]
+            self._unindex(alert)
+        return alerts
 
-    def get_alerts_by_variable(self, variable: str):
+    def set_active(self, title: str, active: bool):
         """
-        Retrieve all alerts containing the specified variable.
+        Activates or deactivates the alerts with this title, raising KeyError if there are none.
         """
-        return [alert for alert in self.alerts if variable in alert.alert_dict.get("variables", [])]
+        for alert in self._by_title[title]:
+            self._unindex(alert)
+            alert._set_active(active)
+            self._index(alert)
 
-    def get_alerts_by_title(self, title: str):
+    def get_alert(self, title: str) -> Optional[Alert]:
+        """
+        The first alert with this title, see get_alerts_by_title() for all of them.
+        """
+        alerts = self._by_title.get(title)
+        return alerts[0] if alerts else None
+
+    def get_alerts_by_variable(self, variable: str, active_only: bool = False) -> List[Alert]:
+        """
+        Retrieve all alerts with a condition on the specified variable.
+        """
+        index = self._active_by_variable if active_only else self._by_variable
+        return self._sorted(index.get(variable, ()))
+
+    def get_alerts_by_title(self, title: str) -> List[Alert]:
         """
         Retrieve all alerts with the specified title.
         """
-        return [alert for alert in self.alerts if alert.title == title]
\ No newline at end of file
+        return list(self._by_title.get(title, []))
+
+    def variables(self, active_only: bool = False) -> List[str]:
+        return list(self._active_by_variable if active_only else self._by_variable)
+
+    def select(self, titles=None, variables=None, active_only: bool = False) -> List[Alert]:
+        """
+        Alerts with one of the titles and a condition on one of the variables, in the
+        order they were added. None selects all titles or all variables.
+        """
+        if titles is not None:
+            candidates = {alert for title in set(titles) for alert in self._by_title.get(title, [])}
+            if active_only:
+                candidates &= self._active
+            if variables is not None:
+                variables = set(variables)
+                candidates = {alert for alert in candidates if not variables.isdisjoint(alert.predicates)}
+        elif variables is not None:
+            index = self._active_by_variable if active_only else self._by_variable
+            candidates = set()
+            for variable in variables:
+                candidates.update(index.get(variable, ()))
+        else:
+            candidates = self._active if active_only else self._order
+        return self._sorted(candidates)
+
+    def _sorted(self, alerts) -> List[Alert]:
+        return sorted(alerts, key=self._order.__getitem__)
+
+    def _index(self, alert: Alert):
+        indexes = [self._by_variable]
+        if alert.active:
+            self._active.add(alert)
+            indexes.append(self._active_by_variable)
+        for index in indexes:
+            for variable in alert.predicates:
+                index.setdefault(variable, set()).add(alert)
+
+    def _unindex(self, alert: Alert):
+        self._active.discard(alert)
+        for index in (self._by_variable, self._active_by_variable):
+            for variable in alert.predicates:
+                alerts = index.get(variable)
+                if alerts is not None:
+                    alerts.discard(alert)
+                    if not alerts:
+                        del index[variable]
@@ -1,14 +1,27 @@
+import os
 from src.redcap import Project
-from src.models.alert import Alert
+from src.models.alert import Alert, AlertManager
+
+# Project structure (metadata, instruments, events, ...) is kept here between sessions
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".kfcap", "cache")
 
 class redcapProj(Project):
-    def __init__(self, api_url, api_token):
-        super().__init__(api_url, api_token)
-        self.alerts = []
+    def __init__(self, api_url, api_token, cache_dir=CACHE_DIR):
+        super().__init__(api_url, api_token, cache_dir=cache_dir)
+        self.alert_manager = AlertManager()
+
+    @property
+    def alerts(self):
+        return self.alert_manager.alerts
 
     def add_alert(self, title, alert_dict, active):
+        # Earlier alerts with the same title are kept, titles are not unique
         alert = Alert(title, alert_dict, active)
-        self.alerts.append(alert)
+        self.alert_manager.add_alert(alert)
+        return alert
+
+    def remove_alert(self, title):
+        return self.alert_manager.remove_alert(title)
 
     def evaluate_alerts(self, data_row):
         triggered_alerts = []
@@ -13,6 +13,7 @@ Other API requests are available, such as exporting users & Form-Event Mappings.
 """
 
 from redcap.project import Project
+from redcap.async_project import AsyncProject
 from redcap.request import _RCRequest, RedcapError
 
 __author__ = "Scott Burns <scott.s.burns@gmail.com>"
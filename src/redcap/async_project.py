@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""asyncio interface to a REDCap Project"""
+
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from redcap.project import Project
+from redcap.request import create_session
+
+# AsyncProject keeps the synchronous Project as the single implementation of
+# payloads and responses. Every public method is exposed as a coroutine that runs
+# the blocking call on a bounded thread pool, sharing one pooled requests Session,
+# so hundreds of calls can be awaited with asyncio.gather.
+
+
+class AsyncProject:
+    """Asynchronous counterpart of `Project` with the same methods as coroutines
+
+    Args:
+        url: API URL to a REDCap server
+        token: API token to a project
+        max_concurrency:
+            Maximum number of requests in flight at once. Also used as the
+            size of the thread pool and of the connection pool
+        **project_kwargs: Passed to `Project`, e.g. verify_ssl, timeout, retry
+
+    Examples:
+        >>> import asyncio
+        >>> async def export_all(proj, record_ids):
+        ...     async with proj:
+        ...         return await asyncio.gather(
+        ...             *(proj.export_records(records=[rid]) for rid in record_ids)
+        ...         )
+        >>> asyncio.run(export_all(AsyncProject(URL, TOKEN), ["1", "2"])) # doctest: +SKIP
+
+        Cached project attributes such as `def_field` or `metadata` are read
+        from the wrapped project and may block on first access; await
+        `prefetch()` to load them off the event loop
+    """
+
+    def __init__(
+        self, url: str, token: str, max_concurrency: int = 8, **project_kwargs
+    ):
+        project_kwargs.setdefault("session", create_session(pool_maxsize=max_concurrency))
+        self.project = Project(url, token, **project_kwargs)
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="redcap"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def __getattr__(self, name: str) -> Any:
+        # read-only attributes (url, token, def_field, ...) come from the project
+        return getattr(self.project, name)
+
+    async def __aenter__(self) -> "AsyncProject":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the thread pool once the pending calls have finished"""
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on the pool, limited to max_concurrency at a time"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def prefetch(self) -> None:
+        """Load the cached project attributes used by most exports"""
+
+        def load():
+            # pylint: disable=pointless-statement
+            self.project.metadata
+            self.project.def_field
+            self.project.is_longitudinal
+            self.project.project_info
+
+        await self._run(load)
+
+
+def _async_method(name: str) -> Callable:
+    """Coroutine wrapper around the Project method `name`"""
+    method = getattr(Project, name)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self._run(getattr(self.project, name), *args, **kwargs)
+
+    return wrapper
+
+
+for _name, _member in inspect.getmembers(Project, inspect.isfunction):
+    if not _name.startswith("_"):
+        setattr(AsyncProject, _name, _async_method(_name))
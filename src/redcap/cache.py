@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""On-disk cache of project structure shared across sessions"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Exports describing the structure of a project. They change rarely, but are
+# needed by almost every session (def_field, forms, is_longitudinal, ...)
+CACHED_CONTENT = (
+    "metadata",
+    "instrument",
+    "event",
+    "arm",
+    "formEventMapping",
+    "repeatingFormsEvents",
+    "version",
+)
+
+# Exports REDCap answers with an error for a classic project. That error is the
+# project's actual structure and cached like a response; any other error
+# (permissions, invalid token, maintenance, rate limits) is not cached
+EMPTY_IN_CLASSIC_PROJECTS = ("event", "arm", "formEventMapping")
+
+
+def is_structure_answer(content: str, error: Any) -> bool:
+    """Whether an error answer to a structure export only means it is empty"""
+    return content in EMPTY_IN_CLASSIC_PROJECTS and "classic project" in str(error).lower()
+
+
+def project_fingerprint(project_info: Dict[str, Any]) -> str:
+    """Hash of the exported project info, used to revalidate cached entries"""
+    encoded = json.dumps(project_info, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class MetadataCache:
+    """Directory of cached structure exports, one JSON file per project
+
+    Entries are stored with the fingerprint of the project info they were
+    exported under. An entry is only used while that fingerprint still matches
+    and it is younger than `max_age`, so a new session needs at most the
+    project info request to know whether the cache is current.
+
+    Note:
+        REDCap does not report a last-modified time for the project design,
+        and design edits made in development mode do not change the project
+        info. `max_age` bounds how long such edits can go unnoticed;
+        `Project.refresh()` drops the entry immediately
+
+    Args:
+        directory: Where cache files are kept, created on first write
+        max_age: Seconds an entry is trusted for, None to only revalidate
+            against the project info
+    """
+
+    def __init__(self, directory: str, max_age: Optional[float] = 86400.0):
+        self.directory = directory
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def _path(self, url: str, project_id: Any) -> str:
+        # project IDs are only unique per server
+        server = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{server}_{project_id}.json")
+
+    def load(self, url: str, project_id: Any, fingerprint: str) -> Dict[str, Any]:
+        """Cached responses for a project, empty if missing, stale or unreadable"""
+        try:
+            with open(self._path(url, project_id), encoding="utf-8") as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return {}
+        if self.max_age is not None and time.time() - entry.get("saved_at", 0) > self.max_age:
+            return {}
+
+        return entry.get("responses", {})
+
+    def save(
+        self, url: str, project_id: Any, fingerprint: str, responses: Dict[str, Any]
+    ) -> None:
+        """Atomically write the responses for a project, errors are ignored"""
+        entry = {"fingerprint": fingerprint, "saved_at": time.time(), "responses": responses}
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+                    json.dump(entry, cache_file)
+                os.replace(tmp_path, self._path(url, project_id))
+            except OSError:
+                # the cache is an optimization, a read-only location is not an error
+                pass
+
+    def invalidate(self, url: str, project_id: Any) -> None:
+        """Remove the entry of a project"""
+        with self._lock:
+            try:
+                os.remove(self._path(url, project_id))
+            except OSError:
+                pass
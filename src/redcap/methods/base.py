@@ -2,10 +2,14 @@
 from __future__ import annotations
 
 import json
+import re
+import threading
+import time
 
 from typing import (
     Any,
     Dict,
+    Iterator,
     List,
     Literal,
     Optional,
@@ -18,16 +22,27 @@ from typing import (
 
 from io import StringIO
 
+from redcap.cache import (
+    CACHED_CONTENT,
+    MetadataCache,
+    is_structure_answer,
+    project_fingerprint,
+)
 from redcap.request import (
     _ContentConfig,
     _RCRequest,
+    _session,
+    DEFAULT_RETRY,
+    DEFAULT_TIMEOUT,
     RedcapError,
     FileUpload,
     Json,
+    RetryPolicy,
 )
 
 if TYPE_CHECKING:
     import pandas as pd
+    from requests import Session
 
 # We're designing class to be lazy by default, and not hit the API unless
 # explicitly requested by the user
@@ -35,6 +50,9 @@ if TYPE_CHECKING:
 # return_type type aliases
 FileMap = Tuple[bytes, dict]
 
+# bytes read at a time when streaming an export to a file
+STREAM_BLOCK_SIZE = 1024 * 1024
+
 
 class Base:
     """Base attributes and methods for the REDCap API"""
@@ -44,16 +62,45 @@ class Base:
         url: str,
         token: str,
         verify_ssl: Union[bool, str] = True,
+        project_info_ttl: Optional[float] = 300.0,
+        session: Optional["Session"] = None,
+        timeout: Any = DEFAULT_TIMEOUT,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+        cache_dir: Optional[str] = None,
+        cache_max_age: Optional[float] = 86400.0,
         **request_kwargs,
     ):
-        """Initialize a Project, validate url and token"""
+        """Initialize a Project, validate url and token
+
+        Args:
+            session:
+                requests Session to send requests with, see
+                `redcap.request.create_session`. By default a process wide
+                session is shared, so concurrent calls reuse its connection pool
+            timeout:
+                Default timeout for every request, as seconds or a
+                (connect, read) tuple. A `timeout` request kwarg takes precedence
+            retry:
+                Retry policy for idempotent requests (exports). Imports,
+                deletes and uploads are never retried. None disables retries
+            cache_dir:
+                Directory to keep metadata, instruments, events, arms, the
+                form-event mapping and repeating forms settings in between
+                sessions, see `redcap.cache.MetadataCache`. None disables it
+            cache_max_age:
+                Seconds a cached entry is used for before it is exported again
+        """
         self._validate_url_and_token(url, token)
         self._url = url
         self._token = token
         self.verify_ssl = verify_ssl
+        # seconds before cached project info is fetched again, None to never expire
+        self.project_info_ttl = project_info_ttl
+        self.session = session if session is not None else _session
+        self.retry = retry
 
         self._validate_request_kwargs(**request_kwargs)
-        self._request_kwargs = request_kwargs
+        self._request_kwargs = {"timeout": timeout, **request_kwargs}
 
         # attributes which require API calls
         self._metadata: Optional[Json] = None
@@ -61,6 +108,17 @@ class Base:
         self._field_names: Optional[List[str]] = None
         self._def_field: Optional[str] = None
         self._is_longitudinal: Optional[bool] = None
+        self._project_info: Optional[Dict[str, Any]] = None
+        self._project_info_fetched_at: Optional[float] = None
+        self._record_label_field: Optional[str] = None
+
+        self.metadata_cache = (
+            MetadataCache(cache_dir, max_age=cache_max_age) if cache_dir else None
+        )
+        self._cached_responses: Optional[Dict[str, Any]] = None
+        self._cached_fingerprint: Optional[str] = None
+        # structure exports may be requested from several worker threads
+        self._cache_lock = threading.Lock()
 
     @property
     def url(self) -> str:
@@ -126,6 +184,69 @@ class Base:
 
         return self._is_longitudinal
 
+    @property
+    def project_info(self) -> Dict[str, Any]:
+        """Project information in JSON format
+
+        Cached on the instance and fetched again once it is older than
+        `project_info_ttl` seconds, or after `refresh()`
+        """
+        if self._project_info is None or self._project_info_expired():
+            payload = self._initialize_payload(content="project", format_type="json")
+            self._cache_project_info(
+                cast(Dict[str, Any], self._call_api(payload, return_type="json"))
+            )
+
+        return cast(Dict[str, Any], self._project_info)
+
+    @property
+    def record_label_field(self) -> Optional[str]:
+        """The field referenced by the project's custom record label
+
+        e.g. 'study_id' for a custom record label of '[study_id]'.
+        None if the project has no custom record label
+        """
+        project_info = self.project_info
+        if self._record_label_field is None:
+            custom_record_label = project_info.get("custom_record_label") or ""
+            match = re.search(r"\[(.*?)\]", custom_record_label)
+            if match:
+                # Sanitize the field name by removing illegal characters
+                self._record_label_field = re.sub(r"[^\w\-]", "", match.group(1))
+
+        return self._record_label_field
+
+    def refresh(self) -> None:
+        """Drop all cached project attributes, they are fetched again on next access
+
+        This includes the on-disk entry of the project in `cache_dir`
+        """
+        if self.metadata_cache is not None:
+            # the entry is keyed by project ID, which a fresh instance has to export first
+            self.metadata_cache.invalidate(self.url, self.project_info.get("project_id"))
+        with self._cache_lock:
+            self._cached_responses = None
+        self._metadata = None
+        self._forms = None
+        self._field_names = None
+        self._def_field = None
+        self._is_longitudinal = None
+        self._project_info = None
+        self._project_info_fetched_at = None
+        self._record_label_field = None
+
+    def _project_info_expired(self) -> bool:
+        """Whether the cached project info is older than project_info_ttl"""
+        if self.project_info_ttl is None or self._project_info_fetched_at is None:
+            return False
+        return time.monotonic() - self._project_info_fetched_at > self.project_info_ttl
+
+    def _cache_project_info(self, project_info: Dict[str, Any]) -> None:
+        """Store freshly exported project info and reset attributes derived from it"""
+        self._project_info = project_info
+        self._project_info_fetched_at = time.monotonic()
+        self._record_label_field = None
+
     @staticmethod
     def _validate_url_and_token(url: str, token: str) -> None:
         """Run basic validation on user supplied url and token"""
@@ -158,6 +279,7 @@ class Base:
             "return_headers",
             "files",
             "file",
+            "stream",
         ]
         unallowed_kwargs = [
             kwarg for kwarg in request_kwargs if kwarg in hardcoded_kwargs
@@ -383,6 +505,23 @@ class Base:
         if format_type != "df":
             return response
 
+        df_kwargs = self._default_df_kwargs(content, df_kwargs, record_type)
+
+        response = cast(str, response)
+
+        buf = StringIO(response)
+        dataframe = self._read_csv(buf, **df_kwargs)
+        buf.close()
+
+        return dataframe
+
+    def _default_df_kwargs(
+        self,
+        content: str,
+        df_kwargs: Optional[Dict[str, Any]] = None,
+        record_type: Literal["flat", "eav"] = "flat",
+    ) -> Dict[str, Any]:
+        """Add the default index_col for the content to the user's df_kwargs"""
         if not df_kwargs:
             df_kwargs = {}
 
@@ -397,13 +536,85 @@ class Base:
                 else:
                     df_kwargs["index_col"] = self.def_field
 
-        response = cast(str, response)
+        return df_kwargs
 
-        buf = StringIO(response)
-        dataframe = self._read_csv(buf, **df_kwargs)
-        buf.close()
+    def _stream_data(
+        self,
+        payload: Dict[str, Any],
+        content: Literal["log", "record", "report"],
+        format_type: Literal["json", "csv", "xml", "df"],
+        df_kwargs: Optional[Dict[str, Any]] = None,
+        record_type: Literal["flat", "eav"] = "flat",
+        stream_to: Optional[str] = None,
+        chunksize: Optional[int] = None,
+    ) -> Union[str, Iterator["pd.DataFrame"]]:
+        """Handle streaming exports, without holding the whole response in memory
 
-        return dataframe
+        Args:
+            payload: Payload to send in POST request
+            content: The 'content' parameter for the API call
+            format_type: The format of the response
+            df_kwargs: Passed to `pandas.read_csv` for each chunk
+            record_type: Database output structure type
+            stream_to:
+                Write the raw response to this file path and return the path
+            chunksize:
+                With format_type 'df', return an iterator of DataFrames
+                with at most this many rows each
+
+        Raises:
+            ValueError: Neither a file path nor a 'df' chunksize was given
+        """
+        if stream_to is None and (format_type != "df" or not chunksize):
+            raise ValueError(
+                "Streaming exports need stream_to, or format_type 'df' with a chunksize"
+            )
+
+        if stream_to is None:
+            # resolve index defaults before the stream is opened
+            df_kwargs = self._default_df_kwargs(content, df_kwargs, record_type)
+
+        response = _RCRequest(
+            url=self.url,
+            payload=payload,
+            config=_ContentConfig(return_empty_json=False, return_bytes=False),
+            session=self.session,
+        ).stream(
+            verify_ssl=self.verify_ssl,
+            retry=self._retry_for(payload),
+            **self._request_kwargs,
+        )
+
+        if stream_to is not None:
+            try:
+                with open(stream_to, "wb") as out:
+                    for block in response.iter_content(chunk_size=STREAM_BLOCK_SIZE):
+                        out.write(block)
+            finally:
+                response.close()
+            return stream_to
+
+        return self._iter_csv_chunks(response, cast(int, chunksize), df_kwargs)
+
+    # pylint: disable=import-outside-toplevel
+    @staticmethod
+    def _iter_csv_chunks(
+        response, chunksize: int, df_kwargs: Dict[str, Any]
+    ) -> Iterator["pd.DataFrame"]:
+        """Parse a streamed csv response into DataFrames of chunksize rows"""
+        import pandas as pd
+        from pandas.errors import EmptyDataError
+
+        try:
+            response.raw.decode_content = True
+            with pd.read_csv(response.raw, chunksize=chunksize, **df_kwargs) as reader:
+                yield from reader
+        except EmptyDataError:
+            return
+        finally:
+            response.close()
+
+    # pylint: enable=import-outside-toplevel
 
     def _call_api(
         self,
@@ -426,6 +637,20 @@ class Base:
             file:
                 File data to send with file-related API requests
         """
+        if self._is_cacheable(payload):
+            return self._call_api_cached(payload, return_type)
+
+        return self._execute(payload, return_type, file)
+
+    def _execute(
+        self,
+        payload: Dict[str, Any],
+        return_type: Literal[
+            "file_map", "json", "empty_json", "count_dict", "ids_list", "str", "int"
+        ],
+        file: Optional[FileUpload] = None,
+    ):
+        """Send the request of _call_api, bypassing the metadata cache"""
         config = _ContentConfig(
             return_empty_json=return_type == "empty_json",
             return_bytes=return_type == "file_map",
@@ -433,10 +658,79 @@ class Base:
 
         return_headers = return_type == "file_map"
 
-        rcr = _RCRequest(url=self.url, payload=payload, config=config)
+        rcr = _RCRequest(
+            url=self.url, payload=payload, config=config, session=self.session
+        )
         return rcr.execute(
             verify_ssl=self.verify_ssl,
             return_headers=return_headers,
             file=file,
+            retry=None if file else self._retry_for(payload),
             **self._request_kwargs,
         )
+
+    def _retry_for(self, payload: Dict[str, Any]) -> Optional[RetryPolicy]:
+        """The retry policy for a payload, None unless the request is idempotent
+
+        Requests carrying data, or with an action other than export
+        (import, delete, ...), change the project and are sent only once.
+        """
+        if "data" in payload or payload.get("action", "export") != "export":
+            return None
+        return self.retry
+
+    def _is_cacheable(self, payload: Dict[str, Any]) -> bool:
+        """Whether a payload is a plain structure export kept in the metadata cache"""
+        return (
+            self.metadata_cache is not None
+            and payload.get("content") in CACHED_CONTENT
+            and set(payload) <= {"token", "content", "format"}
+        )
+
+    def _call_api_cached(
+        self,
+        payload: Dict[str, Any],
+        return_type: Literal["json", "str"],
+    ) -> Union[Json, str]:
+        """Serve a structure export from the metadata cache, exporting it on a miss
+
+        The cache is revalidated whenever the project info it was loaded
+        under changes, i.e. at most once per `project_info_ttl`. Errors that
+        only mean the structure is empty (e.g. no events in a classic project)
+        are cached as well, any other error is raised without being cached
+        """
+        cache = cast(MetadataCache, self.metadata_cache)
+        project_info = self.project_info
+        project_id = project_info.get("project_id")
+        fingerprint = project_fingerprint(project_info)
+        key = f"{payload['content']}.{payload.get('format', '')}"
+
+        with self._cache_lock:
+            if self._cached_responses is None or self._cached_fingerprint != fingerprint:
+                self._cached_responses = cache.load(self.url, project_id, fingerprint)
+                self._cached_fingerprint = fingerprint
+            entry = self._cached_responses.get(key)
+
+        if entry is None:
+            # exported outside the lock, so concurrent exports of other content are not serialized
+            try:
+                entry = {"response": self._execute(payload, return_type)}
+            except RedcapError as exc:
+                # subclasses are connection errors, timeouts and undecodable
+                # responses, only answers from REDCap itself may be kept
+                error = exc.args[0] if exc.args else None
+                if type(exc) is not RedcapError or not is_structure_answer(  # pylint: disable=unidiomatic-typecheck
+                    payload["content"], error
+                ):
+                    raise
+                entry = {"error": error}
+
+            with self._cache_lock:
+                if self._cached_fingerprint == fingerprint and self._cached_responses is not None:
+                    self._cached_responses[key] = entry
+                    cache.save(self.url, project_id, fingerprint, dict(self._cached_responses))
+
+        if "error" in entry:
+            raise RedcapError(entry["error"])
+
+        return entry["response"]
@@ -36,6 +36,8 @@ class Logging(Base):
         begin_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
         df_kwargs: Optional[Dict[str, Any]] = None,
+        stream_to: Optional[str] = None,
+        chunksize: Optional[int] = None,
     ):
         """
         Export the project's logs
@@ -61,6 +63,12 @@ class Logging(Base):
             df_kwargs:
                 Passed to `pandas.read_csv` to control construction of
                 returned DataFrame.
+            stream_to:
+                Stream the response straight into this file path instead of
+                returning it. The path is returned
+            chunksize:
+                With format_type `'df'`, stream the response and return an
+                iterator of DataFrames with at most this many rows each
         Returns:
             Union[str, List[Dict[str, Any]], "pd.DataFrame"]:
                 List of all changes made to this project, including data exports,
@@ -93,6 +101,16 @@ class Logging(Base):
 
                 payload[arg_name] = arg_value
 
+        if stream_to is not None or chunksize is not None:
+            return self._stream_data(
+                payload,
+                content="log",
+                format_type=format_type,
+                df_kwargs=df_kwargs,
+                stream_to=stream_to,
+                chunksize=chunksize,
+            )
+
         return_type = self._lookup_return_type(format_type, request_type="export")
         response = cast(Union[Json, str], self._call_api(payload, return_type))
 
@@ -48,6 +48,9 @@ class ProjectInfo(Base):
 
         response = cast(Union[Json, str], self._call_api(payload, return_type))
 
+        if format_type == "json":
+            self._cache_project_info(cast(Dict[str, Any], response))
+
         return self._return_data(
             response=response,
             content="project",
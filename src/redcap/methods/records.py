@@ -1,5 +1,12 @@
 """REDCap API methods for Project records"""
+import csv
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from io import StringIO
 
 from typing import (
     TYPE_CHECKING,
@@ -8,11 +15,13 @@ from typing import (
     List,
     Literal,
     Optional,
+    Tuple,
     Union,
     cast,
 )
 
 from redcap.methods.base import Base, Json
+from redcap.request import RedcapError
 
 if TYPE_CHECKING:
     import pandas as pd
@@ -70,6 +79,11 @@ class Records(Base):
         decimal_character: Optional[Literal[",", "."]] = None,
         export_blank_for_gray_form_status: Optional[bool] = None,
         df_kwargs: Optional[Dict[str, Any]] = None,
+        stream_to: Optional[str] = None,
+        chunksize: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_workers: int = 4,
+        batch_by: Literal["records", "forms"] = "records",
     ):
         # pylint: disable=line-too-long
         r"""
@@ -139,6 +153,22 @@ class Records(Base):
                 Passed to `pandas.read_csv` to control construction of
                 returned DataFrame.
                 By default, `{'index_col': self.def_field}`
+            stream_to:
+                Stream the response straight into this file path instead of
+                returning it. The path is returned
+            chunksize:
+                With format_type `'df'`, stream the response and return an
+                iterator of DataFrames with at most this many rows each
+            batch_size:
+                Export in batches of this many records (or forms, see `batch_by`)
+                instead of a single request. The record IDs are exported first,
+                then the batches are requested concurrently and combined into
+                the same return value as a single export.
+                Not supported for `'xml'`
+            max_workers:
+                Maximum number of concurrent requests when `batch_size` is set
+            batch_by:
+                Batch by `'records'` or by `'forms'` when `batch_size` is set
         Returns:
             Union[List[Dict[str, Any]], str, pd.DataFrame]: Exported data
 
@@ -176,6 +206,34 @@ class Records(Base):
             ...
         """
         # pylint: enable=line-too-long
+        if batch_size is not None and (stream_to is not None or chunksize is not None):
+            raise ValueError("batch_size cannot be combined with stream_to or chunksize")
+
+        if batch_size is not None:
+            return self._export_records_batched(
+                batch_size=batch_size,
+                max_workers=max_workers,
+                batch_by=batch_by,
+                format_type=format_type,
+                records=records,
+                fields=fields,
+                forms=forms,
+                events=events,
+                raw_or_label=raw_or_label,
+                raw_or_label_headers=raw_or_label_headers,
+                event_name=event_name,
+                record_type=record_type,
+                export_survey_fields=export_survey_fields,
+                export_data_access_groups=export_data_access_groups,
+                export_checkbox_labels=export_checkbox_labels,
+                filter_logic=filter_logic,
+                date_begin=date_begin,
+                date_end=date_end,
+                decimal_character=decimal_character,
+                export_blank_for_gray_form_status=export_blank_for_gray_form_status,
+                df_kwargs=df_kwargs,
+            )
+
         payload: Dict[str, Any] = self._initialize_payload(
             content="record", format_type=format_type, record_type=record_type
         )
@@ -235,6 +293,17 @@ class Records(Base):
         if date_end:
             payload["dateRangeEnd"] = date_end.strftime("%Y-%m-%d %H:%M:%S")
 
+        if stream_to is not None or chunksize is not None:
+            return self._stream_data(
+                payload,
+                content="record",
+                format_type=format_type,
+                df_kwargs=df_kwargs,
+                record_type=record_type,
+                stream_to=stream_to,
+                chunksize=chunksize,
+            )
+
         return_type = self._lookup_return_type(format_type, request_type="export")
         response = cast(Union[Json, str], self._call_api(payload, return_type))
 
@@ -248,6 +317,159 @@ class Records(Base):
 
     # pylint: enable=too-many-locals
 
+    def export_record_ids(
+        self,
+        events: Optional[List[str]] = None,
+        filter_logic: Optional[str] = None,
+        date_begin: Optional[datetime] = None,
+        date_end: Optional[datetime] = None,
+    ) -> List[str]:
+        """
+        Export the unique record IDs of the project, in export order
+
+        Args:
+            events: Only include records with data in these events
+            filter_logic: Filter records using REDCap conditional syntax
+            date_begin: Filter on records created after a date
+            date_end: Filter on records created before a date
+
+        Returns:
+            List[str]: Record IDs
+        """
+        rows = self.export_records(
+            format_type="json",
+            fields=[self.def_field],
+            events=events,
+            filter_logic=filter_logic,
+            date_begin=date_begin,
+            date_end=date_end,
+        )
+        return list(dict.fromkeys(str(row[self.def_field]) for row in rows))
+
+    def _export_records_batched(
+        self,
+        batch_size: int,
+        max_workers: int,
+        batch_by: Literal["records", "forms"],
+        **export_kwargs,
+    ):
+        """Export records in batches over a thread pool and combine the results
+
+        Batches by record are concatenated. Batches by form in a flat export are
+        merged row by row on the record, event and repeat instance columns.
+        """
+        format_type = export_kwargs.pop("format_type")
+        df_kwargs = export_kwargs.pop("df_kwargs")
+        record_type = export_kwargs["record_type"]
+
+        if format_type == "xml":
+            raise ValueError("Batched export does not support format_type 'xml'")
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        # csv batches are combined as text so 'df' is parsed exactly like a single export
+        fetch_format = "json" if format_type == "json" else "csv"
+
+        if batch_by == "records":
+            records = export_kwargs.pop("records") or self.export_record_ids(
+                events=export_kwargs["events"],
+                filter_logic=export_kwargs["filter_logic"],
+                date_begin=export_kwargs["date_begin"],
+                date_end=export_kwargs["date_end"],
+            )
+            batches = [
+                {"records": records[i : i + batch_size]}
+                for i in range(0, len(records), batch_size)
+            ]
+        elif batch_by == "forms":
+            forms = export_kwargs.pop("forms")
+            if isinstance(forms, str):
+                forms = [forms]
+            if not forms:
+                forms = list(dict.fromkeys(self._filter_metadata(key="form_name")))
+            batches = [
+                {"forms": forms[i : i + batch_size]}
+                for i in range(0, len(forms), batch_size)
+            ]
+        else:
+            raise ValueError(f"Invalid batch_by: { batch_by }")
+
+        def export_batch(batch):
+            return self.export_records(
+                format_type=fetch_format, **export_kwargs, **batch
+            )
+
+        if batches:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                responses = list(executor.map(export_batch, batches))
+        else:
+            responses = []
+
+        merge_rows = batch_by == "forms" and record_type == "flat"
+
+        if fetch_format == "json":
+            if merge_rows:
+                return self._merge_record_rows(responses)
+            return [row for response in responses for row in response]
+
+        if merge_rows:
+            response = self._rows_to_csv(
+                self._merge_record_rows(
+                    [list(csv.DictReader(StringIO(text))) for text in responses]
+                )
+            )
+        else:
+            response = self._concat_csv(responses)
+
+        return self._return_data(
+            response=response,
+            content="record",
+            format_type=format_type,
+            df_kwargs=df_kwargs,
+            record_type=record_type,
+        )
+
+    def _merge_record_rows(self, batches: List[List[Dict[str, Any]]]) -> Json:
+        """Merge flat record rows exported in batches of forms into single rows"""
+        key_fields = [
+            self.def_field,
+            "redcap_event_name",
+            "redcap_repeat_instrument",
+            "redcap_repeat_instance",
+        ]
+        merged: Dict[tuple, Dict[str, Any]] = {}
+        for rows in batches:
+            for row in rows:
+                key = tuple(row.get(field) for field in key_fields)
+                merged.setdefault(key, {}).update(row)
+
+        return list(merged.values())
+
+    @staticmethod
+    def _rows_to_csv(rows: Json) -> str:
+        """Write dict rows to a csv string, with the union of their columns"""
+        if not rows:
+            return ""
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        buf = StringIO()
+        writer = csv.DictWriter(buf, fieldnames=columns, restval="", lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+        return buf.getvalue()
+
+    @staticmethod
+    def _concat_csv(responses: List[str]) -> str:
+        """Concatenate csv exports with identical headers, keeping the first header"""
+        if not responses:
+            return ""
+        parts = [responses[0]]
+        for text in responses[1:]:
+            _, _, body = text.partition("\n")
+            if parts[-1] and not parts[-1].endswith("\n"):
+                parts.append("\n")
+            parts.append(body)
+        return "".join(parts)
+
     def import_records(
         self,
         to_import: Union[str, List[Dict[str, Any]], "pd.DataFrame"],
@@ -257,6 +479,10 @@ class Records(Base):
         import_format: Literal["json", "csv", "xml", "df"] = "json",
         date_format: Literal["YMD", "DMY", "MDY"] = "YMD",
         force_auto_number: bool = False,
+        batch_size: Optional[int] = None,
+        batch_bytes: Optional[int] = None,
+        max_workers: int = 1,
+        checkpoint_path: Optional[str] = None,
     ):
         """
         Import data into the REDCap Project
@@ -294,18 +520,48 @@ class Records(Base):
                 of imported records by REDCap. If this is set to true, and auto-numbering
                 for records is enabled for the project, auto-numbering of imported records
                 will be enabled.
+            batch_size:
+                Import in batches of at most this many rows instead of a single
+                request. Not supported for `'xml'`
+            batch_bytes:
+                Import in batches whose serialized data stays below this many
+                bytes. Can be combined with `batch_size`
+            max_workers:
+                Maximum number of batches sent concurrently
+            checkpoint_path:
+                File recording the batches that were imported successfully. If it
+                exists and matches the same data, those batches are skipped, so a
+                failed import can be resumed. Removed once every batch succeeded
 
         Raises:
-            RedcapError: Bad request made, double check field names and other inputs
+            RedcapError: Bad request made, double check field names and other inputs.
+                For batched imports, raised after all batches were attempted if
+                any of them failed
 
         Returns:
-            Union[Dict, str]: response from REDCap API, json-decoded if `return_format` == `'json'`
+            Union[Dict, str]: response from REDCap API, json-decoded if `return_format` == `'json'`.
+            For batched imports, a list with the response of each batch in order
 
         Examples:
             >>> new_record = [{"record_id": 3, "redcap_repeat_instance": 1, "field_1": 1}]
             >>> proj.import_records(new_record)
             {'count': 1}
         """
+        if batch_size is not None or batch_bytes is not None:
+            return self._import_records_batched(
+                to_import=to_import,
+                import_format=import_format,
+                batch_size=batch_size,
+                batch_bytes=batch_bytes,
+                max_workers=max_workers,
+                checkpoint_path=checkpoint_path,
+                return_format_type=return_format_type,
+                return_content=return_content,
+                overwrite=overwrite,
+                date_format=date_format,
+                force_auto_number=force_auto_number,
+            )
+
         payload = self._initialize_import_payload(
             to_import=to_import,
             import_format=import_format,
@@ -326,6 +582,172 @@ class Records(Base):
 
         return response
 
+    # pylint: disable=too-many-locals
+
+    def _import_records_batched(
+        self,
+        to_import: Union[str, List[Dict[str, Any]], "pd.DataFrame"],
+        import_format: Literal["json", "csv", "xml", "df"],
+        batch_size: Optional[int],
+        batch_bytes: Optional[int],
+        max_workers: int,
+        checkpoint_path: Optional[str],
+        **import_kwargs,
+    ) -> List[Any]:
+        """Split the data into batches, import them concurrently and checkpoint progress"""
+        if import_format == "xml":
+            raise ValueError("Batched import does not support import_format 'xml'")
+
+        if import_format == "df":
+            # Serialize once, the same way as a single import, then batch the csv
+            to_import = self._initialize_import_payload(
+                to_import=to_import,
+                import_format="df",
+                return_format_type=import_kwargs["return_format_type"],
+                content="record",
+            )["data"]
+            import_format = "csv"
+
+        if import_format == "csv":
+            header, *rows = list(csv.reader(StringIO(cast(str, to_import))))
+
+            def serialize(batch_rows):
+                buf = StringIO()
+                writer = csv.writer(buf, lineterminator="\n")
+                writer.writerow(header)
+                writer.writerows(batch_rows)
+                return buf.getvalue()
+
+            overhead = len(serialize([]))
+            row_sizes = [len(serialize([row])) - overhead for row in rows]
+        else:
+            rows = list(cast(List[Dict[str, Any]], to_import))
+
+            def serialize(batch_rows):
+                return batch_rows
+
+            overhead = len("[]")
+            row_sizes = [len(json.dumps(row, separators=(",", ":"))) + 1 for row in rows]
+
+        batches = self._split_batches(row_sizes, batch_size, batch_bytes, overhead)
+
+        fingerprint = hashlib.sha256(
+            json.dumps(
+                [serialize(rows), import_format, batches, import_kwargs], default=str
+            ).encode("utf-8")
+        ).hexdigest()
+        completed = self._read_import_checkpoint(checkpoint_path, fingerprint)
+        lock = threading.Lock()
+
+        def import_batch(index):
+            start, end = batches[index]
+            return self.import_records(
+                serialize(rows[start:end]), import_format=import_format, **import_kwargs
+            )
+
+        failures = {}
+        pending = [i for i in range(len(batches)) if str(i) not in completed]
+        if pending:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(import_batch, i): i for i in pending}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        response = future.result()
+                    except RedcapError as err:
+                        failures[index] = err
+                        continue
+                    with lock:
+                        completed[str(index)] = response
+                        self._write_import_checkpoint(
+                            checkpoint_path, fingerprint, completed
+                        )
+
+        if failures:
+            first = min(failures)
+            raise RedcapError(
+                f"{ len(failures) } of { len(batches) } import batches failed "
+                f"(rows { ', '.join(f'{batches[i][0]}-{batches[i][1] - 1}' for i in sorted(failures)) }). "
+                f"First error: { failures[first] }"
+            )
+
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            try:
+                os.remove(checkpoint_path)
+            except OSError as err:
+                print(f"Could not remove import checkpoint { checkpoint_path }: { err }")
+
+        return [completed[str(i)] for i in range(len(batches))]
+
+    # pylint: enable=too-many-locals
+
+    @staticmethod
+    def _split_batches(
+        row_sizes: List[int],
+        batch_size: Optional[int],
+        batch_bytes: Optional[int],
+        overhead: int = 0,
+    ) -> List[Tuple[int, int]]:
+        """Return (start, end) row ranges respecting the row and byte limits
+
+        `overhead` is the size of an empty batch, e.g. the csv header. A row
+        larger than `batch_bytes` on its own is sent as a batch of one.
+        """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+
+        batches = []
+        start = 0
+        size = overhead
+        for i, row_size in enumerate(row_sizes):
+            full = batch_size is not None and i - start >= batch_size
+            too_big = (
+                batch_bytes is not None and i > start and size + row_size > batch_bytes
+            )
+            if full or too_big:
+                batches.append((start, i))
+                start, size = i, overhead
+            size += row_size
+        if start < len(row_sizes):
+            batches.append((start, len(row_sizes)))
+
+        return batches
+
+    @staticmethod
+    def _read_import_checkpoint(
+        checkpoint_path: Optional[str], fingerprint: str
+    ) -> Dict[str, Any]:
+        """Responses of already imported batches, if the checkpoint matches the data"""
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return {}
+        try:
+            with open(checkpoint_path, encoding="utf-8") as checkpoint:
+                state = json.load(checkpoint)
+        except (OSError, ValueError):
+            return {}
+        if state.get("fingerprint") != fingerprint:
+            return {}
+        return dict(state.get("completed", {}))
+
+    @staticmethod
+    def _write_import_checkpoint(
+        checkpoint_path: Optional[str], fingerprint: str, completed: Dict[str, Any]
+    ) -> None:
+        """Atomically record the batches imported so far
+
+        A checkpoint that cannot be written, e.g. in a read-only data folder, only
+        loses the ability to resume, so the import carries on.
+        """
+        if not checkpoint_path:
+            return
+        tmp_path = f"{ checkpoint_path }.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as checkpoint:
+                json.dump({"fingerprint": fingerprint, "completed": completed}, checkpoint)
+            os.replace(tmp_path, checkpoint_path)
+        except OSError as err:
+            print(f"Could not write import checkpoint { checkpoint_path }: { err }")
+
     def delete_records(
         self,
         records: List[str],
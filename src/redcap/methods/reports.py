@@ -19,6 +19,8 @@ class Reports(Base):
         export_checkbox_labels: bool = False,
         csv_delimiter: Literal[",", "tab", ";", "|", "^"] = ",",
         df_kwargs: Optional[Dict[str, Any]] = None,
+        stream_to: Optional[str] = None,
+        chunksize: Optional[int] = None,
     ):
         """
         Export a report of the Project
@@ -49,6 +51,12 @@ class Reports(Base):
                 if checked or it will be blank/empty (no value) if not checked
             csv_delimiter:
                 For the csv format, choose how the csv delimiter.
+            stream_to:
+                Stream the response straight into this file path instead of
+                returning it. The path is returned
+            chunksize:
+                With format_type `'df'`, stream the response and return an
+                iterator of DataFrames with at most this many rows each
 
         Raises:
             ValueError: Unsupported format specified
@@ -82,6 +90,16 @@ class Reports(Base):
             if data:
                 payload[key] = data
 
+        if stream_to is not None or chunksize is not None:
+            return self._stream_data(
+                payload,
+                content="report",
+                format_type=format_type,
+                df_kwargs=df_kwargs,
+                stream_to=stream_to,
+                chunksize=chunksize,
+            )
+
         return_type = self._lookup_return_type(format_type, request_type="export")
         response = cast(Union[Json, str], self._call_api(payload, return_type))
 
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Low-level HTTP functionality"""
 
+import time
 from collections import namedtuple
 from typing import (
     TYPE_CHECKING,
@@ -16,7 +17,9 @@ from typing import (
     overload,
 )
 
-from requests import RequestException, Response, Session
+from requests import ConnectionError as RequestsConnectionError
+from requests import RequestException, Response, Session, Timeout
+from requests.adapters import HTTPAdapter
 
 if TYPE_CHECKING:
     from io import TextIOWrapper
@@ -30,7 +33,60 @@ __copyright__ = "2014, Vanderbilt University"
 
 RedcapError = RequestException
 
-_session = Session()
+RetryPolicy = namedtuple(
+    "RetryPolicy", ["total", "backoff_factor", "max_backoff", "status_forcelist"]
+)
+RetryPolicy.__doc__ = """Retries with exponential backoff for idempotent requests
+
+    total: Number of retries after the first attempt
+    backoff_factor: Seconds to wait before the first retry, doubled for each retry
+    max_backoff: Upper bound on the wait between retries
+    status_forcelist: HTTP status codes that are retried
+"""
+
+DEFAULT_RETRY = RetryPolicy(
+    total=3, backoff_factor=0.5, max_backoff=10.0, status_forcelist=(429, 502, 503, 504)
+)
+NO_RETRY = RetryPolicy(
+    total=0, backoff_factor=0.0, max_backoff=0.0, status_forcelist=()
+)
+# (connect, read) timeout in seconds, read is the longest wait between bytes
+DEFAULT_TIMEOUT = (10, 600)
+
+
+def create_session(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    keep_alive: bool = True,
+) -> Session:
+    """Create a requests Session for the REDCap API
+
+    The connection pool is thread-safe, so one session can be shared by
+    concurrent exports and imports.
+
+    Args:
+        pool_connections: Number of host pools to cache
+        pool_maxsize:
+            Connections kept open per host. Should be at least the
+            number of threads making requests concurrently
+        keep_alive:
+            Reuse connections between requests. If False, every request
+            asks the server to close the connection
+    """
+    session = Session()
+    # retries are handled per request in _RCRequest, only for idempotent calls
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+_session = create_session()
 
 
 class FileUpload(TypedDict):
@@ -155,11 +211,73 @@ class _RCRequest:
         # don't do anything to csv/xml strings
         return response.text
 
+    def _post(
+        self,
+        verify_ssl: Union[bool, str],
+        retry: Optional[RetryPolicy],
+        **kwargs,
+    ) -> Response:
+        """POST the payload, retrying transient failures with exponential backoff
+
+        Connection errors, timeouts and statuses in `retry.status_forcelist`
+        are retried up to `retry.total` times. The last response or exception
+        is returned or raised as is.
+        """
+        if retry is None:
+            retry = NO_RETRY
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(
+                    self.url, data=self.payload, verify=verify_ssl, **kwargs
+                )
+            except (RequestsConnectionError, Timeout):
+                if attempt >= retry.total:
+                    raise
+            else:
+                if attempt >= retry.total or response.status_code not in retry.status_forcelist:
+                    return response
+                response.close()
+
+            time.sleep(min(retry.max_backoff, retry.backoff_factor * 2**attempt))
+            attempt += 1
+
+    def stream(
+        self,
+        verify_ssl: Union[bool, str],
+        retry: Optional[RetryPolicy] = None,
+        **kwargs,
+    ) -> Response:
+        """Send the API request without reading the response body
+
+        Args:
+            verify_ssl: Verify SSL. Can also be a path to CA_BUNDLE
+            retry: Retry policy, None to send the request once
+            **kwargs: passed to requests.request()
+
+        Returns:
+            The open response, to be consumed incrementally (e.g. via
+            `iter_content` or `raw`) and closed by the caller
+
+        Raises:
+            RedcapError: REDCap answered with an error status
+        """
+        response = self._post(verify_ssl, retry, stream=True, **kwargs)
+        if not response.ok:
+            try:
+                raise RedcapError(response.text)
+            finally:
+                response.close()
+
+        return response
+
     def execute(
         self,
         verify_ssl: Union[bool, str],
         return_headers: bool,
         file: Optional[FileUpload],
+        retry: Optional[RetryPolicy] = None,
         **kwargs,
     ):
         """Execute the API request and return data
@@ -170,6 +288,7 @@ class _RCRequest:
                 Whether or not response headers should be returned along
                 with the request content
             file: A file object to send along with the request
+            retry: Retry policy, None to send the request once
             **kwargs: passed to requesets.request() to control
                 the configuration to perform requests to the api
 
@@ -182,9 +301,7 @@ class _RCRequest:
                 Badly formed request i.e record doesn't
                 exist, field doesn't exist, etc.
         """
-        response = self.session.post(
-            self.url, data=self.payload, verify=verify_ssl, files=file, **kwargs
-        )
+        response = self._post(verify_ssl, retry, files=file, **kwargs)
 
         content = self.get_content(
             response,
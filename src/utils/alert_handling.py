@@ -1,53 +1,49 @@
-import pandas as pd
-from typing import List, Dict
-import re
-from src.models.alert import Alert
+from typing import TYPE_CHECKING, List, Dict
+from src.models.alert import Alert, AlertManager, Operator, format_conditions
 from src.models.session_manager import session_manager
 from src.utils.parsing import parse_conditions
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def create_alerts_from_dataframe(df: pd.DataFrame, project_instance) -> List[Alert]:
+
+def create_alerts_from_dataframe(df: "pd.DataFrame", project_instance) -> List[Alert]:
     all_alerts = []
 
+    # Loading a title again replaces all of its earlier alerts, not only the last row
+    for title in df['alert-title'].unique():
+        project_instance.remove_alert(title)
+
     for _, row in df.iterrows():
         title = row['alert-title']
         condition_str = row['alert-condition']
         active = row['alert-deactivated'] == "N"
 
-        parsed_conditions = parse_conditions(condition_str)
-        
+        parsed_conditions = parse_conditions(condition_str, compiled=True)
+
         alert_dict = {}
+
+        def add_predicates(variable, details, paired_with=None):
+            # Append predicates if variable already exists
+            if variable in alert_dict:
+                alert_dict[variable]["predicates"].extend(details["predicates"])
+            else:
+                alert_dict[variable] = {
+                    "predicates": list(details["predicates"]),
+                    "reference_interval": details.get("reference_interval")
+                }
+                if paired_with is not None:
+                    alert_dict[variable]["paired_with"] = paired_with
+            # The condition string is a derived, human-readable view of the predicates
+            alert_dict[variable]["condition"] = format_conditions(alert_dict[variable]["predicates"])
+
         for variable, details in parsed_conditions.items():
             if "," in variable:
                 var1, var2 = [v.strip() for v in variable.split(",")]
-
-                # Append conditions if variable already exists
-                if var1 in alert_dict:
-                    alert_dict[var1]["condition"] += f", {details['conditions']}"
-                else:
-                    alert_dict[var1] = {
-                        "condition": details["conditions"],
-                        "reference_interval": details.get("reference_interval"),
-                        "paired_with": var2
-                    }
-
-                if var2 in alert_dict:
-                    alert_dict[var2]["condition"] += f", {details['conditions']}"
-                else:
-                    alert_dict[var2] = {
-                        "condition": details["conditions"],
-                        "reference_interval": details.get("reference_interval"),
-                        "paired_with": var1
-                    }
+                add_predicates(var1, details, paired_with=var2)
+                add_predicates(var2, details, paired_with=var1)
             else:
-                # Append conditions if variable already exists
-                if variable in alert_dict:
-                    alert_dict[variable]["condition"] += f", {details['conditions']}"
-                else:
-                    alert_dict[variable] = {
-                        "condition": details["conditions"],
-                        "reference_interval": details.get("reference_interval")
-                    }
+                add_predicates(variable, details)
 
         project_instance.add_alert(title, alert_dict, active)
         all_alerts.append(Alert(title, alert_dict, active))
@@ -55,75 +51,330 @@ def create_alerts_from_dataframe(df: pd.DataFrame, project_instance) -> List[Ale
     return all_alerts
 
 
-def check_deviations(df: pd.DataFrame, project_instance) -> Dict[str, List[str]]:
-    """Identify variables with deviation based on dynamic conditions and return variable names with study_id."""
+def check_deviations(df: "pd.DataFrame", project_instance, vectorized: bool = True, titles=None, variables=None,
+                     active_only: bool = False) -> Dict[str, List[str]]:
+    """Identify variables with deviation based on dynamic conditions and return variable names with study_id.
+
+    By default the compiled predicates of every alert are evaluated column-wise over
+    the whole DataFrame. Pass vectorized=False to use the original row-by-row loop.
+    titles, variables and active_only restrict the check to those alerts and variables,
+    looked up in the project's AlertManager indexes.
+
+    Both modes list each record's variables in the order they first appear in the alerts.
+    They differ only on text that is not a number: the vectorized mode treats it as
+    missing for the comparisons, the row-wise loop raises TypeError.
+    """
+    selected = selected_predicates(project_instance, titles, variables, active_only)
+    if vectorized:
+        return check_deviations_vectorized(df, project_instance, selected)
+    return _check_deviations_rowwise(df, project_instance, selected)
+
+
+def selected_predicates(project_instance, titles=None, variables=None, active_only: bool = False) -> List[tuple]:
+    """(variable, predicates) of the selected alerts, in alert order. None selects everything."""
+    manager = getattr(project_instance, 'alert_manager', None)
+    if isinstance(manager, AlertManager):
+        alerts = manager.select(titles, variables, active_only)
+    else:
+        # Plain list of alerts, e.g. a project built outside redcapProj
+        alerts = [
+            alert for alert in project_instance.alerts
+            if (titles is None or alert.title in titles)
+            and (variables is None or not set(variables).isdisjoint(alert.predicates))
+            and (not active_only or alert.active)
+        ]
+    wanted = None if variables is None else set(variables)
+    return [
+        (variable, predicates)
+        for alert in alerts
+        for variable, predicates in alert.predicates.items()
+        if wanted is None or variable in wanted
+    ]
+
+
+def _variable_order(selected) -> Dict[str, int]:
+    """Rank of each variable by its first appearance in the selected predicates, abs() pairs included."""
+    order = {}
+    for variable, predicates in selected:
+        order.setdefault(variable, len(order))
+        for predicate in predicates:
+            for paired in predicate.paired_with or ():
+                order.setdefault(paired, len(order))
+    return order
+
+
+def _check_deviations_rowwise(df: "pd.DataFrame", project_instance, selected=None) -> Dict[str, List[str]]:
+    """Row-by-row reference implementation of check_deviations."""
+    import pandas as pd
+
     deviating_vars = {}
     study_id = find_study_id(project_instance)  # Obtain the record identifier field
+    if selected is None:
+        selected = selected_predicates(project_instance)
+    order = _variable_order(selected)
 
     for _, row in df.iterrows():
         row_deviations = set()  # Use a set to prevent duplicate entries
 
-        for alert in project_instance.alerts:
-            for variable, details in alert.alert_dict.items():
-                condition = details["condition"]
-                conditions = condition.split(', ')
-                is_deviating = False
-
-                for cond in conditions:
-                    # Handle absolute difference condition for paired variables
-                    if cond.startswith('abs('):
-                        var_pair = cond[4:].split(')')[0]
-                        var1, var2 = [v.strip() for v in var_pair.split('-')]
-                        
-                        # Ensure valid data is present for both variables
-                        if pd.isna(row[var1]) or row[var1] == "" or pd.isna(row[var2]) or row[var2] == "":
-                            is_deviating = False
-                            break
-
-                        # Check if absolute difference exceeds threshold
-                        threshold = float(cond.split('>')[1].strip())
-                        if abs(row[var1] - row[var2]) > threshold:
-                            is_deviating = True
-                            row_deviations.update([var1, var2])  # Add both variables to the set
-                            break  # Only append once per condition
-
-                    # Handle non-absolute difference conditions (e.g., '<', '>', 'not empty')
-                    elif 'not empty' in cond:
-                        if row[variable] == "":
-                            is_deviating = False
-                            break
-                    elif '<' in cond:
-                        threshold = float(cond.split('<')[1].strip())
-                        if row[variable] < threshold:
-                            is_deviating = True
-                    elif '>' in cond:
-                        threshold = float(cond.split('>')[1].strip())
-                        if row[variable] > threshold:
-                            is_deviating = True
-
-                # Append single-variable deviations if condition met
-                if is_deviating and not cond.startswith('abs('):
-                    row_deviations.add(variable)
+        for variable, predicates in selected:
+            is_deviating = False
+            ended_on_abs = False
+
+            for predicate in predicates:
+                ended_on_abs = predicate.operator is Operator.ABS_DIFF_GT
+                # Handle absolute difference condition for paired variables
+                if predicate.operator is Operator.ABS_DIFF_GT:
+                    var1, var2 = predicate.paired_with
+
+                    # Ensure valid data is present for both variables
+                    if pd.isna(row[var1]) or row[var1] == "" or pd.isna(row[var2]) or row[var2] == "":
+                        is_deviating = False
+                        break
+
+                    # Check if absolute difference exceeds threshold
+                    if abs(row[var1] - row[var2]) > predicate.threshold:
+                        is_deviating = True
+                        row_deviations.update([var1, var2])  # Add both variables to the set
+                        break  # Only append once per condition
+
+                # Handle non-absolute difference conditions (e.g., '<', '>', 'not empty')
+                elif predicate.operator is Operator.NOT_EMPTY:
+                    if row[variable] == "":
+                        is_deviating = False
+                        break
+                elif predicate.operator.comparison is not None:
+                    if predicate.operator.comparison(row[variable], predicate.threshold):
+                        is_deviating = True
+
+            # Append single-variable deviations if condition met
+            if is_deviating and not ended_on_abs:
+                row_deviations.add(variable)
 
         if row_deviations:
-            deviating_vars[str(row[study_id])] = list(row_deviations)  # Convert set to list
+            deviating_vars[str(row[study_id])] = sorted(row_deviations, key=order.__getitem__)
+
+    return deviating_vars
+
+
+def check_deviations_vectorized(df: "pd.DataFrame", project_instance, selected=None) -> Dict[str, List[str]]:
+    """Column-wise version of check_deviations.
+
+    Each alert variable is evaluated as boolean masks over all rows at once, following the
+    same short-circuit rules as the row-wise loop, and the {study_id: [vars]} result is
+    assembled only for rows that have at least one deviation.
+    """
+    import numpy as np
+    import pandas as pd
+
+    study_id = find_study_id(project_instance)  # Obtain the record identifier field
+    n_rows = len(df)
+    if n_rows == 0:
+        return {}
+    if selected is None:
+        selected = selected_predicates(project_instance)
+
+    numeric_cache = {}
+    empty_cache = {}
+    missing_cache = {}
+
+    def numeric(column):
+        if column not in numeric_cache:
+            numeric_cache[column] = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        return numeric_cache[column]
+
+    def empty(column):
+        if column not in empty_cache:
+            series = df[column]
+            if pd.api.types.is_numeric_dtype(series.dtype):
+                empty_cache[column] = np.zeros(n_rows, dtype=bool)
+            else:
+                empty_cache[column] = (series == "").to_numpy(dtype=bool, na_value=False)
+        return empty_cache[column]
+
+    def missing(column):
+        if column not in missing_cache:
+            missing_cache[column] = df[column].isna().to_numpy() | empty(column)
+        return missing_cache[column]
+
+    # Each contribution is the variables it adds and the rows where it fires, in loop order
+    contributions = []
+    for variable, predicates in selected:
+        running = np.ones(n_rows, dtype=bool)
+        is_deviating = np.zeros(n_rows, dtype=bool)
+        ended_on_abs = np.zeros(n_rows, dtype=bool)
+
+        for predicate in predicates:
+            ended_on_abs[running] = predicate.operator is Operator.ABS_DIFF_GT
+            if predicate.operator is Operator.ABS_DIFF_GT:
+                var1, var2 = predicate.paired_with
+                invalid = missing(var1) | missing(var2)
+                with np.errstate(invalid='ignore'):
+                    hit = ~invalid & (np.abs(numeric(var1) - numeric(var2)) > predicate.threshold)
+                is_deviating[running & invalid] = False
+                pair_hit = running & hit
+                is_deviating |= pair_hit
+                contributions.append(([var1, var2], pair_hit))
+                running &= ~(invalid | hit)
+            elif predicate.operator is Operator.NOT_EMPTY:
+                stop = running & empty(variable)
+                is_deviating[stop] = False
+                running &= ~stop
+            elif predicate.operator.comparison is not None:
+                with np.errstate(invalid='ignore'):
+                    is_deviating |= running & predicate.operator.comparison(numeric(variable), predicate.threshold)
+
+        contributions.append(([variable], is_deviating & ~ended_on_abs))
+
+    if not contributions:
+        return {}
+
+    hits = np.vstack([mask for _, mask in contributions])
+    deviating_rows = np.flatnonzero(hits.any(axis=0))
+
+    # Match the study id formatting of iterrows, which upcasts each row to a common dtype
+    row_dtype = df.iloc[:0].to_numpy().dtype
+    ids = df[study_id].to_numpy(dtype=row_dtype)
+
+    order = _variable_order(selected)
+    deviating_vars = {}
+    for row in deviating_rows:
+        row_deviations = set()
+        for idx in np.flatnonzero(hits[:, row]):
+            row_deviations.update(contributions[idx][0])
+        deviating_vars[str(ids[row])] = sorted(row_deviations, key=order.__getitem__)
 
     return deviating_vars
 
 
 def find_study_id(project):
-    project_info = project.export_project_info()
-    custom_record_label = project_info.get('custom_record_label', '')
+    """Return the field named in the project's custom record label, read from the project's cache."""
+    return project.record_label_field
+
+
+class DeviationRecords:
+    """
+    Variable tables of the deviating records, assembled per study ID on first view.
+
+    Every record shows all variables of the given alerts with its value, the reference
+    interval and whether it deviated. Values are read from one object array of the alert
+    columns, and study IDs are indexed for constant time lookup and search.
+    """
+
+    def __init__(self, deviating_vars: Dict[str, List[str]], alerts: List[Alert], redcap_data: "pd.DataFrame", study_id_field: str):
+        self.study_ids = sorted(deviating_vars.keys())
+        self.deviating_vars = deviating_vars
+        self.study_id_field = study_id_field
+
+        # Variables in first-seen order, a later alert's reference interval wins
+        self.references = {}
+        for alert in alerts:
+            for var_name, details in alert.alert_dict.items():
+                self.references[var_name] = details['reference_interval']
+        self.variables = list(self.references)
+
+        study_id_values = redcap_data[study_id_field].tolist()
+        self._record_rows = {}
+        for row, study_id in enumerate(study_id_values):
+            self._record_rows.setdefault(study_id, row)
+        # Columns missing from the export read as NaN and are shown as N/A
+        self._values = redcap_data.reindex(columns=self.variables).to_numpy(dtype=object)
+
+        self._positions = {self._search_key(study_id): i for i, study_id in enumerate(self.study_ids)}
+        self._rows = {}
+
+    def __len__(self):
+        return len(self.study_ids)
+
+    @staticmethod
+    def _search_key(study_id) -> str:
+        return str(study_id).strip().casefold()
+
+    def find(self, query) -> int:
+        """Position of the study ID matching query (case-insensitive), or -1."""
+        return self._positions.get(self._search_key(query), -1)
+
+    def rows(self, position: int) -> List[tuple]:
+        """(variable, value text, reference interval, deviated) for the study ID at position."""
+        import pandas as pd
+
+        rows = self._rows.get(position)
+        if rows is None:
+            study_id = self.study_ids[position]
+            deviated = set(self.deviating_vars[study_id])
+            record_row = self._record_rows.get(study_id)
+            rows = []
+            for column, var_name in enumerate(self.variables):
+                value = self._values[record_row, column] if record_row is not None else None
+                value_text = str(value) if pd.notna(value) else "N/A"
+                rows.append((var_name, value_text, self.references[var_name], var_name in deviated))
+            self._rows[position] = rows
+        return rows
+
+    def matrix(self):
+        """
+        Values of every study ID x variable as a DataFrame indexed by study ID,
+        and a boolean DataFrame of the same shape marking the deviating cells.
+        """
+        import numpy as np
+        import pandas as pd
+
+        record_rows = np.array([self._record_rows.get(study_id, -1) for study_id in self.study_ids], dtype=int)
+        values = self._values[record_rows] if len(self._values) else np.empty((len(record_rows), len(self.variables)), dtype=object)
+        values[record_rows < 0] = None
+
+        columns = {var_name: i for i, var_name in enumerate(self.variables)}
+        deviated = np.zeros(values.shape, dtype=bool)
+        for i, study_id in enumerate(self.study_ids):
+            for var_name in self.deviating_vars[study_id]:
+                if var_name in columns:
+                    deviated[i, columns[var_name]] = True
+
+        index = pd.Index(self.study_ids, name=self.study_id_field)
+        return (
+            pd.DataFrame(values, index=index, columns=self.variables),
+            pd.DataFrame(deviated, index=index, columns=self.variables),
+        )
+
+    def export(self, file_path: str):
+        """
+        Writes the deviation matrix to .xlsx, with deviating cells in bold red, or to CSV
+        with an extra column listing the deviating variables of each study ID.
+        """
+        import numpy as np
+        import pandas as pd
+
+        values, deviated = self.matrix()
+        if file_path.lower().endswith('.xlsx'):
+            from openpyxl.styles import Font
+
+            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+                values.to_excel(writer, sheet_name='Deviations')
+                sheet = writer.sheets['Deviations']
+                font = Font(bold=True, color='FF0000')
+                # Row 1 holds the header and column A the study IDs
+                for row, column in zip(*np.nonzero(deviated.to_numpy())):
+                    sheet.cell(row=row + 2, column=column + 2).font = font
+        else:
+            values = values.copy()
+            variables = np.array(self.variables, dtype=object)
+            values['deviating_variables'] = [', '.join(variables[mask]) for mask in deviated.to_numpy()]
+            values.to_csv(file_path)
+
+
+def sort_key(value_text: str):
+    """
+    Sort key for displayed values: numbers in numeric order, then text, then N/A.
+    """
+    if value_text == "N/A":
+        return (2, 0, "")
+    try:
+        return (0, float(value_text), "")
+    except ValueError:
+        return (1, 0, value_text.casefold())
 
-    match = re.search(r'\[(.*?)\]', custom_record_label)
-    if match:
-        study_id = match.group(1)
-        # Sanitize study_id by removing illegal characters
-        study_id = re.sub(r'[^\w\-]', '', study_id)
-        return study_id
-    return None
 
+def load_csv(filepath: str) -> "pd.DataFrame":
+    import pandas as pd
 
-def load_csv(filepath: str) -> pd.DataFrame:
     df = pd.read_csv(filepath)
     return df
\ No newline at end of file
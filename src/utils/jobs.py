@@ -0,0 +1,140 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_INTERVAL_MS = 100
+
+# Shared by all runners, windows and their runners are rebuilt on every navigation.
+# Two workers, so a discarded job that is still finishing does not hold up the next one
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="job")
+
+# Stages reported by the alert handling pipeline, render runs on the UI thread
+EXPORT = "export"
+PARSE = "parse"
+EVALUATE = "evaluate"
+RENDER = "render"
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it notices that it has been cancelled."""
+
+
+class Job:
+    """
+    Handle to a background job, passed as first argument to the job function.
+
+    The job function calls report(stage) before each step. report() raises
+    JobCancelled once cancel() has been called, so cancellation takes effect
+    between steps; a request that is already running is allowed to finish.
+    """
+
+    def __init__(self, messages):
+        self._messages = messages
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def report(self, stage, detail=None):
+        if self.cancelled:
+            raise JobCancelled()
+        self._messages.put((self, "progress", (stage, detail)))
+
+
+class JobRunner:
+    """
+    Runs long operations on worker threads and delivers their outcome on the Tk thread.
+
+    Workers only put messages on a queue; the queue is polled with root.after while
+    jobs are running, so all callbacks (on_progress, on_done, on_error, on_cancelled)
+    are called on the UI thread and may update widgets.
+    """
+
+    def __init__(self, root, poll_ms=POLL_INTERVAL_MS, executor=None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._executor = executor if executor is not None else _executor
+        self._messages = queue.Queue()
+        self._callbacks = {}
+        self._after_id = None
+
+    def submit(self, func, *args, on_progress=None, on_done=None, on_error=None, on_cancelled=None):
+        """
+        Starts func(job, *args) in the background and returns the Job.
+        """
+        job = Job(self._messages)
+        self._callbacks[job] = {
+            "progress": on_progress,
+            "done": on_done,
+            "error": on_error,
+            "cancelled": on_cancelled,
+        }
+        self._executor.submit(self._run, job, func, args)
+        if self._after_id is None:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+        return job
+
+    @property
+    def busy(self):
+        return bool(self._callbacks)
+
+    def discard(self):
+        """
+        Cancels all jobs and forgets their callbacks, for when the window that
+        started them is being destroyed.
+        """
+        for job in list(self._callbacks):
+            job.cancel()
+        self._callbacks.clear()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _run(self, job, func, args):
+        try:
+            result = func(job, *args)
+        except JobCancelled:
+            self._messages.put((job, "cancelled", None))
+        except Exception as e:
+            self._messages.put((job, "error", e))
+        else:
+            if job.cancelled:
+                self._messages.put((job, "cancelled", None))
+            else:
+                self._messages.put((job, "done", result))
+
+    def _poll(self):
+        self._after_id = None
+        while True:
+            try:
+                job, kind, payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            self._dispatch(job, kind, payload)
+
+        if self._callbacks:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+
+    def _dispatch(self, job, kind, payload):
+        callbacks = self._callbacks.get(job)
+        if callbacks is None:
+            return
+        if kind != "progress":
+            del self._callbacks[job]
+
+        callback = callbacks[kind]
+        if callback is None:
+            if kind == "error":
+                print(f"Background job failed: {payload}")
+            return
+
+        if kind == "progress":
+            callback(*payload)
+        elif kind == "cancelled":
+            callback()
+        else:
+            callback(payload)
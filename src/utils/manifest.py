@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ImportManifest:
+    """
+    Record of the data files already imported into a REDCap project.
+
+    Stored as JSON, {project key: {file name: {"size", "mtime", "sha256"}}}, so one data
+    folder can be imported into several projects. A file counts as unchanged when its
+    size and mtime match, or when its content hash does (e.g. after a copy that touched
+    the mtime). An unreadable manifest is treated as empty, i.e. everything is imported.
+    """
+
+    def __init__(self, path, project_key):
+        self.path = path
+        self.project_key = str(project_key)
+        self._manifests = {}
+        self._stats = {}
+        try:
+            with open(path) as f:
+                self._manifests = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Ignoring import manifest {path}: {e}")
+        if not isinstance(self._manifests, dict):
+            self._manifests = {}
+        self.entries = self._manifests.setdefault(self.project_key, {})
+
+    def _stat(self, file):
+        if file not in self._stats:
+            stat = os.stat(file)
+            self._stats[file] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": None}
+        return self._stats[file]
+
+    def _hash(self, file):
+        stat = self._stat(file)
+        if stat["sha256"] is None:
+            stat["sha256"] = file_hash(file)
+        return stat["sha256"]
+
+    def changed_files(self, file_list):
+        """
+        Returns the files of file_list that are new or changed since they were recorded.
+        """
+        changed = []
+        for file in file_list:
+            entry = self.entries.get(os.path.basename(file))
+            stat = self._stat(file)
+            if entry and entry["size"] == stat["size"] and entry["mtime"] == stat["mtime"]:
+                continue
+            if entry and entry["size"] == stat["size"] and entry["sha256"] == self._hash(file):
+                # Same content with a new mtime, remember the new mtime
+                entry["mtime"] = stat["mtime"]
+                continue
+            changed.append(file)
+        return changed
+
+    def record(self, file_list):
+        """
+        Marks the files as imported, call save() to persist.
+        """
+        for file in file_list:
+            self._hash(file)
+            self.entries[os.path.basename(file)] = dict(self._stat(file))
+
+    def forget_missing(self, folder):
+        """
+        Drops entries of files no longer in folder.
+        """
+        for name in list(self.entries):
+            if not os.path.exists(os.path.join(folder, name)):
+                del self.entries[name]
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._manifests, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not write import manifest {self.path}: {e}")
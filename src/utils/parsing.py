@@ -1,7 +1,37 @@
-import ply.lex as lex
-import ply.yacc as yacc
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from src.models.alert import Operator, Predicate, format_conditions
+
+_OPERATORS = {
+    '<': Operator.LT,
+    '>': Operator.GT,
+    '<=': Operator.LTE,
+    '>=': Operator.GTE,
+    '=': Operator.EQ,
+    '<>': Operator.NOTEQ,
+    '!=': Operator.NOTEQ,
+}
+_INTERVAL_OPERATORS = (Operator.LT, Operator.GT, Operator.LTE, Operator.GTE, Operator.NOTEQ)
+
+# Frozen (PyInstaller) builds cannot write next to the bundled modules
+WRITE_TABLES = not getattr(sys, 'frozen', False)
+
+
+class ConditionParser:
+    """
+    PLY lexer and parser for REDCap alert conditions.
+
+    The lexer and LALR tables are built once per instance. parse() is guarded by a lock
+    since PLY keeps its lexing and parsing state on the objects, and the parsed
+    conditions are collected in a fresh dictionary for every call.
+    """
 
-def parse_conditions(condition_str):
     # Define tokens for lexing
     tokens = (
         'AND', 'OR', 'EQ', 'NOTEQ', 'GT', 'LT', 'GTE', 'LTE',
@@ -22,53 +52,67 @@ def parse_conditions(condition_str):
     t_ABS = r'abs'
     t_MINUS = r'-'
 
+    # Ignore spaces and newlines
+    t_ignore = ' \t\n'
+
+    def __init__(self, write_tables=WRITE_TABLES):
+        """
+        :param write_tables: Write parsetab.py and parser.out next to this module if the
+            tables have to be regenerated. Disable for read-only or frozen installs.
+        """
+        import ply.lex as lex
+        import ply.yacc as yacc
+
+        self._lock = threading.Lock()
+        self._parsed_data = {}
+        self.lexer = lex.lex(module=self)
+        self.parser = yacc.yacc(
+            module=self,
+            tabmodule='parsetab',
+            outputdir=os.path.dirname(os.path.abspath(__file__)),
+            write_tables=write_tables,
+            debug=write_tables
+        )
+
     # Token functions
-    def t_VAR(t):
+    def t_VAR(self, t):
         r'\[[a-zA-Z_][a-zA-Z0-9_]*\]'
         t.value = t.value[1:-1]  # Strip off brackets
         return t
 
-    def t_NUMBER(t):
+    def t_NUMBER(self, t):
         r'\d+(\.\d+)?'
         t.value = float(t.value) if '.' in t.value else int(t.value)
         return t
 
-    def t_STRING(t):
+    def t_STRING(self, t):
         r'\"[^\"]*\"'
         t.value = t.value.strip('"')
         return t
 
-    # Ignore spaces and newlines
-    t_ignore = ' \t\n'
-
     # Error handling for illegal characters
-    def t_error(t):
+    def t_error(self, t):
         print(f"Illegal character '{t.value[0]}'")
         t.lexer.skip(1)
 
-    # Build the lexer
-    lexer = lex.lex()
-
-    # Data structure to store parsed conditions and intervals
-    parsed_data = {}
-
     # Helper function to add parsed conditions and intervals without logical operators
-    def add_condition(variable, operator, threshold):
+    def add_condition(self, variable, operator, threshold):
+        parsed_data = self._parsed_data
         if variable not in parsed_data:
-            parsed_data[variable] = {"conditions": [], "reference_interval": None}
+            parsed_data[variable] = {"predicates": [], "reference_interval": None}
 
         # Handle the "not empty" condition with <> ""
-        if operator in ['<>', '!='] and threshold == "":
-            condition_str = "not empty"
+        if _OPERATORS[operator] is Operator.NOTEQ and threshold == "":
+            predicate = Predicate(Operator.NOT_EMPTY)
         else:
-            condition_str = f"{operator} {threshold}"
+            predicate = Predicate(_OPERATORS[operator], threshold)
 
-        parsed_data[variable]["conditions"].append(condition_str)
+        parsed_data[variable]["predicates"].append(predicate)
 
         # Calculate numeric reference interval only for numeric conditions
         numeric_conditions = [
-            float(cond.split()[1]) for cond in parsed_data[variable]["conditions"]
-            if any(op in cond for op in ('<', '<=', '>', '>=')) and cond.split()[1].replace('.', '', 1).isdigit()
+            float(pred.threshold) for pred in parsed_data[variable]["predicates"]
+            if pred.operator in _INTERVAL_OPERATORS and isinstance(pred.threshold, (int, float))
         ]
 
         if len(numeric_conditions) > 1:
@@ -76,26 +120,26 @@ def parse_conditions(condition_str):
             parsed_data[variable]["reference_interval"] = f"{min_threshold:.1f} < x < {max_threshold:.1f}"
 
     # Parsing rules
-    def p_expression_logical(p):
+    def p_expression_logical(self, p):
         '''expression : expression AND expression
                       | expression OR expression'''
         p[0] = f"({p[1]} {p[2]} {p[3]})"
 
-    def p_expression_group(p):
+    def p_expression_group(self, p):
         'expression : LPAREN expression RPAREN'
         p[0] = f"({p[2]})"
 
-    def p_expression_condition(p):
+    def p_expression_condition(self, p):
         'expression : condition'
         p[0] = p[1]
 
-    def p_condition_abs(p):
+    def p_condition_abs(self, p):
         'condition : ABS LPAREN VAR MINUS VAR RPAREN GT NUMBER'
         var1, var2, threshold = p[3], p[5], p[8]
-        abs_condition = f"abs({var1} - {var2}) > {threshold}"
-        parsed_data[f"{var1},{var2}"] = {"conditions": [abs_condition], "reference_interval": abs_condition}
+        predicate = Predicate(Operator.ABS_DIFF_GT, threshold, (var1, var2))
+        self._parsed_data[f"{var1},{var2}"] = {"predicates": [predicate], "reference_interval": str(predicate)}
 
-    def p_condition_compare(p):
+    def p_condition_compare(self, p):
         '''condition : VAR EQ NUMBER
                      | VAR GT NUMBER
                      | VAR LT NUMBER
@@ -105,28 +149,240 @@ def parse_conditions(condition_str):
                      | VAR EQ STRING
                      | VAR NOTEQ STRING'''
         variable, operator, threshold = p[1], p[2], p[3]
-        add_condition(variable, operator=operator, threshold=threshold)
+        self.add_condition(variable, operator=operator, threshold=threshold)
         p[0] = f"{variable} {operator} {threshold}"
 
     # Error handling rule
-    def p_error(p):
+    def p_error(self, p):
         if p:
             print(f"Syntax error at '{p.value}'")
         else:
             print("Syntax error at EOF")
 
-    # Build the parser
-    parser = yacc.yacc()
+    def parse(self, condition_str):
+        """
+        Parses a condition string and returns {variable: {"predicates": [...], "reference_interval": ...}}.
+        """
+        with self._lock:
+            self._parsed_data = {}
+            try:
+                self.parser.parse(condition_str, lexer=self.lexer)
+                return self._parsed_data
+            finally:
+                self._parsed_data = {}
 
-    # Parse the input string
-    parser.parse(condition_str)
 
-  # Prepare output
-    output = {}
-    for var, details in parsed_data.items():
-        output[var] = {
-            "conditions": ', '.join(details['conditions']),
-            "reference_interval": details['reference_interval']
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_parser(write_tables=WRITE_TABLES):
+    """
+    Returns the process wide ConditionParser, building it on first use.
+    write_tables only has an effect on the call that builds the parser.
+    """
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = ConditionParser(write_tables=write_tables)
+    return _parser
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_WHITESPACE_OUTSIDE_STRINGS = re.compile(r'"[^"]*"|\s+')
+
+
+def normalize_condition(condition_str):
+    """
+    Collapses whitespace outside of quoted strings so equivalent conditions share a cache key.
+    """
+    return _WHITESPACE_OUTSIDE_STRINGS.sub(
+        lambda m: m.group(0) if m.group(0).startswith('"') else ' ', condition_str
+    ).strip()
+
+
+class ConditionCache:
+    """
+    Bounded LRU cache of parsed conditions keyed by the normalized condition string.
+
+    Entries are stored as {variable: (predicates tuple, reference_interval)} so callers
+    never share mutable state with the cache.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def items(self):
+        with self._lock:
+            return list(self._entries.items())
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_cache = ConditionCache()
+
+
+def cache_info():
+    """
+    Returns hits, misses, maxsize and currsize of the condition parse cache.
+    """
+    return _cache.info()
+
+
+def clear_cache():
+    """
+    Empties the condition parse cache and resets its counters.
+    """
+    _cache.clear()
+
+
+def _parse_cached(condition_str):
+    key = normalize_condition(condition_str)
+    entry = _cache.get(key)
+    if entry is None:
+        parsed_data = get_parser().parse(condition_str)
+        entry = {
+            var: (tuple(details['predicates']), details['reference_interval'])
+            for var, details in parsed_data.items()
+        }
+        _cache.put(key, entry)
+    return entry
+
+
+def _cache_path(csv_path):
+    return f"{csv_path}.conditions-cache.json"
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _csv_condition_keys(csv_path):
+    """
+    Normalized 'alert-condition' values of an alert CSV.
+    """
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        return {normalize_condition(row['alert-condition']) for row in csv.DictReader(f) if row.get('alert-condition')}
+
+
+def save_cache(csv_path):
+    """
+    Writes the parsed conditions of an alert CSV to a JSON file next to it,
+    keyed by the hash of the CSV so edits to the file invalidate it.
+    Only conditions of that CSV which have been parsed are written, not the
+    rest of the process wide cache.
+    """
+    try:
+        keys = _csv_condition_keys(csv_path)
+    except (OSError, KeyError, csv.Error) as e:
+        print(f"Could not write condition cache for {csv_path}: {e}")
+        return
+    entries = {
+        key: {
+            var: {
+                "predicates": [[pred.operator.name, pred.threshold, pred.paired_with] for pred in predicates],
+                "reference_interval": reference_interval
+            }
+            for var, (predicates, reference_interval) in entry.items()
         }
+        for key, entry in _cache.items()
+        if key in keys
+    }
+    try:
+        with open(_cache_path(csv_path), 'w') as f:
+            json.dump({"file_hash": _file_hash(csv_path), "entries": entries}, f)
+    except OSError as e:
+        print(f"Could not write condition cache for {csv_path}: {e}")
+
+
+def load_cache(csv_path):
+    """
+    Loads parsed conditions saved by save_cache into the cache if the alert CSV is unchanged.
+    Returns True if the cache file was used.
+    """
+    path = _cache_path(csv_path)
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path) as f:
+            stored = json.load(f)
+        if stored.get("file_hash") != _file_hash(csv_path):
+            return False
+        for key, entry in stored["entries"].items():
+            _cache.put(key, {
+                var: (
+                    tuple(
+                        Predicate(Operator[operator], threshold, tuple(pair) if pair else None)
+                        for operator, threshold, pair in details["predicates"]
+                    ),
+                    details["reference_interval"]
+                )
+                for var, details in entry.items()
+            })
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Ignoring condition cache {path}: {e}")
+        return False
+    return True
+
+
+def parse_conditions(condition_str, compiled=False):
+    """
+    Parses a REDCap alert condition into conditions per variable.
+
+    By default each variable maps to a comma joined "conditions" string and its
+    "reference_interval". With compiled=True the "predicates" list of Predicate
+    objects is returned in place of the string. Results are memoized per
+    normalized condition string, see cache_info().
+    """
+    entry = _parse_cached(condition_str)
+
+    # Prepare output
+    output = {}
+    for var, (predicates, reference_interval) in entry.items():
+        if compiled:
+            output[var] = {
+                "predicates": list(predicates),
+                "reference_interval": reference_interval
+            }
+        else:
+            output[var] = {
+                "conditions": format_conditions(predicates),
+                "reference_interval": reference_interval
+            }
 
-    return output
\ No newline at end of file
+    return output
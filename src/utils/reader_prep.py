@@ -1,7 +1,76 @@
+import operator
 import os
-import pandas as pd
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import re
+from src.utils.manifest import ImportManifest
+
+# Batched import settings, the checkpoint is written to the data folder so a failed import can resume
+IMPORT_BATCH_SIZE = 200
+IMPORT_MAX_WORKERS = 4
+IMPORT_CHECKPOINT = '.kfcap_import_checkpoint.json'
+# Files already imported, per project, so later imports only read new or changed files
+IMPORT_MANIFEST = '.kfcap_import_manifest.json'
+
+UnitConversion = namedtuple("UnitConversion", ["target", "sources", "heuristic", "decimals", "dtype"])
+UnitConversion.__doc__ = """
+Conversion of one analyte to the unit imported into REDCap.
+
+target: Column name with the target unit.
+sources: (column, operation, operand) for each source unit, the values are made numeric,
+    optionally scaled (e.g. ('*', 10)) and the column is renamed to target.
+heuristic: (comparison, threshold, operation, operand), target values for which
+    the comparison holds are scaled, e.g. ('<', 20, '*', 16) for hgb reported in mmol/L.
+decimals: Decimals to round the target values to.
+dtype: dtype of the target column after rounding.
+"""
+
+_OPERATIONS = {
+    '*': operator.mul,
+    '/': operator.truediv,
+    '<': operator.lt,
+    '>': operator.gt,
+}
+
+UNIT_CONVERSIONS = [
+    UnitConversion("hgb [g/L]", [("hgb [mmol/L]", None, None), ("hgb [g/dL]", '*', 10)], ('<', 20, '*', 16), 0, 'Int64'),
+    UnitConversion("mchc [g/L]", [("mchc [mmol/L]", None, None), ("mchc [g/dL]", '*', 10)], ('<', 150, '*', 16), 0, 'Int64'),
+    UnitConversion("mch [pg]", [("mch [amol]", None, None)], ('>', 100, '/', 64.5), 1, None),
+    UnitConversion("wbc [10^9/L]", [("wbc [10^3/uL]", None, None)], None, None, None),
+    UnitConversion("rbc [10^12/L]", [("rbc [10^6/uL]", None, None)], None, None, None),
+    UnitConversion("plt [10^9/L]", [("plt [10^3/uL]", None, None)], None, 0, 'Int64'),
+    UnitConversion("hct [L/L]", [("hct [%]", '/', 100)], None, 2, None),
+] + [
+    # Neutrophils, Lymphocytes, Monocytes, Eosinophils, and Basophils
+    UnitConversion(f"{leukocyte}[10^9/L]", [(f"{leukocyte}[10^3/uL]", None, None)], None, None, None)
+    for leukocyte in ["neut# ", "lymph# ", "mono# ", "eos# ", "baso# "]
+]
+
+# Rows with the same values in these columns are the same scan
+DUPLICATE_KEY = ['sample_id', 'scan_date', 'scan_time']
+DUPLICATES_LOG = os.path.join('logs', 'duplicates_log.txt')
+
+DuplicateGroup = namedtuple("DuplicateGroup", ["sample_id", "scan_date", "scan_time", "rows", "source_files"])
+DuplicateGroup.__doc__ = """
+Rows of one scan, rows are the row labels of the read data and source_files their files.
+"""
+DuplicateReport = namedtuple("DuplicateReport", ["within_data", "in_redcap"])
+DuplicateReport.__doc__ = """
+Duplicate groups found by clean_olo. within_data are repeated scans in the files read,
+in_redcap scans whose sample, date and time are already stored in REDCap.
+"""
+
+# Seconds a record label -> record ID mapping is reused by match_to_redcap
+RECORD_INDEX_TTL = 300
+# Unknown sample IDs trigger a new export if the mapping is older than this
+RECORD_INDEX_RECHECK_AGE = 5
+_record_index_cache = {}
+_record_index_lock = threading.Lock()
+
+# Upper bound on processes reading OLO exports in read_convert
+READ_MAX_WORKERS = 8
 
 def read_tabular_data(data_path):
     """
@@ -16,6 +85,8 @@ def read_tabular_data(data_path):
     Raises:
     ValueError: If the file format is not supported.
     """
+    import pandas as pd
+
     if data_path.endswith('.csv'):
       df = pd.read_csv(data_path)
     elif data_path.endswith('.xlsx'):
@@ -26,7 +97,7 @@ def read_tabular_data(data_path):
 
 def convert_units_OLO(df):
     """
-    Converts units for OLO data in the given DataFrame.
+    Converts units for OLO data in the given DataFrame, as declared in UNIT_CONVERSIONS.
     
     Parameters:
     df (DataFrame): The pandas DataFrame containing OLO data.
@@ -34,118 +105,99 @@ def convert_units_OLO(df):
     Returns:
     DataFrame: The DataFrame with converted units.
     """
-    # Convert "hgb [mmol/L]" to "hgb [g/L]"
-    if "hgb [mmol/L]" in df.columns:
-        df["hgb [mmol/L]"] = pd.to_numeric(df["hgb [mmol/L]"], errors='coerce')
-        df.rename(columns={"hgb [mmol/L]": "hgb [g/L]"}, inplace=True)
-    
-    # Convert "hgb [g/dL]" to "hgb [g/L]" by multiplying by 10
-    if "hgb [g/dL]" in df.columns:
-        df["hgb [g/dL]"] = pd.to_numeric(df["hgb [g/dL]"], errors='coerce') * 10
-        df.rename(columns={"hgb [g/dL]": "hgb [g/L]"}, inplace=True)
-    
-    # Convert "hgb [g/L]" less than 20 to itself * 16
-    if "hgb [g/L]" in df.columns:
-        df["hgb [g/L]"] = df["hgb [g/L]"].apply(lambda x: x * 16 if x < 20 else x)
-    
-    # Convert "mchc [mmol/L]" to "mchc [g/L]"
-    if "mchc [mmol/L]" in df.columns:
-        df["mchc [mmol/L]"] = pd.to_numeric(df["mchc [mmol/L]"], errors='coerce')
-        df.rename(columns={"mchc [mmol/L]": "mchc [g/L]"}, inplace=True)
-    
-    # Convert "mchc [g/dL]" to "mchc [g/L]" by multiplying by 10
-    if "mchc [g/dL]" in df.columns:
-        df["mchc [g/dL]"] = pd.to_numeric(df["mchc [g/dL]"], errors='coerce') * 10
-        df.rename(columns={"mchc [g/dL]": "mchc [g/L]"}, inplace=True)
-    
-    # Convert "mchc [g/L]" less than 150 to itself * 16
-    if "mchc [g/L]" in df.columns:
-        df["mchc [g/L]"] = df["mchc [g/L]"].apply(lambda x: x * 16 if x < 150 else x)
-    
-    # Convert "mch [amol]" to "mch [pg]"
-    if "mch [amol]" in df.columns:
-        df["mch [amol]"] = pd.to_numeric(df["mch [amol]"], errors='coerce')
-        df.rename(columns={"mch [amol]": "mch [pg]"}, inplace=True)
-    
-    # Convert "mch [pg]" greater than 100 to itself / 64.5
-    if "mch [pg]" in df.columns:
-        df["mch [pg]"] = df["mch [pg]"].apply(lambda x: x / 64.5 if x > 100 else x)
-    
-    # Convert "wbc [10^3/uL]" to "wbc [10^9/L]"
-    if "wbc [10^3/uL]" in df.columns:
-        df["wbc [10^3/uL]"] = pd.to_numeric(df["wbc [10^3/uL]"], errors='coerce')
-        df.rename(columns={"wbc [10^3/uL]": "wbc [10^9/L]"}, inplace=True)
-    
-    # Convert "rbc [10^6/uL]" to "rbc [10^12/L]"
-    if "rbc [10^6/uL]" in df.columns:
-        df["rbc [10^6/uL]"] = pd.to_numeric(df["rbc [10^6/uL]"], errors='coerce')
-        df.rename(columns={"rbc [10^6/uL]": "rbc [10^12/L]"}, inplace=True)
-    
-    # Convert "plt [10^3/uL]" to "plt [10^9/L]"
-    if "plt [10^3/uL]" in df.columns:
-        df["plt [10^3/uL]"] = pd.to_numeric(df["plt [10^3/uL]"], errors='coerce')
-        df.rename(columns={"plt [10^3/uL]": "plt [10^9/L]"}, inplace=True)
-    
-    # Convert "hct [%]" to "hct [L/L]"
-    if "hct [%]" in df.columns:
-        df["hct [%]"] = pd.to_numeric(df["hct [%]"], errors='coerce') / 100
-        df.rename(columns={"hct [%]": "hct [L/L]"}, inplace=True)
-    
-    # Conversions for Neutrophils, Lymphocytes, Monocytes, Eosinophils, and Basophils
-    leukocyte_types = ["neut# ", "lymph# ", "mono# ", "eos# ", "baso# "]
-    for leukocyte in leukocyte_types:
-        full_colname = f"{leukocyte}[10^3/uL]"
-        if full_colname in df.columns:
-            df[full_colname] = pd.to_numeric(df[full_colname], errors='coerce')
-            df.rename(columns={full_colname: f"{leukocyte}[10^9/L]"}, inplace=True)
-            
-    # Apply rounding rules
-    if "plt [10^9/L]" in df.columns:
-        df["plt [10^9/L]"] = df["plt [10^9/L]"].round(0).astype('Int64')
-    
-    if "hgb [g/L]" in df.columns:
-        df["hgb [g/L]"] = df["hgb [g/L]"].round(0).astype('Int64')
-    
-    if "hct [L/L]" in df.columns:
-        df["hct [L/L]"] = df["hct [L/L]"].round(2)
-    
-    if "mch [pg]" in df.columns:
-        df["mch [pg]"] = df["mch [pg]"].round(1)
-    
-    if "mchc [g/L]" in df.columns:
-        df["mchc [g/L]"] = df["mchc [g/L]"].round(0).astype('Int64')
+    import numpy as np
+    import pandas as pd
+
+    for conversion in UNIT_CONVERSIONS:
+        target = conversion.target
+
+        # Convert source units and rename them to the target unit
+        for source, operation, operand in conversion.sources:
+            if source in df.columns:
+                values = pd.to_numeric(df[source], errors='coerce')
+                if operation is not None:
+                    values = _OPERATIONS[operation](values, operand)
+                df[source] = values
+                df.rename(columns={source: target}, inplace=True)
+
+        if target not in df.columns:
+            continue
+
+        # Fix values that are evidently reported in another unit
+        if conversion.heuristic is not None:
+            comparison, threshold, operation, operand = conversion.heuristic
+            values = df[target]
+            mask = _OPERATIONS[comparison](values, threshold).to_numpy(dtype=bool)
+            if mask.any():
+                df[target] = np.where(mask, _OPERATIONS[operation](values, operand), values)
+
+        # Apply rounding rules
+        if conversion.decimals is not None:
+            df[target] = df[target].round(conversion.decimals)
+        if conversion.dtype is not None:
+            df[target] = df[target].astype(conversion.dtype)
     
     return df
 
-def read_convert(data_path):
+def read_convert_file(file):
+    """
+    Reads one OLO export and converts its units, run in the read_convert worker processes.
+    """
+    return convert_units_OLO(read_tabular_data(file))
+
+def list_data_files(data_path):
+    """
+    Returns the .csv and .xlsx files in data_path, sorted by name so the merged
+    data has the same row order on every run.
+    """
+    return sorted(os.path.join(data_path, f) for f in os.listdir(data_path) if f.endswith(('.csv', '.xlsx')))
+
+def read_convert(data_path, max_workers=None):
     """
     Reads and converts OLO data from a given file path.
     Relies on convert_units_OLO in module reader_prep.
     
     Parameters:
     data_path (str): The path to the OLO data file.
+    max_workers (int): Number of processes reading files, defaults to one per CPU
+        up to READ_MAX_WORKERS. 1 reads the files in this process.
     
     Returns:
     DataFrame: A pandas DataFrame containing the converted OLO data.
     """
-    # Create a list of file paths for all .csv and .xlsx files in the specified directory
-    file_list = [os.path.join(data_path, f) for f in os.listdir(data_path) if f.endswith(('.csv', '.xlsx'))]
-    
-    data_list = []
-    differing_columns = {}
+    file_list = list_data_files(data_path)
+    if not file_list:
+        raise ValueError(f"No .csv or .xlsx files found in {data_path}")
+
+    concatenated_data, _ = read_convert_files(file_list, max_workers)
+    return concatenated_data
+
+def read_convert_files(file_list, max_workers=None):
+    """
+    Reads and converts the given OLO files, see read_convert.
     
-    # Read the first file and convert units
-    first_df = read_tabular_data(file_list[0])
-    first_df = convert_units_OLO(first_df)
-    colnames_check = first_df.columns.tolist()
+    Returns:
+    tuple: The concatenated DataFrame and the number of rows read from each file.
+    """
+    import pandas as pd
+
+    if max_workers is None:
+        max_workers = min(len(file_list), os.cpu_count() or 1, READ_MAX_WORKERS)
+
+    # Read every file once, map keeps the results in file order
+    if max_workers > 1 and len(file_list) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            data_list = list(executor.map(read_convert_file, file_list))
+    else:
+        data_list = [read_convert_file(file) for file in file_list]
     
-    for file in file_list:
-        df = read_tabular_data(file)
-        df = convert_units_OLO(df)
+    # The first file's columns are the reference for the others
+    colnames_check = data_list[0].columns.tolist()
+    differing_columns = {}
+    for file, df in zip(file_list, data_list):
         differing_cols = set(df.columns.tolist()) - set(colnames_check)
         if differing_cols:
             differing_columns[file] = list(differing_cols)
-        data_list.append(df)
     
     if differing_columns:
         with open("logs/differing_columns_log.txt", "w") as log_file:
@@ -154,15 +206,126 @@ def read_convert(data_path):
                 log_file.write(f"Differing columns: {', '.join(cols)}\n\n")
         raise ValueError("Column names differ across files. See differing_columns_log.txt for details.")
     
-    # Convert all data to string
-    data_list = [df.astype(str) for df in data_list]
+    # Keep typed columns, with nullable dtypes so missing values stay missing instead of
+    # becoming 'nan' text. Floats stay floats, they are converted to text once, by to_csv on import
+    data_list = [df.convert_dtypes(convert_integer=False) for df in data_list]
     
     # Concatenate all dataframes
     concatenated_data = pd.concat(data_list, ignore_index=True)
     
-    return concatenated_data
+    return concatenated_data, [len(df) for df in data_list]
+
+def _hash_scans(df):
+    """
+    One uint64 hash per row of the DUPLICATE_KEY columns, compared as text.
+    """
+    import pandas as pd
+
+    return pd.util.hash_pandas_object(df[DUPLICATE_KEY].astype('string'), index=False).to_numpy()
+
+def redcap_scan_hashes(project, sample_ids):
+    """
+    Hashes of the (record label, scan_date, scan_time) already stored in REDCap for the
+    records of sample_ids. Only those records are exported, with def_field, scan_date and
+    scan_time, so the cost follows the import rather than the project's history. Empty if
+    the project has no such fields or none of the samples has a record yet.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if not {'scan_date', 'scan_time'} <= set(project.field_names):
+        return np.array([], dtype=np.uint64)
+
+    index = record_label_index(project)
+    labels = {index[sample_id]: sample_id for sample_id in set(sample_ids) if sample_id in index}
+    if not labels:
+        return np.array([], dtype=np.uint64)
+
+    records = project.export_records(
+        format_type='json', records=sorted(labels), fields=[project.def_field, 'scan_date', 'scan_time']
+    )
+    scans = pd.DataFrame(
+        [
+            (labels[str(record[project.def_field])], record['scan_date'], record['scan_time'])
+            for record in records
+            if str(record[project.def_field]) in labels and record.get('scan_date') and record.get('scan_time')
+        ],
+        columns=DUPLICATE_KEY
+    )
+    return _hash_scans(scans)
+
+def find_duplicates(data, project=None, sources=None):
+    """
+    Finds rows with the same sample_id, scan_date and scan_time in one hashed pass.
+    
+    Parameters:
+    data (DataFrame): OLO data with the DUPLICATE_KEY columns.
+    project: If given, rows already stored in REDCap are reported and dropped as well.
+    sources (Series): File name of each row, aligned with data.
+    
+    Returns:
+    tuple: Boolean array of the rows to keep (the first of each group, if not in REDCap)
+        and the DuplicateReport.
+    """
+    import numpy as np
+    import pandas as pd
+
+    hashes = _hash_scans(data)
+    codes, uniques = pd.factorize(hashes)
+    counts = np.bincount(codes, minlength=len(uniques))
+    keep = np.zeros(len(data), dtype=bool)
+    keep[np.unique(codes, return_index=True)[1]] = True
+
+    rows = data.index.to_numpy()
+    files = sources.reindex(data.index).to_numpy() if sources is not None else np.full(len(data), None)
+
+    def group(positions):
+        first = data.iloc[positions[0]]
+        return DuplicateGroup(
+            first['sample_id'], first['scan_date'], first['scan_time'],
+            rows[positions].tolist(), files[positions].tolist()
+        )
+
+    # Positions of each repeated key, in order of first appearance
+    repeated = np.flatnonzero(counts[codes] > 1)
+    repeated = repeated[np.argsort(codes[repeated], kind='stable')]
+    within_data = [group(positions) for positions in np.split(repeated, np.flatnonzero(np.diff(codes[repeated])) + 1) if len(positions)]
 
-def clean_olo(data, project):
+    in_redcap = []
+    if project is not None:
+        sample_ids = data['sample_id'].dropna().astype(str).unique()
+        stored = np.isin(hashes, redcap_scan_hashes(project, sample_ids)) & keep
+        in_redcap = [group(np.flatnonzero(codes == codes[position])) for position in np.flatnonzero(stored)]
+        keep &= ~stored
+
+    return keep, DuplicateReport(within_data, in_redcap)
+
+def format_duplicate_report(report):
+    """
+    Human readable DuplicateReport, one line per duplicate group.
+    """
+    lines = []
+    for title, groups in (("Duplicate rows in the data", report.within_data), ("Already imported into REDCap", report.in_redcap)):
+        if groups:
+            lines.append(f"{title}:")
+            for group in groups:
+                origin = ', '.join(
+                    f"row {row}" + (f" ({os.path.basename(file)})" if file else '') for row, file in zip(group.rows, group.source_files)
+                )
+                lines.append(f"  {group.sample_id} {group.scan_date} {group.scan_time}: {origin}")
+    return '\n'.join(lines)
+
+def write_duplicate_report(report, path=DUPLICATES_LOG):
+    """
+    Appends the DuplicateReport, with a timestamp, to the duplicates log.
+    """
+    if not (report.within_data or report.in_redcap):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as log_file:
+        log_file.write(f"{datetime.now():%Y-%m-%d %H:%M:%S}\n{format_duplicate_report(report)}\n\n")
+
+def clean_olo(data, project, sources=None, return_report=False, skip_imported=True):
     """
     Cleans and fits OLO data for a given project.
     Assumes that REDcap has the appropriate column names for OLO data.
@@ -170,42 +333,36 @@ def clean_olo(data, project):
     Parameters:
     data (DataFrame): The pandas DataFrame containing OLO data.
     project (str): The project identifier, from PyCap.
+    sources (Series): File name of each row, aligned with data, for the duplicate report.
+    return_report (bool): Also return the DuplicateReport of the removed duplicates.
+    skip_imported (bool): Drop scans already stored in REDCap. Disable to overwrite them,
+        e.g. with a corrected file.
     
     Returns:
-    DataFrame: The cleaned and fitted OLO data.
+    DataFrame: The cleaned and fitted OLO data, with the DuplicateReport if return_report.
     """
-    # Fetch project info
-    project_info = project.export_project_info()
-    
+    import pandas as pd
+
+    # Sample IDs are matched to REDCap record labels as text
+    data = data.assign(sample_id=data['sample_id'].astype('string'))
+
     # Remove tests (rows where 'sample_id' contains 'test', case-insensitive)
     data = data[~data['sample_id'].str.contains("test", case=False, na=False)]
     
-    # Convert non-standard NaN values to actual NaN
-    data['reject_reason'] = data['reject_reason'].replace(['nan', 'NaN', 'None', '', ' '], pd.NA)
-
-    # Remove rows where 'reject_reason' is not NaN
-    data = data[data['reject_reason'].isna()]
+    # Remove rows with a reject reason, blank and 'nan'-like text count as none
+    reject_reason = data['reject_reason'].astype('string').str.strip()
+    no_reject_reason = reject_reason.isna() | reject_reason.isin(['', 'nan', 'NaN', 'None'])
+    data = data[no_reject_reason.to_numpy(dtype=bool)].copy()
+    data['reject_reason'] = pd.NA
     
     # Format scan_time to HR:MIN by removing the :SEC part if present
-    data['scan_time'] = data['scan_time'].apply(lambda x: x[:5] if pd.notna(x) and len(x) > 5 else x)
-
-    # If sample_id, scan_date and scan_time are all the same, throw error that contains the sample_id
-    # and remove the rows except 1 of them.
-    duplicates = data[data.duplicated(subset=['sample_id', 'scan_date', 'scan_time'], keep=False)]
-    
-    try:
-        duplicates = data[data.duplicated(subset=['sample_id', 'scan_date', 'scan_time'], keep=False)]
-        
-        if not duplicates.empty:
-            # Get the sample_ids of the duplicates
-            duplicate_sample_ids = duplicates['sample_id'].unique()
-            
-            # Raise an error with the sample_ids
-            raise ValueError(f"Duplicate rows found for sample_ids: {', '.join(map(str, duplicate_sample_ids))}")
-    except ValueError as e:
-        print(e)
-        
-    data = data.drop_duplicates(subset=['sample_id', 'scan_date', 'scan_time'], keep='first')
+    data['scan_time'] = data['scan_time'].astype('string').str.slice(0, 5)
+
+    # Keep one row per sample_id, scan_date and scan_time, and drop scans already in REDCap
+    keep, report = find_duplicates(data, project if skip_imported else None, sources)
+    if report.within_data or report.in_redcap:
+        print(format_duplicate_report(report))
+    data = data[keep]
     
     # Rename special characters
     data.columns = data.columns.str.replace('%', '_percent').str.replace('#', '_number')
@@ -242,8 +399,51 @@ def clean_olo(data, project):
     # Rename columns
     data.columns = new_colnames
 
+    if return_report:
+        return data, report
     return data
 
+def record_label_index(project, max_age=RECORD_INDEX_TTL):
+    """
+    Maps record labels (the custom record label field) to record IDs for a given project.
+    
+    Only def_field and the record label field are exported. The mapping is cached per
+    project and exported again once it is older than max_age seconds.
+    
+    Returns:
+    dict: {record label: record ID}, both as text. The first record wins if labels repeat.
+    """
+    label_field = project.record_label_field
+    if not label_field:
+        raise ValueError("The project has no custom record label to match sample IDs to")
+
+    key = (project.url, project.token)
+    with _record_index_lock:
+        cached = _record_index_cache.get(key)
+        if cached and cached[1] == label_field and time.monotonic() - cached[0] < max_age:
+            return cached[2]
+
+    def_field = project.def_field
+    records = project.export_records(format_type='json', fields=list(dict.fromkeys([def_field, label_field])))
+
+    index = {}
+    for record in records:
+        label = str(record.get(label_field, ''))
+        # Longitudinal projects export one row per event, the label is set on one of them
+        if label and label not in index:
+            index[label] = str(record[def_field])
+
+    with _record_index_lock:
+        _record_index_cache[key] = (time.monotonic(), label_field, index)
+    return index
+
+def clear_record_label_index():
+    """
+    Drops all cached record label mappings.
+    """
+    with _record_index_lock:
+        _record_index_cache.clear()
+
 def match_to_redcap(data_olo, project):
     """
     Matches OLO data to REDcap for a given project.
@@ -253,57 +453,28 @@ def match_to_redcap(data_olo, project):
     project (str): The project identifier.
     
     Returns:
-    DataFrame: The matched data.
+    DataFrame: The matched data, with the record ID and the record label as first columns.
     """
-    # Using PyCap to export records and project info
-    data_redcap = project.export_records(format_type='df')
-    project_info = project.export_project_info()
-    
-    # Extract custom_record_label
-    custom_record_label = project_info.get('custom_record_label', '')
+    sample_ids = data_olo['sample_id'].astype('string')
 
-    # Use regular expression to extract the part inside the brackets
-    match = re.search(r'\[(.*?)\]', custom_record_label)
-    if match:
-        project_record_label = match.group(1)
-    else:
-        project_record_label = None
-
-    # Find the index name of data_redcap
-    index_name = data_redcap.index.name
-    if index_name is None:
-        index_name = 'index'
-        data_redcap.reset_index(inplace=True)
-        
-    # Ensure the index column is included in the DataFrame columns
-    if index_name not in data_redcap.columns:
-        data_redcap[index_name] = data_redcap.index.astype(int)
-    else:
-        data_redcap[index_name] = data_redcap[index_name].astype(int)
-    
-    # Perform a left join on the REDCap data based on sample_id in data_olo and project_record_label in data_redcap
-    data_ammended = pd.merge(
-        data_olo, 
-        data_redcap[[project_record_label, index_name]], 
-        how='left', 
-        left_on='sample_id', 
-        right_on=project_record_label
-    )
-    
-    # Convert index column to integer
-    data_ammended[index_name] = data_ammended[index_name].astype('Int64')
-    
-    # Remove rows where the left join did not find a match
-    data_ammended = data_ammended.dropna(subset=[index_name])
-    
-    # Remove the sample_id column
-    data_ammended = data_ammended.drop(columns=['sample_id'])
-    
-    # Reorder columns to have index_name first, then project_record_label, then the rest
-    cols = [index_name, project_record_label] + [col for col in data_ammended.columns if col not in [index_name, project_record_label]]
-    data_ammended = data_ammended[cols]
+    # Look up the sample IDs in the cached mapping. If some are missing they may have been
+    # registered in REDCap since, so export it again unless it was exported just now
+    index = record_label_index(project)
+    record_ids = sample_ids.map(index)
+    if record_ids.isna().any():
+        index = record_label_index(project, max_age=RECORD_INDEX_RECHECK_AGE)
+        record_ids = sample_ids.map(index)
 
-    return data_ammended
+    project_record_label = project.record_label_field
+    index_name = project.def_field
+
+    # Keep matched rows, the sample_id becomes the record label column
+    matched = record_ids.notna().to_numpy(dtype=bool)
+    data_ammended = data_olo[matched].drop(columns=['sample_id'])
+    data_ammended.insert(0, project_record_label, sample_ids[matched].to_numpy())
+    data_ammended.insert(0, index_name, record_ids[matched].to_numpy())
+
+    return data_ammended.reset_index(drop=True)
 
 def write_to_csv(df):
     """
@@ -333,29 +504,80 @@ def write_to_csv(df):
 
     print(f"Data successfully exported to {file_path}")
     
-def import_data(data_path, project):
+def import_data(data_path, project, progress=None, force_full=False, return_report=False):
     """
     Main function to import data for a given project.
     
+    Only files that are new or changed since the last import into this project are read,
+    see IMPORT_MANIFEST. A file is recorded once all of its rows matched a REDCap record,
+    so rows of samples not yet registered in REDCap are retried on the next import.
+    
     Parameters:
     data_path (str): The path to the data file.
     project (str): The project identifier.
+    progress (callable): Called with the name of each step (read, clean, match, import)
+        before it starts. May raise to stop the import between steps.
+    force_full (bool): Read and import every file, regardless of the manifest, and overwrite
+        scans already stored in REDCap.
+    return_report (bool): Also return the DuplicateReport of clean_olo, which is
+        written to DUPLICATES_LOG either way.
     
     Returns:
-    None
+    list: The record labels of the imported rows, empty if there was nothing new to import.
+    With return_report, a tuple of the list and the DuplicateReport.
     """
+    import numpy as np
+    import pandas as pd
+
+    if progress is None:
+        progress = lambda stage: None
+
+    manifest = ImportManifest(os.path.join(data_path, IMPORT_MANIFEST), project.project_info.get('project_id'))
+
     # Read and convert the data
-    data_olo = read_convert(data_path)
+    progress("read")
+    file_list = list_data_files(data_path)
+    if not force_full:
+        file_list = manifest.changed_files(file_list)
+    if not file_list:
+        return ([], DuplicateReport([], [])) if return_report else []
+    data_olo, row_counts = read_convert_files(file_list)
+    sources = pd.Series(np.repeat(file_list, row_counts), index=data_olo.index)
 
     # Clean and fit the data
-    data_cleaned = clean_olo(data_olo, project)
+    progress("clean")
+    # A full re-import overwrites the scans already in REDCap
+    data_cleaned, duplicate_report = clean_olo(
+        data_olo, project, sources=sources, return_report=True, skip_imported=not force_full
+    )
+    write_duplicate_report(duplicate_report)
 
     # Match the data to REDCap
+    progress("match")
     data_matched = match_to_redcap(data_cleaned, project)
     
-    # Import the data to REDcap
-    project.import_records(data_matched, import_format='df')
+    # Import the data to REDcap in batches, so a bad row only fails its own batch
+    progress("import")
+    if not data_matched.empty:
+        project.import_records(
+            data_matched,
+            import_format='df',
+            batch_size=IMPORT_BATCH_SIZE,
+            max_workers=IMPORT_MAX_WORKERS,
+            checkpoint_path=os.path.join(data_path, IMPORT_CHECKPOINT)
+        )
+
+    # clean_olo keeps the row labels of read_convert_files, which map back to the files
+    unmatched = data_cleaned.index[~data_cleaned['sample_id'].isin(data_matched[project.record_label_field].astype(str))]
+    file_of_row = np.searchsorted(np.cumsum(row_counts), unmatched.to_numpy(), side='right')
+    pending = {file_list[i] for i in file_of_row}
+    manifest.record([file for file in file_list if file not in pending])
+    manifest.forget_missing(data_path)
+    manifest.save()
     
     # Return the values from the second column
     second_column_name = data_matched.columns[1]
-    return data_matched[second_column_name].tolist()
\ No newline at end of file
+    imported = data_matched[second_column_name].tolist()
+    if return_report:
+        return imported, duplicate_report
+    return imported
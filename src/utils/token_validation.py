@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.models.session_manager import session_manager
+
+API_URL = 'https://redcap.ki.se/api/'
+TOKEN_LENGTH = 32
+VALIDATION_DELAY_MS = 400
+POLL_INTERVAL_MS = 50
+
+# Shared by all validators, windows are rebuilt on every navigation
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="token-check")
+
+
+def check_api_token(api_token, api_url=API_URL):
+    """
+    Returns a redcapProj for the token, raising if REDCap rejects it.
+    The session's project instance is reused when it was created for the same token.
+    Blocks on the project info request, so run it off the Tk main thread.
+    """
+    # Imported on first use, the REDCap client and requests are not needed to draw the menu
+    from src.models.project import redcapProj
+
+    project = session_manager.get_project_instance()
+    if project is None or project.token != api_token or project.url != api_url:
+        project = redcapProj(api_url=api_url, api_token=api_token)
+    project.project_info
+    return project
+
+
+class TokenValidator:
+    """
+    Debounced API token validation on a worker thread.
+
+    validate() is called on every keystroke. The check only starts once the
+    token has been left unchanged for delay_ms, and a newer token supersedes
+    any check that is still pending or running: its result is dropped. The
+    worker is polled with root.after, so on_result(api_token, project, error)
+    is always called on the Tk main thread, with project None if the token is
+    invalid.
+    """
+
+    def __init__(self, root, on_result, delay_ms=VALIDATION_DELAY_MS, check=check_api_token):
+        self.root = root
+        self.on_result = on_result
+        self.delay_ms = delay_ms
+        self.check = check
+        self._after_id = None
+        self._future = None
+        self._latest = None
+
+    def validate(self, api_token):
+        self._latest = api_token
+        self.cancel()
+
+        if len(api_token) != TOKEN_LENGTH:
+            self.on_result(api_token, None, ValueError("Invalid token"))
+            return
+
+        self._after_id = self.root.after(self.delay_ms, self._start, api_token)
+
+    def cancel(self):
+        """Drops the scheduled check and the pending or running one, if any."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._future is not None:
+            # a running request cannot be interrupted, its result is ignored in _poll
+            self._future.cancel()
+            self._future = None
+
+    def _start(self, api_token):
+        self._after_id = None
+        self._future = _executor.submit(self.check, api_token)
+        self._poll(self._future, api_token)
+
+    def _poll(self, future, api_token):
+        if not future.done():
+            self.root.after(POLL_INTERVAL_MS, self._poll, future, api_token)
+            return
+        if future is not self._future or api_token != self._latest:
+            return
+
+        self._future = None
+        try:
+            project = future.result()
+        except Exception as e:
+            self.on_result(api_token, None, e)
+        else:
+            self.on_result(api_token, project, None)
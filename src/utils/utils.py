@@ -1,72 +1,110 @@
 import customtkinter as ctk
-from tkinter import filedialog, messagebox
-from src.redcap.project import Project
-import pandas as pd
-from src.utils.alert_handling import find_study_id
+from tkinter import filedialog, messagebox, ttk
+from src.utils.alert_handling import find_study_id, DeviationRecords, sort_key
 from src.models.session_manager import session_manager
-from src.utils.reader_prep import import_data
+from src.utils.reader_prep import import_data, format_duplicate_report, DUPLICATES_LOG
 
 entry_data_path = None
 
-def validate_api_token(api_token, label_validation):
-    if len(api_token) < 32:
+def show_token_validation(label_validation, project, error):
+    """
+    Shows the outcome of a TokenValidator check next to the token entry.
+    """
+    if project is None:
         label_validation.configure(text="Invalid token", text_color="red")
-    else:
-        try:
-            project = define_url_token_project(api_token)
-            project_info = project.export_project_info()
-            project_title = project_info.get('project_title', 'Unknown Project')
-            label_validation.configure(text=f"Valid token: {project_title}", text_color="green")
-            return True
-        except Exception as e:
-            label_validation.configure(text="Invalid token", text_color="red")
-            return False
-
-def define_url_token_project(api_token):
-    api_url = 'https://redcap.ki.se/api/'
-    project = Project(api_url, api_token)
-    return project
+        return False
+    project_title = project.project_info.get('project_title', 'Unknown Project')
+    label_validation.configure(text=f"Valid token: {project_title}", text_color="green")
+    return True
 
 def browse_files(entry_widget):
     filename = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
     entry_widget.delete(0, ctk.END)
     entry_widget.insert(0, filename)
 
-def run_process(entry_data_path, combo_data_form):
+def import_job(job, data_path, project_instance, force_full=False):
+    """
+    Reads, cleans, matches and imports the data on a JobRunner worker, reporting each step.
+    """
+    return import_data(data_path, project_instance, progress=job.report, force_full=force_full, return_report=True)
+
+def display_duplicate_report(report, root):
+    """
+    Shows the duplicate scans that were left out of an import, as written to DUPLICATES_LOG.
+    """
+    report_window = ctk.CTkToplevel(root)
+    report_window.title("Duplicate scans")
+    center_window(report_window, width=800, height=500)
+
+    label = ctk.CTkLabel(
+        report_window,
+        text=f"Only the first row of each scan was imported, the full report is in {DUPLICATES_LOG}.",
+        font=("Arial", 14)
+    )
+    label.pack(padx=20, pady=(20, 10))
+
+    textbox = ctk.CTkTextbox(report_window, font=("Courier", 12))
+    textbox.pack(expand=True, fill="both", padx=20, pady=(0, 20))
+    textbox.insert("1.0", format_duplicate_report(report))
+    textbox.configure(state="disabled")
+
+def run_process(entry_data_path, combo_data_form, runner, label_progress, on_finished=None, force_full=False):
+    """
+    Starts the import in the background on runner and returns the Job, or None if the
+    inputs are invalid. Results and errors are shown on the UI thread, after which
+    on_finished() is called.
+    """
     # Get the inputs from the GUI
     data_path = entry_data_path.get()
     data_form = combo_data_form.get()  
 
     if not data_path or not data_form:
         messagebox.showerror("Error", "All fields must be filled in.")
-        return
+        return None
 
-    cached_api_token = session_manager.get_api_token()
+    project_instance = session_manager.get_project_instance()
+    if project_instance is None:
+        messagebox.showerror("Error", "Failed to connect to REDCap: no validated API token")
+        return None
 
-    try:
-        if cached_api_token:
-            project_instance = session_manager.get_project_instance()
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to connect to REDCap: {e}")
-        return
+    if data_form != "OLO data":
+        messagebox.showerror("Error", f"An error occurred during data processing: Data form {data_form} is not supported as of this moment.")
+        return None
+
+    def finish(text):
+        label_progress.configure(text=text)
+        if on_finished is not None:
+            on_finished()
+
+    def on_done(result):
+        second_column, duplicate_report = result
+        finish("Done")
+        if duplicate_report.within_data or duplicate_report.in_redcap:
+            display_duplicate_report(duplicate_report, label_progress.winfo_toplevel())
+        if not second_column:
+            messagebox.showinfo("Success", "No new or changed files to import.")
+            return
+        messagebox.showinfo("Success", f"The following IDs were successfully imported: {', '.join(second_column)}")
+
+    def on_error(error):
+        finish("")
+        messagebox.showerror("Error", f"An error occurred during data processing: {error}")
 
     # Process the data
-    try:
-        if data_form == "OLO data":
-            # Convert and clean data
-            second_column = import_data(data_path, project_instance)
-            messagebox.showinfo("Success", f"The following IDs were successfully imported: {', '.join(second_column)}")
-        else:
-            raise ValueError(f"Data form {data_form} is not supported as of this moment.")
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred during data processing: {e}")
+    return runner.submit(
+        import_job, data_path, project_instance, force_full,
+        on_progress=lambda stage, detail: label_progress.configure(text=f"Running: {stage}..."),
+        on_done=on_done,
+        on_error=on_error,
+        on_cancelled=lambda: finish("Cancelled")
+    )
 
 def clear_window(root):
     for widget in root.winfo_children():
         widget.destroy()
 
 def display_alerts_window(deviating_vars, alerts, redcap_data, project_instance, root):
-    study_ids = sorted(deviating_vars.keys())
+    records = DeviationRecords(deviating_vars, alerts, redcap_data, find_study_id(project_instance))
     current_index = [0]
 
     # Create the top-level window
@@ -74,8 +112,17 @@ def display_alerts_window(deviating_vars, alerts, redcap_data, project_instance,
     alerts_window.title("Deviating Records")
     center_window(alerts_window, width=600, height=850)
     
-    # Display frame for alerts
-    display_frame = ctk.CTkFrame(alerts_window)
+    # Jump to a study ID
+    search_frame = ctk.CTkFrame(alerts_window)
+    search_frame.pack(fill="x", padx=20, pady=(20, 0))
+
+    entry_search = ctk.CTkEntry(search_frame, width=200, placeholder_text="Study ID")
+    entry_search.pack(side="left", padx=10, pady=10)
+
+    label_search = ctk.CTkLabel(search_frame, text="", text_color="red")
+
+    # Display frame for alerts, scrollable since every alert variable gets a row
+    display_frame = ctk.CTkScrollableFrame(alerts_window)
     display_frame.pack(expand=True, fill="both", padx=20, pady=20)
     
     # Study ID Label at the top
@@ -87,79 +134,43 @@ def display_alerts_window(deviating_vars, alerts, redcap_data, project_instance,
     ctk.CTkLabel(display_frame, text="Value", font=("Arial", 12, "bold")).grid(row=1, column=1, padx=10, pady=5)
     ctk.CTkLabel(display_frame, text="Reference", font=("Arial", 12, "bold")).grid(row=1, column=2, padx=10, pady=5)
 
-    # List to store dynamically created labels for each variable
-    value_labels = []
-
-    # Export records from project_instance
-    records_df = redcap_data.set_index(find_study_id(project_instance))
-
-    # Build a dictionary to hold the detailed info for each study_id
-    records_info = {}
-    for study_id in study_ids:
-        # Initialize study_id entry with all alerts
-        records_info[study_id] = {}
-        for alert in alerts:
-            for var_name, details in alert.alert_dict.items():
-                value = records_df.at[study_id, var_name] if study_id in records_df.index and var_name in records_df.columns else "N/A"
-                records_info[study_id][var_name] = {
-                    'value': value,
-                    'condition': details['reference_interval'],
-                    'deviated': False
-                }
-        
-        # Update deviating vars with actual values and deviation status
-        if study_id in deviating_vars:
-            for deviated_var in deviating_vars[study_id]:
-                records_info[study_id][deviated_var]['deviated'] = True
+    # One row of labels per variable, created once and updated in place on navigation
+    row_labels = []
+    for row_num in range(len(records.variables)):
+        var_label = ctk.CTkLabel(display_frame, text="", font=("Arial", 12))
+        var_label.grid(row=row_num + 2, column=0, padx=10, pady=5)
+        value_label = ctk.CTkLabel(display_frame, text="", font=("Arial", 12))
+        value_label.grid(row=row_num + 2, column=1, padx=10, pady=5)
+        ref_label = ctk.CTkLabel(display_frame, text="", font=("Arial", 12))
+        ref_label.grid(row=row_num + 2, column=2, padx=10, pady=5)
+        row_labels.append((var_label, value_label, ref_label))
 
     def update_display():
         """Update the display to show details for the current study ID."""
-        if not study_ids:
+        if not len(records):
             label_study_id.configure(text="No valid Study IDs available.")
             return
 
-        if current_index[0] >= len(study_ids) or current_index[0] < 0:
+        if current_index[0] >= len(records) or current_index[0] < 0:
             label_study_id.configure(text="Study ID index out of range.")
             return
 
-        study_id = study_ids[current_index[0]]
-        total_records = len(study_ids)
-        label_study_id.configure(text=f"Study ID: {study_id} ({current_index[0] + 1}/{total_records})")
-        variable_info = records_info[study_id]
-
-        # Clear previous labels
-        for label in value_labels:
-            label.destroy()
-        value_labels.clear()
-
-        # Populate the frame with variable information
-        row_num = 2
-        for var_name, info in variable_info.items():
-            # Variable name
-            var_label = ctk.CTkLabel(display_frame, text=var_name, font=("Arial", 12))
-            var_label.grid(row=row_num, column=0, padx=10, pady=5)
-
-            # Variable value with conditional formatting for deviation
-            value_text = str(info['value']) if pd.notna(info['value']) else "N/A"
-            value_label = ctk.CTkLabel(
-                display_frame,
+        study_id = records.study_ids[current_index[0]]
+        label_study_id.configure(text=f"Study ID: {study_id} ({current_index[0] + 1}/{len(records)})")
+
+        # Populate the rows with variable information, deviations in bold red
+        for (var_label, value_label, ref_label), (var_name, value_text, reference, deviated) in zip(row_labels, records.rows(current_index[0])):
+            var_label.configure(text=var_name)
+            value_label.configure(
                 text=value_text,
-                font=("Arial", 12, "bold" if info.get('deviated', False) else "normal"),
-                text_color="red" if info.get('deviated', False) else "black"
+                font=("Arial", 12, "bold" if deviated else "normal"),
+                text_color="red" if deviated else "black"
             )
-            value_label.grid(row=row_num, column=1, padx=10, pady=5)
-
-            # Reference interval (the condition)
-            ref_label = ctk.CTkLabel(display_frame, text=info['condition'], font=("Arial", 12))
-            ref_label.grid(row=row_num, column=2, padx=10, pady=5)
-
-            # Store the created labels
-            value_labels.extend([var_label, value_label, ref_label])
-            row_num += 1
+            ref_label.configure(text=reference)
 
     def next_record():
         """Show the next record's data if available."""
-        if current_index[0] < len(study_ids) - 1:
+        if current_index[0] < len(records) - 1:
             current_index[0] += 1
             update_display()
 
@@ -169,16 +180,96 @@ def display_alerts_window(deviating_vars, alerts, redcap_data, project_instance,
             current_index[0] -= 1
             update_display()
 
+    def jump_to_record(event=None):
+        """Show the record of the study ID typed in the search box."""
+        position = records.find(entry_search.get())
+        if position < 0:
+            label_search.configure(text="Study ID not found")
+            return
+        label_search.configure(text="")
+        current_index[0] = position
+        update_display()
+
+    ctk.CTkButton(search_frame, text="Go", command=jump_to_record, width=60).pack(side="left", padx=10)
+    label_search.pack(side="left", padx=10)
+    entry_search.bind("<Return>", jump_to_record)
+
     # Button frame for navigation controls
     button_frame = ctk.CTkFrame(alerts_window)
     button_frame.pack(side="bottom", pady=10)
 
     ctk.CTkButton(button_frame, text="Previous", command=previous_record, width=100, height=50).pack(side="left", padx=10)
+    ctk.CTkButton(button_frame, text="Table view", command=lambda: display_deviation_table(records, root), width=100, height=50).pack(side="left", padx=10)
     ctk.CTkButton(button_frame, text="Next", command=next_record, width=100, height=50).pack(side="right", padx=10)
 
     # Initial display
     update_display()
 
+def display_deviation_table(records, root):
+    """
+    Shows all deviating records at once, one row per study ID and one column per variable.
+    ttk.Treeview can only style whole rows, so deviating cells are marked with '*' and
+    rows with deviations are shown in bold red. Click a column header to sort by it.
+    """
+    columns = [records.study_id_field or "Study ID"] + records.variables
+
+    table_window = ctk.CTkToplevel(root)
+    table_window.title("Deviation overview")
+    center_window(table_window, width=1200, height=800)
+
+    table_frame = ctk.CTkFrame(table_window)
+    table_frame.pack(expand=True, fill="both", padx=20, pady=(20, 10))
+    table_frame.grid_rowconfigure(0, weight=1)
+    table_frame.grid_columnconfigure(0, weight=1)
+
+    tree = ttk.Treeview(table_frame, columns=columns, show="headings")
+    tree.grid(row=0, column=0, sticky="nsew")
+    y_scroll = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+    y_scroll.grid(row=0, column=1, sticky="ns")
+    x_scroll = ttk.Scrollbar(table_frame, orient="horizontal", command=tree.xview)
+    x_scroll.grid(row=1, column=0, sticky="ew")
+    tree.configure(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+
+    tree.tag_configure("deviating", foreground="red", font=("Arial", 11, "bold"))
+
+    # Built once, sorting only moves the existing items
+    cell_texts = {}
+    for position, study_id in enumerate(records.study_ids):
+        rows = records.rows(position)
+        shown = [f"* {value_text}" if is_deviating else value_text for _, value_text, _, is_deviating in rows]
+        is_row_deviating = any(row[3] for row in rows)
+        item = tree.insert("", "end", values=[study_id] + shown, tags=("deviating",) if is_row_deviating else ())
+        cell_texts[item] = [str(study_id)] + [row[1] for row in rows]
+
+    sort_state = {}
+
+    def sort_by(column):
+        position = columns.index(column)
+        descending = sort_state.get(column, False)
+        items = sorted(tree.get_children(""), key=lambda item: sort_key(cell_texts[item][position]), reverse=descending)
+        for index, item in enumerate(items):
+            tree.move(item, "", index)
+        sort_state[column] = not descending
+
+    for column in columns:
+        tree.heading(column, text=column, command=lambda column=column: sort_by(column))
+        tree.column(column, width=120, anchor="center", stretch=False)
+
+    def export_table():
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv")]
+        )
+        if not file_path:
+            return
+        try:
+            records.export(file_path)
+            messagebox.showinfo("Success", f"Deviations exported to {file_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not export the deviations: {e}")
+
+    ctk.CTkButton(table_window, text="Export", command=export_table, width=100, height=40).pack(side="bottom", pady=10)
+
 def center_window(win, width, height):
     screen_width = win.winfo_screenwidth()
     screen_height = win.winfo_screenheight()
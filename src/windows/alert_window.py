@@ -1,8 +1,34 @@
 import customtkinter as ctk
 import tkinter as tk
+from tkinter import messagebox
 from src.utils.utils import clear_window, display_alerts_window, browse_files
 from src.utils.alert_handling import load_csv, check_deviations, create_alerts_from_dataframe
 from src.models.session_manager import session_manager
+from src.utils.parsing import load_cache, save_cache
+from src.utils.jobs import JobRunner, EXPORT, PARSE, EVALUATE, RENDER
+
+
+def alert_handling_job(job, project_instance, file_path, selected_alerts):
+    """
+    Exports the records and checks them against the selected alerts, run through a JobRunner.
+    Returns deviating_vars, alerts and redcap_data for display_alerts_window.
+    """
+    job.report(EXPORT)
+    redcap_data = project_instance.export_records(format_type="df")
+
+    job.report(PARSE)
+    csv_df = load_csv(file_path)
+    filtered_alerts_df = csv_df[csv_df['alert-title'].isin(selected_alerts)]
+    load_cache(file_path)
+    alerts = create_alerts_from_dataframe(filtered_alerts_df, project_instance)
+    save_cache(file_path)
+
+    job.report(EVALUATE)
+    # Alerts of earlier runs stay indexed on the project, only check the selected ones
+    deviating_vars = check_deviations(redcap_data, project_instance, titles=selected_alerts)
+
+    return deviating_vars, alerts, redcap_data
+
 
 def show_alert_handling(root):
     from src.windows.main_menu import show_main_menu
@@ -23,7 +49,7 @@ def show_alert_handling(root):
     # Determine the subtitle text based on the presence of the cached API token
     if cached_api_token:
         project_instance = session_manager.get_project_instance()
-        project_info = project_instance.export_project_info()
+        project_info = project_instance.project_info
         project_title = project_info.get('project_title', 'Unknown Project')
         subtitle_text = project_title if project_title else "No cached API token"
     else:
@@ -49,6 +75,8 @@ def show_alert_handling(root):
         file_path = entry_alert_conditions.get()
         if file_path:
             df = load_csv(file_path)
+            # Warm the condition parse cache from a previous run on the same file
+            load_cache(file_path)
             alert_titles = df['alert-title'].tolist()
             dropdown_alert_titles.delete(0, tk.END)
             for title in alert_titles:
@@ -68,21 +96,56 @@ def show_alert_handling(root):
     button_frame = ctk.CTkFrame(frame)
     button_frame.grid(row=4, column=0, columnspan=3, pady=20)
 
+    # Progress of a running check
+    label_progress = ctk.CTkLabel(frame, text="")
+    label_progress.grid(row=5, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew")
+
+    runner = JobRunner(root)
+    current_job = [None]
+
+    def set_running(running):
+        button_run.configure(state="disabled" if running else "normal")
+        button_cancel.configure(state="normal" if running else "disabled")
+
+    def on_progress(stage, detail):
+        label_progress.configure(text=f"Running: {stage}...")
+
+    def on_done(result):
+        set_running(False)
+        deviating_vars, alerts, redcap_data = result
+        label_progress.configure(text=f"Running: {RENDER}...")
+        display_alerts_window(deviating_vars, alerts, redcap_data, project_instance, root)
+        label_progress.configure(text=f"Done, {len(deviating_vars)} records with deviations")
+
+    def on_error(error):
+        set_running(False)
+        label_progress.configure(text="")
+        messagebox.showerror("Error", f"An error occurred during alert handling: {error}")
+
+    def on_cancelled():
+        set_running(False)
+        label_progress.configure(text="Cancelled")
+
     # Run button
     def run_alert_handling():
         selected_indices = dropdown_alert_titles.curselection()
         selected_alerts = [dropdown_alert_titles.get(i) for i in selected_indices]
-        redcap_data = project_instance.export_records(format_type="df")
-        
         file_path = entry_alert_conditions.get()
-        csv_df = load_csv(file_path)
-        
-        filtered_alerts_df = csv_df[csv_df['alert-title'].isin(selected_alerts)]
-        
-        alerts = create_alerts_from_dataframe(filtered_alerts_df, project_instance)
-        deviating_vars = check_deviations(redcap_data, project_instance)
-        
-        display_alerts_window(deviating_vars, alerts, redcap_data, project_instance, root)
+
+        set_running(True)
+        current_job[0] = runner.submit(
+            alert_handling_job, project_instance, file_path, selected_alerts,
+            on_progress=on_progress, on_done=on_done, on_error=on_error, on_cancelled=on_cancelled
+        )
+
+    def cancel_alert_handling():
+        if current_job[0] is not None:
+            current_job[0].cancel()
+            label_progress.configure(text="Cancelling after the current step...")
+
+    def back():
+        runner.discard()
+        show_main_menu(root)
 
     button_run = ctk.CTkButton(
         button_frame, 
@@ -91,5 +154,9 @@ def show_alert_handling(root):
     )
     button_run.pack(side="left", padx=10)
 
+    # Cancel button
+    button_cancel = ctk.CTkButton(button_frame, text="Cancel", command=cancel_alert_handling, state="disabled")
+    button_cancel.pack(side="left", padx=10)
+
     # Back button
-    ctk.CTkButton(button_frame, text="Back", command=lambda: show_main_menu(root)).pack(side="left", padx=10)
\ No newline at end of file
+    ctk.CTkButton(button_frame, text="Back", command=back).pack(side="left", padx=10)
@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from src.utils.utils import clear_window, browse_files, run_process
 from src.models.session_manager import session_manager
+from src.utils.jobs import JobRunner
 
 def show_data_import(root):
     from src.windows.main_menu import show_main_menu
@@ -14,7 +15,7 @@ def show_data_import(root):
 
     if cached_api_token:
         project_instance = session_manager.get_project_instance()
-        project_info = project_instance.export_project_info()
+        project_info = project_instance.project_info
         project_title = project_info.get('project_title', 'Unknown Project')
         subtitle_text = project_title if project_title else "No cached API token"
     else:
@@ -47,15 +48,51 @@ def show_data_import(root):
     combo_data_form = ctk.CTkComboBox(frame, values=["OLO data", "Echocardiographic data"], width=300)
     combo_data_form.grid(row=2, column=1, padx=10, pady=10, sticky="w")
     combo_data_form.set("Select Data Form")
+
+    # Files already imported are skipped unless a full re-import is forced
+    checkbox_force_full = ctk.CTkCheckBox(frame, text="Force full re-import")
+    checkbox_force_full.grid(row=2, column=2, padx=10, pady=10, sticky="w")
     
     # Frame for buttons
     button_frame = ctk.CTkFrame(frame)
     button_frame.grid(row=3, column=0, columnspan=3, pady=20)
 
+    # Progress of a running import
+    label_progress = ctk.CTkLabel(frame, text="")
+    label_progress.grid(row=4, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew")
+
+    runner = JobRunner(root)
+    current_job = [None]
+
+    def set_running(running):
+        button_run.configure(state="disabled" if running else "normal")
+        button_cancel.configure(state="normal" if running else "disabled")
+
+    def start_import():
+        current_job[0] = run_process(
+            entry_data_path, combo_data_form, runner, label_progress,
+            on_finished=lambda: set_running(False), force_full=bool(checkbox_force_full.get())
+        )
+        if current_job[0] is not None:
+            set_running(True)
+
+    def cancel_import():
+        if current_job[0] is not None:
+            current_job[0].cancel()
+            label_progress.configure(text="Cancelling after the current step...")
+
+    def back():
+        runner.discard()
+        show_main_menu(root)
+
     # Run button
-    button_run = ctk.CTkButton(button_frame, text="Import", command=lambda: run_process(entry_data_path, combo_data_form))
+    button_run = ctk.CTkButton(button_frame, text="Import", command=start_import)
     button_run.pack(side="left", padx=10)
 
+    # Cancel button
+    button_cancel = ctk.CTkButton(button_frame, text="Cancel", command=cancel_import, state="disabled")
+    button_cancel.pack(side="left", padx=10)
+
     # Back button
-    button_back = ctk.CTkButton(button_frame, text="Back", command=lambda: show_main_menu(root))
-    button_back.pack(side="left", padx=10)
\ No newline at end of file
+    button_back = ctk.CTkButton(button_frame, text="Back", command=back)
+    button_back.pack(side="left", padx=10)
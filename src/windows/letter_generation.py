@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from tkinter import filedialog
-from src.utils.utils import validate_api_token, clear_window
+from src.utils.utils import show_token_validation, clear_window
+from src.utils.token_validation import TokenValidator
 
 def show_letter_generation(root):
     from src.windows.main_menu import show_main_menu
@@ -38,10 +39,10 @@ def show_letter_generation(root):
     label_validation = ctk.CTkLabel(frame, text="", text_color="red")
     label_validation.grid(row=2, column=2, padx=5, pady=5, sticky="w")
 
-    entry_api_token.bind(
-        "<KeyRelease>", 
-        lambda event: validate_api_token(entry_api_token.get(), label_validation)
+    token_validator = TokenValidator(
+        root, lambda api_token, project, error: show_token_validation(label_validation, project, error)
     )
+    entry_api_token.bind("<KeyRelease>", lambda event: token_validator.validate(entry_api_token.get()))
     
     # File browse for letter template
     label_letter_template = ctk.CTkLabel(frame, text="Letter Template File")
@@ -1,7 +1,7 @@
 import customtkinter as ctk
-from src.utils.utils import clear_window, validate_api_token
+from src.utils.utils import clear_window, show_token_validation
+from src.utils.token_validation import TokenValidator
 from src.models.session_manager import session_manager
-from src.models.project import redcapProj
 
 def show_main_menu(root):
     from src.windows.data_import import show_data_import
@@ -52,21 +52,32 @@ def show_main_menu(root):
     label_validation = ctk.CTkLabel(frame, text="")
     label_validation.grid(row=2, column=2, padx=0, pady=0, sticky="w")
 
-    def on_api_token_change(event):
-        api_token = entry_api_token.get()
-        if not api_token:
-            is_valid = False
-        else:
-            is_valid = validate_api_token(api_token, label_validation)
-        
-        button_data_import.configure(state="normal" if is_valid else "disabled", fg_color="green" if is_valid else "transparent")
-        button_alert_handling.configure(state="normal" if is_valid else "disabled", fg_color="green" if is_valid else "transparent")
-        button_letter_generation.configure(state="normal" if is_valid else "disabled", fg_color="green" if is_valid else "transparent")
+    def set_buttons_state(is_valid):
+        for button in (button_data_import, button_alert_handling, button_letter_generation):
+            button.configure(state="normal" if is_valid else "disabled", fg_color="green" if is_valid else "transparent")
+
+    def on_token_validated(api_token, project, error):
+        is_valid = show_token_validation(label_validation, project, error)
+        set_buttons_state(is_valid)
 
         if is_valid:
+            # The validated project becomes the session's project, no second instance is built
             session_manager.set_api_token(api_token)
-            project_instance = redcapProj(api_url='https://redcap.ki.se/api/', api_token=api_token)
-            session_manager.set_project_instance(project_instance)
+            session_manager.set_project_instance(project)
+
+    token_validator = TokenValidator(root, on_token_validated)
+
+    def on_api_token_change(event):
+        api_token = entry_api_token.get()
+        project = session_manager.get_project_instance()
+        if project is not None and api_token == session_manager.get_api_token():
+            # Unchanged token (e.g. arrow keys), drop any check started for an edit in between
+            token_validator.cancel()
+            on_token_validated(api_token, project, None)
+            return
+        # Disable the buttons until the new token has been checked
+        set_buttons_state(False)
+        token_validator.validate(api_token)
 
     entry_api_token.bind("<KeyRelease>", on_api_token_change)
     
@@ -97,8 +108,4 @@ def show_main_menu(root):
     cached_api_token = session_manager.get_api_token()
     if cached_api_token:
         entry_api_token.insert(0, cached_api_token)
-        is_valid = validate_api_token(cached_api_token, label_validation)
-        button_data_import.configure(state="normal" if is_valid else "disabled", fg_color="green" if is_valid else "transparent")
-        button_alert_handling.configure(state="normal" if is_valid else "disabled", fg_color="green" if is_valid else "transparent")
-        button_letter_generation.configure(state="normal" if is_valid else "disabled", fg_color="green" if is_valid else "transparent")
-    
\ No newline at end of file
+        token_validator.validate(cached_api_token)
@@ -0,0 +1,90 @@
+"""A minimal in-memory REDCap API used as a `responses` callback"""
+import csv
+import json
+from io import StringIO
+from urllib.parse import parse_qs
+
+METADATA = [
+    {"field_name": "record_id", "form_name": "demographics"},
+    {"field_name": "age", "form_name": "demographics"},
+    {"field_name": "hgb_gl", "form_name": "lab"},
+    {"field_name": "plt_109l", "form_name": "lab"},
+]
+
+PROJECT_INFO = {
+    "project_id": 42,
+    "project_title": "Fake project",
+    "custom_record_label": "[record_id]",
+}
+
+RECORDS = [
+    {
+        "record_id": str(i),
+        "age": str(20 + i),
+        "demographics_complete": "2",
+        "hgb_gl": str(120 + i),
+        "plt_109l": str(200 + i),
+        "lab_complete": "0",
+    }
+    for i in range(1, 24)
+]
+
+
+def _indexed(params, key):
+    values = []
+    i = 0
+    while f"{key}[{i}]" in params:
+        values.append(params[f"{key}[{i}]"])
+        i += 1
+    return values
+
+
+def _columns(fields, forms):
+    columns = []
+    for field in METADATA:
+        if field["field_name"] in fields or field["form_name"] in forms:
+            columns.append(field["field_name"])
+    for form in dict.fromkeys(field["form_name"] for field in METADATA):
+        if f"{form}_complete" in fields or form in forms:
+            columns.append(f"{form}_complete")
+    return columns
+
+
+def callback(request, calls=None):
+    params = {key: values[0] for key, values in parse_qs(request.body).items()}
+    if calls is not None:
+        calls.append(params)
+    content = params["content"]
+
+    if content == "project":
+        return 200, {}, json.dumps(PROJECT_INFO)
+    if content == "metadata":
+        return 200, {}, json.dumps(METADATA)
+    if content == "formEventMapping":
+        return 200, {}, json.dumps({"error": "You cannot export form/event mappings for classic projects"})
+    if content == "record" and "data" in params:
+        if params["format"] == "json":
+            rows = json.loads(params["data"])
+        else:
+            rows = list(csv.DictReader(StringIO(params["data"])))
+        if any("bad" in row.values() for row in rows):
+            return 400, {}, json.dumps({"error": "invalid value 'bad'"})
+        if params["returnContent"] == "ids":
+            return 200, {}, json.dumps([row["record_id"] for row in rows])
+        return 200, {}, json.dumps({"count": len(rows)})
+    if content == "record":
+        records = _indexed(params, "records")
+        columns = _columns(_indexed(params, "fields"), _indexed(params, "forms"))
+        rows = [
+            {column: row[column] for column in columns}
+            for row in RECORDS
+            if not records or row["record_id"] in records
+        ]
+        if params["format"] == "json":
+            return 200, {}, json.dumps(rows)
+        buf = StringIO()
+        writer = csv.DictWriter(buf, fieldnames=columns, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+        return 200, {}, buf.getvalue()
+    return 400, {}, json.dumps({"error": f"unsupported content {content}"})
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import threading
+import time
+from functools import partial
+import pytest
+import responses
+from redcap import AsyncProject
+from fake_redcap import RECORDS, callback
+
+URL = "https://redcap.example.org/api/"
+TOKEN = "1" * 32
+
+
+def test_async_methods_mirror_project():
+    assert asyncio.iscoroutinefunction(AsyncProject.export_records)
+    assert asyncio.iscoroutinefunction(AsyncProject.import_records)
+    assert asyncio.iscoroutinefunction(AsyncProject.export_project_info)
+
+
+def test_gather_runs_concurrently_within_limit():
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def slow_callback(request):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        return callback(request)
+
+    async def export_each(proj):
+        async with proj:
+            await proj.prefetch()
+            return await asyncio.gather(
+                *(proj.export_records(records=[row["record_id"]]) for row in RECORDS)
+            )
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.add_callback(responses.POST, URL, callback=slow_callback)
+        start = time.perf_counter()
+        results = asyncio.run(export_each(AsyncProject(URL, TOKEN, max_concurrency=4)))
+        elapsed = time.perf_counter() - start
+
+    assert [result[0]["record_id"] for result in results] == [row["record_id"] for row in RECORDS]
+    assert state["peak"] == 4
+    assert elapsed < 0.05 * len(RECORDS)
+
+
+def test_attributes_come_from_project():
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.add_callback(responses.POST, URL, callback=partial(callback, calls=[]))
+        proj = AsyncProject(URL, TOKEN)
+        assert proj.url == URL
+        assert proj.def_field == "record_id"
+        proj.close()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,107 @@
+from functools import partial
+import pytest
+import responses
+from redcap import Project
+from redcap.request import RedcapError
+from fake_redcap import PROJECT_INFO, callback
+
+URL = "https://redcap.example.org/api/"
+TOKEN = "1" * 32
+
+
+def contents(calls):
+    return [call["content"] for call in calls]
+
+
+def test_structure_is_served_from_disk_in_a_new_session(tmp_path):
+    calls = []
+    with responses.RequestsMock() as rsps:
+        rsps.add_callback(responses.POST, URL, callback=partial(callback, calls=calls))
+
+        first = Project(URL, TOKEN, cache_dir=str(tmp_path))
+        assert first.def_field == "record_id"
+        assert first.is_longitudinal is False
+        assert contents(calls) == ["project", "metadata", "formEventMapping"]
+
+        calls.clear()
+        second = Project(URL, TOKEN, cache_dir=str(tmp_path))
+        assert second.field_names == first.field_names
+        assert second.is_longitudinal is False
+        with pytest.raises(RedcapError):
+            second.export_instrument_event_mappings()
+        assert contents(calls) == ["project"]
+
+
+def test_cache_is_revalidated_against_project_info(tmp_path, monkeypatch):
+    calls = []
+    with responses.RequestsMock() as rsps:
+        rsps.add_callback(responses.POST, URL, callback=partial(callback, calls=calls))
+        assert Project(URL, TOKEN, cache_dir=str(tmp_path)).metadata
+
+        monkeypatch.setitem(PROJECT_INFO, "project_title", "Renamed project")
+        calls.clear()
+        assert Project(URL, TOKEN, cache_dir=str(tmp_path)).metadata
+        assert contents(calls) == ["project", "metadata"]
+
+
+def test_expired_entries_and_refresh_export_again(tmp_path):
+    calls = []
+    with responses.RequestsMock() as rsps:
+        rsps.add_callback(responses.POST, URL, callback=partial(callback, calls=calls))
+        proj = Project(URL, TOKEN, cache_dir=str(tmp_path), cache_max_age=0)
+        assert proj.metadata
+        calls.clear()
+        assert Project(URL, TOKEN, cache_dir=str(tmp_path), cache_max_age=0).metadata
+        assert contents(calls) == ["project", "metadata"]
+
+        proj = Project(URL, TOKEN, cache_dir=str(tmp_path))
+        proj.export_metadata()
+        proj.refresh()
+        assert not list(tmp_path.iterdir())
+
+
+def test_other_errors_are_not_cached(tmp_path):
+    calls = []
+
+    def denied_metadata(request):
+        if "content=metadata" in request.body:
+            calls.append({"content": "metadata"})
+            return 403, {}, '{"error": "You do not have permissions to use the API"}'
+        return callback(request, calls=calls)
+
+    with responses.RequestsMock() as rsps:
+        rsps.add_callback(responses.POST, URL, callback=denied_metadata)
+        proj = Project(URL, TOKEN, cache_dir=str(tmp_path))
+        with pytest.raises(RedcapError):
+            proj.export_metadata()
+        with pytest.raises(RedcapError):
+            proj.export_metadata()
+        assert contents(calls) == ["project", "metadata", "metadata"]
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_refresh_of_a_new_instance_drops_the_entry(tmp_path):
+    with responses.RequestsMock() as rsps:
+        rsps.add_callback(responses.POST, URL, callback=callback)
+        Project(URL, TOKEN, cache_dir=str(tmp_path)).export_metadata()
+        assert list(tmp_path.iterdir())
+
+        Project(URL, TOKEN, cache_dir=str(tmp_path)).refresh()
+        assert not list(tmp_path.iterdir())
+
+
+def test_filtered_exports_bypass_the_cache(tmp_path):
+    calls = []
+    with responses.RequestsMock() as rsps:
+        rsps.add_callback(responses.POST, URL, callback=partial(callback, calls=calls))
+        proj = Project(URL, TOKEN, cache_dir=str(tmp_path))
+        proj.export_metadata(fields=["age"])
+        proj.export_metadata(fields=["age"])
+        assert contents(calls) == ["metadata", "metadata"]
+
+    assert not list(tmp_path.iterdir())
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,61 @@
+import json
+import pytest
+import responses
+from redcap import Project
+
+URL = "https://redcap.example.org/api/"
+TOKEN = "1" * 32
+
+
+def add_project_info(custom_record_label="[study_id]", title="Test project"):
+    responses.add(
+        responses.POST,
+        URL,
+        body=json.dumps({"project_title": title, "custom_record_label": custom_record_label}),
+        content_type="application/json",
+    )
+
+
+@responses.activate
+def test_project_info_is_fetched_once():
+    add_project_info()
+    project = Project(URL, TOKEN)
+
+    assert project.project_info["project_title"] == "Test project"
+    assert project.record_label_field == "study_id"
+    assert project.project_info["project_title"] == "Test project"
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_project_info_refresh_and_ttl():
+    add_project_info(title="First")
+    add_project_info(title="Second", custom_record_label="[record_id] [name]")
+    add_project_info(title="Third", custom_record_label="")
+    project = Project(URL, TOKEN, project_info_ttl=None)
+
+    assert project.project_info["project_title"] == "First"
+    project.refresh()
+    assert project.project_info["project_title"] == "Second"
+    assert project.record_label_field == "record_id"
+    assert len(responses.calls) == 2
+
+    project.project_info_ttl = 60
+    project._project_info_fetched_at -= 61
+    assert project.project_info["project_title"] == "Third"
+    assert project.record_label_field is None
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_export_project_info_updates_cache():
+    add_project_info(title="Exported")
+    project = Project(URL, TOKEN)
+
+    assert project.export_project_info()["project_title"] == "Exported"
+    assert project.project_info["project_title"] == "Exported"
+    assert len(responses.calls) == 1
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,68 @@
+from functools import partial
+import pytest
+import responses
+from redcap import Project
+from fake_redcap import RECORDS, callback
+
+URL = "https://redcap.example.org/api/"
+TOKEN = "1" * 32
+
+
+@pytest.fixture
+def project():
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        calls = []
+        rsps.add_callback(responses.POST, URL, callback=partial(callback, calls=calls))
+        project = Project(URL, TOKEN)
+        project.calls = calls
+        yield project
+
+
+def record_calls(project):
+    return [call for call in project.calls if call["content"] == "record"]
+
+
+def test_batched_json_matches_single_export(project):
+    single = project.export_records()
+    batched = project.export_records(batch_size=5, max_workers=3)
+
+    assert batched == single
+    # One request for the record IDs plus five batches of at most 5 records
+    assert len(record_calls(project)) == 1 + 1 + 5
+
+
+def test_batched_df_matches_single_export(project):
+    single = project.export_records(format_type="df")
+    by_records = project.export_records(format_type="df", batch_size=7)
+    by_forms = project.export_records(format_type="df", batch_size=1, batch_by="forms")
+
+    assert by_records.equals(single)
+    assert by_forms[single.columns].equals(single)
+
+
+def test_batched_by_forms_json_merges_rows(project):
+    batched = project.export_records(batch_size=1, batch_by="forms")
+
+    assert len(batched) == len(RECORDS)
+    assert batched[0] == {key: RECORDS[0][key] for key in batched[0]}
+    assert set(batched[0]) == set(RECORDS[0])
+
+
+def test_batched_with_explicit_records(project):
+    batched = project.export_records(format_type="csv", records=["2", "3", "4"], batch_size=2)
+
+    assert batched == project.export_records(format_type="csv", records=["2", "3", "4"])
+
+
+def test_batched_xml_is_rejected(project):
+    with pytest.raises(ValueError):
+        project.export_records(format_type="xml", batch_size=10)
+
+
+def test_batch_size_is_not_the_streaming_chunksize(project):
+    with pytest.raises(ValueError, match="batch_size cannot be combined"):
+        project.export_records(format_type="df", batch_size=10, chunksize=10)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,94 @@
+import json
+from functools import partial
+import pandas as pd
+import pytest
+import responses
+from redcap import Project, RedcapError
+from fake_redcap import callback
+
+URL = "https://redcap.example.org/api/"
+TOKEN = "1" * 32
+
+
+@pytest.fixture
+def project():
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        calls = []
+        rsps.add_callback(responses.POST, URL, callback=partial(callback, calls=calls))
+        project = Project(URL, TOKEN)
+        project.calls = calls
+        yield project
+
+
+def import_calls(project):
+    return [call for call in project.calls if "data" in call]
+
+
+def make_rows(n, bad=()):
+    return [
+        {"record_id": str(i), "hgb_gl": "bad" if i in bad else str(120 + i)}
+        for i in range(n)
+    ]
+
+
+def test_batched_json_import_by_rows(project):
+    responses_by_batch = project.import_records(make_rows(10), batch_size=4, max_workers=2)
+
+    assert responses_by_batch == [{"count": 4}, {"count": 4}, {"count": 2}]
+    assert len(import_calls(project)) == 3
+
+
+def test_batched_df_import_by_bytes(project):
+    df = pd.DataFrame(make_rows(10)).set_index("record_id")
+    row_bytes = len("0,120\n")
+
+    responses_by_batch = project.import_records(
+        df, import_format="df", return_content="ids", batch_bytes=3 * row_bytes + len("record_id,hgb_gl\n")
+    )
+
+    assert [len(ids) for ids in responses_by_batch] == [3, 3, 3, 1]
+    assert sum(responses_by_batch, []) == [str(i) for i in range(10)]
+    assert import_calls(project)[0]["data"].startswith("record_id,hgb_gl\n")
+
+
+def test_batched_import_resumes_from_checkpoint(project, tmp_path):
+    checkpoint = tmp_path / "import_checkpoint.json"
+
+    with pytest.raises(RedcapError):
+        project.import_records(make_rows(9, bad={5}), batch_size=3, checkpoint_path=str(checkpoint))
+
+    state = json.loads(checkpoint.read_text())
+    assert sorted(state["completed"]) == ["0", "2"]
+
+    # Same data: the successful batches are skipped, the failing one is retried
+    project.calls.clear()
+    with pytest.raises(RedcapError):
+        project.import_records(make_rows(9, bad={5}), batch_size=3, checkpoint_path=str(checkpoint))
+    assert len(import_calls(project)) == 1
+
+    # Changed data does not reuse the checkpoint
+    project.calls.clear()
+    result = project.import_records(make_rows(9), batch_size=3, checkpoint_path=str(checkpoint))
+    assert result == [{"count": 3}] * 3
+    assert len(import_calls(project)) == 3
+    assert not checkpoint.exists()
+
+
+def test_unwritable_checkpoint_does_not_stop_the_import(project, tmp_path, capsys):
+    checkpoint = tmp_path / "read-only share" / "import_checkpoint.json"
+
+    result = project.import_records(make_rows(9), batch_size=3, max_workers=2, checkpoint_path=str(checkpoint))
+
+    assert result == [{"count": 3}] * 3
+    assert len(import_calls(project)) == 3
+    assert "Could not write import checkpoint" in capsys.readouterr().out
+
+    # A path that cannot be replaced or removed either
+    checkpoint = tmp_path / "checkpoint_dir"
+    checkpoint.mkdir()
+    assert project.import_records(make_rows(3), checkpoint_path=str(checkpoint), batch_size=3) == [{"count": 3}]
+    assert "Could not remove import checkpoint" in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+import pytest
+from redcap import Project, RedcapError
+from redcap.request import RetryPolicy, create_session
+
+TOKEN = "1" * 32
+FAST_RETRY = RetryPolicy(total=3, backoff_factor=0.01, max_backoff=0.05, status_forcelist=(502, 503))
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers with the next scripted failure before succeeding"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        params = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+        server = self.server
+        with server.lock:
+            server.calls.append(params)
+            failure = server.failures.pop(0) if server.failures else None
+            server.connections.add(self.client_address)
+
+        if failure == "slow":
+            time.sleep(0.5)
+        elif failure is not None:
+            self.send_response(failure)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({"count": 1} if "data" in params else {"project_title": "Stub"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    server.lock = threading.Lock()
+    server.calls = []
+    server.failures = []
+    server.connections = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/api/"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_export_is_retried_after_bad_gateway(server):
+    server.failures = [502, 503]
+    project = Project(server.url, TOKEN, session=create_session(), retry=FAST_RETRY)
+
+    assert project.export_project_info()["project_title"] == "Stub"
+    assert len(server.calls) == 3
+
+
+def test_export_gives_up_after_retry_total(server):
+    server.failures = [502] * 5
+    project = Project(server.url, TOKEN, session=create_session(), retry=FAST_RETRY)
+
+    with pytest.raises(RedcapError):
+        project.export_project_info()
+    assert len(server.calls) == 4
+
+
+def test_export_is_retried_after_timeout(server):
+    server.failures = ["slow"]
+    project = Project(server.url, TOKEN, session=create_session(), retry=FAST_RETRY, timeout=0.2)
+
+    assert project.export_project_info()["project_title"] == "Stub"
+    assert len(server.calls) == 2
+
+
+def test_import_is_not_retried(server):
+    server.failures = [502]
+    project = Project(server.url, TOKEN, session=create_session(), retry=FAST_RETRY)
+
+    with pytest.raises(RedcapError):
+        project.import_records([{"record_id": "1"}])
+    assert len(server.calls) == 1
+
+
+def test_session_reuses_connections_across_threads(server):
+    project = Project(server.url, TOKEN, session=create_session(pool_maxsize=2), retry=FAST_RETRY)
+    project.project_info_ttl = 0
+
+    threads = [threading.Thread(target=project.export_project_info) for _ in range(2)]
+    for _ in range(3):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        threads = [threading.Thread(target=project.export_project_info) for _ in range(2)]
+
+    assert len(server.calls) == 6
+    assert len(server.connections) <= 2
+
+
+if __name__ == "__main__":
+    pytest.main()
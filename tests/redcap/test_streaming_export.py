@@ -0,0 +1,49 @@
+from functools import partial
+import json
+import pandas as pd
+import pytest
+import responses
+from redcap import Project, RedcapError
+from fake_redcap import RECORDS, callback
+
+URL = "https://redcap.example.org/api/"
+TOKEN = "1" * 32
+
+
+@pytest.fixture
+def project():
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.add_callback(responses.POST, URL, callback=partial(callback, calls=[]))
+        yield Project(URL, TOKEN)
+
+
+def test_export_records_in_dataframe_chunks(project):
+    chunks = list(project.export_records(format_type="df", chunksize=10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 3]
+    assert pd.concat(chunks).equals(project.export_records(format_type="df"))
+
+
+def test_export_records_to_file(project, tmp_path):
+    path = tmp_path / "records.csv"
+
+    assert project.export_records(format_type="csv", stream_to=str(path)) == str(path)
+    assert path.read_text() == project.export_records(format_type="csv")
+
+
+def test_streaming_requires_target(project):
+    with pytest.raises(ValueError):
+        project.export_records(format_type="json", chunksize=10)
+
+
+@responses.activate
+def test_streaming_raises_on_error_status():
+    responses.add(responses.POST, URL, status=400, body=json.dumps({"error": "You do not have permissions"}))
+    project = Project(URL, TOKEN)
+
+    with pytest.raises(RedcapError):
+        project.export_logging(format_type="csv", stream_to="unused.csv")
+
+
+if __name__ == "__main__":
+    pytest.main()
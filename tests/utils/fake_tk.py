@@ -0,0 +1,31 @@
+"""A stand-in for the Tk root, for code that only schedules work with after()"""
+import threading
+
+
+class FakeRoot:
+    """after() callbacks run when run_pending() is called."""
+
+    def __init__(self):
+        self.scheduled = {}
+        self.next_id = 0
+
+    def after(self, delay_ms, func, *args):
+        self.next_id += 1
+        self.scheduled[self.next_id] = (func, args)
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id, None)
+
+    def run_next(self):
+        func, args = self.scheduled.pop(min(self.scheduled))
+        func(*args)
+
+    def run_pending(self, timeout=5):
+        # Keep running callbacks until nothing is rescheduled (the workers have finished)
+        for _ in range(int(timeout / 0.01)):
+            if not self.scheduled:
+                return
+            self.run_next()
+            threading.Event().wait(0.01)
+        raise AssertionError("after() callbacks kept being rescheduled")
@@ -0,0 +1,142 @@
+import pandas as pd
+import pytest
+from types import SimpleNamespace
+from src.models.alert import Alert, AlertManager
+from src.utils.alert_handling import check_deviations, create_alerts_from_dataframe
+
+
+def blood_alert(active=True):
+    return Alert("Blood", {
+        "hgb_gl": {"condition": "not empty, < 117, > 170", "reference_interval": "117 < x < 170"},
+        "wbc_109l": {"condition": "not empty, < 3.5, > 12", "reference_interval": "3.5 < x < 12"},
+    }, active)
+
+
+def pressure_alert(active=True):
+    return Alert("Pressure", {
+        "bp_right_sys": {"condition": "abs(bp_right_sys - bp_left_sys) > 20", "reference_interval": None},
+        "bp_left_sys": {"condition": "abs(bp_right_sys - bp_left_sys) > 20", "reference_interval": None},
+        "hgb_gl": {"condition": "> 200", "reference_interval": None},
+    }, active)
+
+
+@pytest.fixture
+def manager():
+    manager = AlertManager()
+    manager.add_alert(blood_alert())
+    manager.add_alert(pressure_alert(active=False))
+    return manager
+
+
+def titles(alerts):
+    return [alert.title for alert in alerts]
+
+
+def test_variables_and_titles_are_indexed(manager):
+    assert titles(manager.get_alerts_by_variable("hgb_gl")) == ["Blood", "Pressure"]
+    assert titles(manager.get_alerts_by_variable("bp_left_sys")) == ["Pressure"]
+    assert manager.get_alerts_by_variable("mcv_fl") == []
+    assert titles(manager.get_alerts_by_title("Pressure")) == ["Pressure"]
+    assert manager.get_alert("Missing") is None
+    assert "Blood" in manager and len(manager) == 2
+
+
+def test_active_views_follow_set_active(manager):
+    assert titles(manager.active_alerts) == ["Blood"]
+    assert titles(manager.get_alerts_by_variable("hgb_gl", active_only=True)) == ["Blood"]
+    assert "bp_left_sys" not in manager.variables(active_only=True)
+
+    manager.set_active("Pressure", True)
+    manager.set_active("Blood", False)
+
+    assert titles(manager.active_alerts) == ["Pressure"]
+    assert titles(manager.get_alerts_by_variable("wbc_109l", active_only=True)) == []
+    assert titles(manager.get_alerts_by_variable("hgb_gl", active_only=True)) == ["Pressure"]
+
+
+def test_alerts_sharing_a_title_are_all_kept(manager):
+    second_blood = Alert("Blood", {"mcv_fl": {"condition": "< 80", "reference_interval": None}}, False)
+
+    manager.add_alert(second_blood)
+
+    assert titles(manager.alerts) == ["Blood", "Pressure", "Blood"]
+    assert manager.get_alerts_by_title("Blood")[1] is second_blood
+    assert titles(manager.select(titles=["Blood"])) == ["Blood", "Blood"]
+    assert titles(manager.get_alerts_by_variable("hgb_gl")) == ["Blood", "Pressure"]
+    assert manager.get_alerts_by_variable("mcv_fl", active_only=True) == []
+
+    manager.set_active("Blood", True)
+    assert titles(manager.get_alerts_by_variable("mcv_fl", active_only=True)) == ["Blood"]
+
+
+def test_active_is_read_only():
+    alert = blood_alert()
+
+    with pytest.raises(AttributeError):
+        alert.active = False
+    assert alert.is_active()
+
+
+def test_removed_alerts_leave_the_indexes(manager):
+    manager.add_alert(Alert("Blood", {"mcv_fl": {"condition": "< 80", "reference_interval": None}}, True))
+
+    assert titles(manager.remove_alert("Blood")) == ["Blood", "Blood"]
+    assert manager.remove_alert("Blood") == []
+
+    assert titles(manager.get_alerts_by_variable("hgb_gl")) == ["Pressure"]
+    assert "wbc_109l" not in manager.variables()
+    assert "mcv_fl" not in manager.variables()
+    assert manager.active_alerts == []
+
+
+def test_select_by_titles_variables_and_activity(manager):
+    assert titles(manager.select()) == ["Blood", "Pressure"]
+    assert titles(manager.select(titles=["Pressure", "Blood", "Missing"])) == ["Blood", "Pressure"]
+    assert titles(manager.select(variables=["bp_left_sys", "wbc_109l"])) == ["Blood", "Pressure"]
+    assert titles(manager.select(variables=["hgb_gl"], active_only=True)) == ["Blood"]
+    assert titles(manager.select(titles=["Pressure"], variables=["wbc_109l"])) == []
+
+
+def test_check_deviations_evaluates_the_selected_alerts(manager):
+    project = SimpleNamespace(record_label_field="study_id", alert_manager=manager)
+    df = pd.DataFrame({
+        "study_id": ["A1", "A2"],
+        "hgb_gl": [100, 210],
+        "wbc_109l": [2.0, 5.0],
+        "bp_right_sys": [120, 150],
+        "bp_left_sys": [125, 120],
+    })
+
+    def deviations(**selection):
+        return {key: sorted(value) for key, value in check_deviations(df, project, vectorized, **selection).items()}
+
+    for vectorized in (True, False):
+        assert deviations() == {"A1": ["hgb_gl", "wbc_109l"], "A2": ["bp_left_sys", "bp_right_sys", "hgb_gl"]}
+        assert deviations(active_only=True) == {"A1": ["hgb_gl", "wbc_109l"], "A2": ["hgb_gl"]}
+        assert deviations(variables=["wbc_109l"]) == {"A1": ["wbc_109l"]}
+        assert deviations(titles=["Pressure"]) == {"A2": ["bp_left_sys", "bp_right_sys", "hgb_gl"]}
+
+
+def test_rows_with_the_same_title_are_all_checked():
+    project = SimpleNamespace(record_label_field="study_id", alert_manager=AlertManager())
+    project.add_alert = lambda title, alert_dict, active: project.alert_manager.add_alert(Alert(title, alert_dict, active))
+    project.remove_alert = project.alert_manager.remove_alert
+    alerts_df = pd.DataFrame({
+        "alert-title": ["Blood", "Blood"],
+        "alert-condition": ["[hgb_gl] < 117", "[wbc_109l] > 12"],
+        "alert-deactivated": ["N", "N"],
+    })
+    df = pd.DataFrame({"study_id": ["A1"], "hgb_gl": [100], "wbc_109l": [20]})
+
+    # Loading the file twice does not duplicate its alerts
+    create_alerts_from_dataframe(alerts_df, project)
+    create_alerts_from_dataframe(alerts_df, project)
+
+    assert len(project.alert_manager) == 2
+    for vectorized in (True, False):
+        deviations = check_deviations(df, project, vectorized, titles=["Blood"])
+        assert sorted(deviations["A1"]) == ["hgb_gl", "wbc_109l"]
+
+
+if __name__ == "__main__":
+    pytest.main()
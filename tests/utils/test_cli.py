@@ -0,0 +1,145 @@
+import json
+import os
+import runpy
+import shutil
+import subprocess
+import sys
+import pandas as pd
+import pytest
+from unittest.mock import Mock, patch
+from src import cli
+from src.models import project as project_module
+from src.models.alert import Alert
+from src.utils.reader_prep import DuplicateGroup, DuplicateReport
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+@pytest.fixture
+def project(monkeypatch):
+    project = Mock(def_field="record_id", record_label_field="study_id")
+    monkeypatch.setattr(project_module, "redcapProj", lambda api_url, api_token: project)
+    return project
+
+
+@pytest.fixture
+def alert_run(project, monkeypatch, tmp_path):
+    alerts_csv = tmp_path / "alerts.csv"
+    pd.DataFrame({
+        "alert-title": ["Low Hb", "High WBC"],
+        "alert-condition": ["[hgb_gl] < 120", "[wbc_109l] > 10"],
+        "alert-deactivated": ["N", "N"],
+    }).to_csv(alerts_csv, index=False)
+
+    project.export_records.return_value = pd.DataFrame({"study_id": ["A1", "A2"], "hgb_gl": [110, 130]})
+    monkeypatch.setattr(cli, "find_study_id", lambda project: "study_id")
+    monkeypatch.setattr(
+        cli, "create_alerts_from_dataframe",
+        lambda df, project: [Alert(title, {"hgb_gl": {"predicates": [], "reference_interval": "120-160"}}, True) for title in df["alert-title"]]
+    )
+    monkeypatch.setattr(cli, "check_deviations", lambda df, project, titles=None: {"A1": ["hgb_gl"]})
+    return alerts_csv
+
+
+def test_gui_toolkit_is_not_imported():
+    code = "import sys, src.cli; print(any(name.split('.')[0] in ('customtkinter', 'tkinter') for name in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_installed_console_script_runs(tmp_path, monkeypatch):
+    """Installs the packages and console script of setup.py into a folder, as pip would."""
+    monkeypatch.chdir(ROOT)
+    setup_kwargs = {}
+    with patch("setuptools.setup", lambda **kwargs: setup_kwargs.update(kwargs)):
+        runpy.run_path("setup.py")
+
+    target = tmp_path / "site-packages"
+    for package in setup_kwargs["packages"]:
+        package_dir = os.path.join(ROOT, *package.split("."))
+        os.makedirs(target.joinpath(*package.split(".")))
+        for name in os.listdir(package_dir):
+            if name.endswith(".py"):
+                shutil.copy(os.path.join(package_dir, name), target.joinpath(*package.split("."), name))
+
+    (script,) = setup_kwargs["entry_points"]["console_scripts"]
+    name, target_ref = (part.strip() for part in script.split("="))
+    module, function = target_ref.split(":")
+    script_path = target / name
+    script_path.write_text(f"import sys\nfrom {module} import {function}\nsys.exit({function}())\n")
+
+    # Run from elsewhere, so only the installed copy can be imported
+    result = subprocess.run(
+        [sys.executable, str(script_path), "--help"], capture_output=True, text=True, cwd=tmp_path,
+        env={key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.startswith("usage: kfcap")
+
+
+def test_import_reports_imported_ids_and_duplicates(project, monkeypatch, tmp_path, capsys):
+    calls = []
+
+    def import_data(data_path, project, force_full=False, return_report=False):
+        calls.append((data_path, force_full, return_report))
+        duplicates = [DuplicateGroup("S1", "2024-01-02", "08:15", [0, 3], ["a.csv", "b.csv"])]
+        return ["S1", "S2"], DuplicateReport(duplicates, [])
+
+    monkeypatch.setattr(cli, "import_data", import_data)
+
+    assert cli.main(["--token", "1" * 32, "import", str(tmp_path), "--force-full"]) == 0
+    report = json.loads(capsys.readouterr().out)
+
+    assert calls == [(str(tmp_path), True, True)]
+    assert report["imported"] == ["S1", "S2"]
+    assert report["duplicates"]["within_data"][0]["source_files"] == ["a.csv", "b.csv"]
+    assert report["duplicates"]["in_redcap"] == []
+
+    csv_report = tmp_path / "report.csv"
+    assert cli.main(["--token", "1" * 32, "import", str(tmp_path), "--report", str(csv_report)]) == 0
+    table = pd.read_csv(csv_report)
+    assert table["status"].tolist() == ["imported", "imported", "within_data", "within_data"]
+    assert table["row"].dropna().tolist() == [0, 3]
+
+
+def test_alerts_filters_titles_and_writes_csv(alert_run, project, tmp_path):
+    report_path = tmp_path / "deviations.csv"
+
+    assert cli.main(["--token", "1" * 32, "alerts", str(alert_run), "--alert", "Low Hb", "--report", str(report_path)]) == 0
+
+    assert pd.read_csv(report_path).to_dict("records") == [{"study_id": "A1", "variable": "hgb_gl"}]
+    project.export_records.assert_called_once_with(format_type="df")
+
+
+def test_alerts_json_lists_checked_alerts(alert_run, tmp_path):
+    report_path = tmp_path / "deviations.json"
+
+    assert cli.main(["--token", "1" * 32, "alerts", str(alert_run), "--report", str(report_path)]) == 0
+
+    assert json.loads(report_path.read_text()) == {"alerts": ["Low Hb", "High WBC"], "deviations": {"A1": ["hgb_gl"]}}
+
+
+def test_export_writes_the_deviation_table(alert_run, tmp_path):
+    output = tmp_path / "deviations.csv"
+
+    assert cli.main(["--token", "1" * 32, "export", str(alert_run), str(output)]) == 0
+
+    table = pd.read_csv(output)
+    assert table["deviating_variables"].tolist() == ["hgb_gl"]
+
+
+def test_token_is_required(monkeypatch):
+    monkeypatch.delenv(cli.TOKEN_ENV, raising=False)
+    with pytest.raises(SystemExit):
+        cli.main(["alerts", "alerts.csv"])
+
+
+def test_failures_exit_with_status_1(project, capsys):
+    project.export_records.side_effect = RuntimeError("REDCap is down")
+
+    assert cli.main(["--token", "1" * 32, "alerts", "alerts.csv"]) == 1
+    assert "kfcap alerts failed: REDCap is down" in capsys.readouterr().err
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import Mock
+import numpy as np
 import pandas as pd
 from src.models.alert import Alert
 from src.utils.alert_handling import create_alerts_from_dataframe, check_deviations, find_study_id
@@ -21,9 +22,7 @@ def test_check_deviations():
     })
 
     project_instance = Mock()
-    project_instance.export_project_info.return_value = {
-        'custom_record_label': '[record_id]'
-    }
+    project_instance.record_label_field = 'record_id'
     project_instance.alerts = [
         Alert("Alert 1", {
             "wbc_109l": {"condition": "not empty, < 3.5, > 12", "reference_interval": "3.5 < x < 12.0"},
@@ -70,9 +69,7 @@ def test_check_deviations_with_missing_values():
     })
 
     project_instance = Mock()
-    project_instance.export_project_info.return_value = {
-        'custom_record_label': '[record_id]'
-    }
+    project_instance.record_label_field = 'record_id'
     project_instance.alerts = [
         Alert("Alert 1", {
             "bp_right_sys": {"condition": "not empty, < 80, > 180", "reference_interval": "80.0 < x < 180.0"},
@@ -111,9 +108,7 @@ def test_check_deviations_with_abs_condition():
     })
 
     project_instance = Mock()
-    project_instance.export_project_info.return_value = {
-        'custom_record_label': '[record_id]'
-    }
+    project_instance.record_label_field = 'record_id'
     project_instance.alerts = [
         Alert("Alert 1", {
             "bp_right_sys": {"condition": "abs(bp_right_sys - bp_left_sys) > 20", "reference_interval": "abs(bp_right_sys - bp_left_sys) > 20"},
@@ -153,9 +148,7 @@ def test_check_deviations_with_tricky_missing_values():
     })
 
     project_instance = Mock()
-    project_instance.export_project_info.return_value = {
-        'custom_record_label': '[record_id]'
-    }
+    project_instance.record_label_field = 'record_id'
     project_instance.alerts = [
         Alert("Alert 1", {
             "bp_right_sys,bp_left_sys": {"condition": "abs(bp_right_sys - bp_left_sys) > 20", "reference_interval": "abs(bp_right_sys - bp_left_sys) > 20"},
@@ -229,9 +222,7 @@ def test_end_to_end_alerts_and_deviations_lab():
     # Create a mock project_instance
     project_instance = Mock()
     project_instance.add_alert = Mock()
-    project_instance.export_project_info.return_value = {
-        'custom_record_label': '[record_id]'
-    }
+    project_instance.record_label_field = 'record_id'
 
     # Call the function to create alerts
     alerts = create_alerts_from_dataframe(df, project_instance)
@@ -327,9 +318,7 @@ def test_end_to_end_alerts_and_deviations_bp():
     # Create a mock project_instance
     project_instance = Mock()
     project_instance.add_alert = Mock()
-    project_instance.export_project_info.return_value = {
-        'custom_record_label': '[record_id]'
-    }
+    project_instance.record_label_field = 'record_id'
 
     # Call the function to create alerts
     alerts = create_alerts_from_dataframe(df, project_instance)
@@ -376,5 +365,42 @@ def test_end_to_end_alerts_and_deviations_bp():
         assert set(deviations[key]) == set(expected_deviations[key]), f"Expected {expected_deviations[key]}, but got {deviations[key]}"
 
 
+def test_check_deviations_vectorized_matches_rowwise():
+    rng = np.random.default_rng(0)
+    n = 500
+    bp_right = rng.normal(130, 30, n).round()
+    bp_right[rng.random(n) < 0.1] = np.nan
+    df = pd.DataFrame({
+        'record_id': [f"ID{i}" for i in range(n)],
+        # Numbers in an object column, as when a column also holds text or None
+        'wbc_109l': pd.Series(rng.normal(7, 3, n).round(1), dtype=object),
+        'plt_109l': rng.normal(260, 80, n).round(),
+        'bp_right_sys': bp_right,
+        'bp_left_sys': pd.Series(rng.normal(130, 30, n).round(), dtype=object).where(rng.random(n) > 0.1, ""),
+    })
+
+    project_instance = Mock()
+    project_instance.record_label_field = 'record_id'
+    project_instance.alerts = [
+        Alert("Alert 1", {
+            "wbc_109l": {"condition": "not empty, < 3.5, > 12", "reference_interval": "3.5 < x < 12.0"},
+            "plt_109l": {"condition": "< 145, > 387", "reference_interval": "145.0 < x < 387.0"}
+        }, True),
+        Alert("Alert 2", {
+            "bp_right_sys": {"condition": "not empty, < 80, > 180, abs(bp_right_sys - bp_left_sys) > 20", "reference_interval": "80.0 < x < 180.0"},
+            "bp_left_sys": {"condition": "not empty, < 80, > 180, abs(bp_right_sys - bp_left_sys) > 20", "reference_interval": "80.0 < x < 180.0"}
+        }, False)
+    ]
+
+    rowwise = check_deviations(df, project_instance, vectorized=False)
+    vectorized = check_deviations(df, project_instance, vectorized=True)
+
+    assert vectorized == rowwise
+    assert list(vectorized) == list(rowwise)
+    alert_order = ["wbc_109l", "plt_109l", "bp_right_sys", "bp_left_sys"]
+    assert all(variables == sorted(variables, key=alert_order.index) for variables in rowwise.values())
+    assert any(len(variables) > 2 for variables in rowwise.values())
+
+
 if __name__ == "__main__":
     pytest.main()
\ No newline at end of file
@@ -0,0 +1,124 @@
+import pandas as pd
+import pytest
+from unittest.mock import Mock
+from src.utils.reader_prep import (
+    find_duplicates, format_duplicate_report, write_duplicate_report, clear_record_label_index
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_index_cache():
+    clear_record_label_index()
+    yield
+    clear_record_label_index()
+
+
+def scans(rows):
+    return pd.DataFrame(rows, columns=["sample_id", "scan_date", "scan_time"]).astype("string")
+
+
+def make_project(label_records, scan_records):
+    project = Mock(
+        url="https://redcap.example.org/api/", token="1" * 32, def_field="record_id",
+        record_label_field="study_id", field_names=["record_id", "study_id", "scan_date", "scan_time"]
+    )
+
+    def export_records(format_type, fields, records=None):
+        if "study_id" in fields:
+            return label_records
+        return [record for record in scan_records if record["record_id"] in records]
+
+    project.export_records.side_effect = export_records
+    return project
+
+
+def test_duplicates_are_grouped_with_rows_and_files():
+    data = scans([
+        ["S1", "2024-01-02", "08:15"],
+        ["S2", "2024-01-02", "08:16"],
+        ["S1", "2024-01-02", "08:15"],
+        ["S2", "2024-01-03", "08:16"],
+        ["S2", "2024-01-02", "08:16"],
+        ["S1", "2024-01-02", "08:15"],
+    ])
+    sources = pd.Series(["a.csv"] * 3 + ["b.csv"] * 3)
+
+    keep, report = find_duplicates(data, sources=sources)
+
+    assert keep.tolist() == [True, True, False, True, False, False]
+    assert [(g.sample_id, g.rows, g.source_files) for g in report.within_data] == [
+        ("S1", [0, 2, 5], ["a.csv", "a.csv", "b.csv"]),
+        ("S2", [1, 4], ["a.csv", "b.csv"]),
+    ]
+    assert report.in_redcap == []
+
+
+def test_rows_are_reported_by_their_labels():
+    data = scans([["S1", "2024-01-02", "08:15"], ["S1", "2024-01-02", "08:15"]])
+    data.index = [10, 11]
+
+    keep, report = find_duplicates(data)
+
+    assert keep.tolist() == [True, False]
+    assert report.within_data[0].rows == [10, 11]
+    assert report.within_data[0].source_files == [None, None]
+
+
+def test_scans_already_in_redcap_are_dropped():
+    project = make_project(
+        [{"record_id": "1", "study_id": "S1"}, {"record_id": "2", "study_id": "S2"}],
+        [
+            {"record_id": "1", "scan_date": "2024-01-02", "scan_time": "08:15"},
+            {"record_id": "2", "scan_date": "", "scan_time": ""},
+        ],
+    )
+    data = scans([
+        ["S1", "2024-01-02", "08:15"],
+        ["S2", "2024-01-02", "08:16"],
+        ["S1", "2024-01-02", "08:15"],
+    ])
+
+    keep, report = find_duplicates(data, project)
+
+    project.export_records.assert_called_with(
+        format_type="json", records=["1", "2"], fields=["record_id", "scan_date", "scan_time"]
+    )
+    assert keep.tolist() == [False, True, False]
+    assert [(g.sample_id, g.rows) for g in report.in_redcap] == [("S1", [0, 2])]
+    assert len(report.within_data) == 1
+
+
+def test_new_samples_do_not_export_scans():
+    project = make_project([{"record_id": "1", "study_id": "S1"}], [])
+
+    keep, report = find_duplicates(scans([["S9", "2024-01-02", "08:15"]]), project)
+
+    assert keep.tolist() == [True]
+    assert project.export_records.call_count == 1
+
+
+def test_projects_without_scan_fields_are_not_exported():
+    project = Mock(field_names=["record_id", "study_id"])
+
+    keep, report = find_duplicates(scans([["S1", "2024-01-02", "08:15"]]), project)
+
+    assert keep.tolist() == [True]
+    project.export_records.assert_not_called()
+
+
+def test_report_is_appended_to_the_log(tmp_path):
+    data = scans([["S1", "2024-01-02", "08:15"], ["S1", "2024-01-02", "08:15"]])
+    keep, report = find_duplicates(data, sources=pd.Series(["/data/a.csv", "/data/b.csv"]))
+    log = tmp_path / "logs" / "duplicates_log.txt"
+
+    write_duplicate_report(report, str(log))
+    write_duplicate_report(find_duplicates(data.iloc[:1])[1], str(log))
+
+    assert format_duplicate_report(report) == (
+        "Duplicate rows in the data:\n  S1 2024-01-02 08:15: row 0 (a.csv), row 1 (b.csv)"
+    )
+    assert log.read_text().count("Duplicate rows in the data:") == 1
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,94 @@
+import os
+from unittest.mock import Mock
+import pandas as pd
+import pytest
+from src.utils import reader_prep
+from src.utils.manifest import ImportManifest
+
+
+def test_manifest_tracks_new_and_changed_files(tmp_path):
+    a, b = tmp_path / "a.csv", tmp_path / "b.csv"
+    a.write_text("sample_id\nS1\n")
+    b.write_text("sample_id\nS2\n")
+    manifest_path = str(tmp_path / "manifest.json")
+
+    manifest = ImportManifest(manifest_path, 42)
+    assert manifest.changed_files([str(a), str(b)]) == [str(a), str(b)]
+    manifest.record([str(a), str(b)])
+    manifest.save()
+
+    # Touched without changing the content
+    os.utime(a, (1, 1))
+    b.write_text("sample_id\nS2\nS3\n")
+    manifest = ImportManifest(manifest_path, 42)
+    assert manifest.changed_files([str(a), str(b)]) == [str(b)]
+
+    # Entries are kept per project
+    assert ImportManifest(manifest_path, 7).changed_files([str(a)]) == [str(a)]
+
+
+def test_unreadable_manifest_imports_everything(tmp_path, capsys):
+    a = tmp_path / "a.csv"
+    a.write_text("sample_id\nS1\n")
+    (tmp_path / "manifest.json").write_text("{not json")
+
+    manifest = ImportManifest(str(tmp_path / "manifest.json"), 42)
+
+    assert manifest.changed_files([str(a)]) == [str(a)]
+    assert "Ignoring import manifest" in capsys.readouterr().out
+
+
+@pytest.fixture
+def olo_folder(tmp_path, monkeypatch):
+    """Data folder with two exports and the REDCap side stubbed, S3 has no record yet."""
+    pd.DataFrame({"sample_id": ["S1", "S2"]}).to_csv(tmp_path / "a.csv", index=False)
+    pd.DataFrame({"sample_id": ["S3"]}).to_csv(tmp_path / "b.csv", index=False)
+
+    def clean_olo(data, project, sources=None, return_report=False, skip_imported=True):
+        project.skip_imported = skip_imported
+        return (data, reader_prep.DuplicateReport([], [])) if return_report else data
+
+    monkeypatch.setattr(reader_prep, "clean_olo", clean_olo)
+
+    def match_to_redcap(data, project):
+        matched = data[data["sample_id"].isin(["S1", "S2"])]
+        return pd.DataFrame({"record_id": range(1, len(matched) + 1), "study_id": matched["sample_id"].tolist()})
+
+    monkeypatch.setattr(reader_prep, "match_to_redcap", match_to_redcap)
+
+    project = Mock(record_label_field="study_id", project_info={"project_id": 42})
+    return tmp_path, project
+
+
+def test_import_data_skips_imported_files(olo_folder, monkeypatch):
+    data_path, project = olo_folder
+
+    assert reader_prep.import_data(str(data_path), project) == ["S1", "S2"]
+    project.import_records.reset_mock()
+
+    # b.csv had a row without a REDCap record, so it is read again, a.csv is not
+    read = []
+    original = reader_prep.read_convert_files
+    monkeypatch.setattr(reader_prep, "read_convert_files", lambda files, max_workers=None: read.extend(files) or original(files, max_workers))
+    assert reader_prep.import_data(str(data_path), project) == []
+    assert [os.path.basename(file) for file in read] == ["b.csv"]
+    project.import_records.assert_not_called()
+
+    assert reader_prep.import_data(str(data_path), project, force_full=True) == ["S1", "S2"]
+    # A full re-import overwrites scans already in REDCap
+    assert project.skip_imported is False
+
+
+def test_import_data_returns_early_without_changes(olo_folder):
+    data_path, project = olo_folder
+    os.remove(data_path / "b.csv")
+
+    reader_prep.import_data(str(data_path), project)
+    project.import_records.reset_mock()
+
+    assert reader_prep.import_data(str(data_path), project) == []
+    project.import_records.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,86 @@
+import threading
+import pytest
+from src.utils.jobs import JobRunner, EXPORT, EVALUATE
+from fake_tk import FakeRoot
+
+
+def run_job(func, *args):
+    root, events = FakeRoot(), []
+    runner = JobRunner(root)
+    runner.submit(
+        func, *args,
+        on_progress=lambda stage, detail: events.append(("progress", stage, threading.current_thread())),
+        on_done=lambda result: events.append(("done", result, threading.current_thread())),
+        on_error=lambda error: events.append(("error", error, threading.current_thread())),
+        on_cancelled=lambda: events.append(("cancelled", None, threading.current_thread())),
+    )
+    root.run_pending()
+    assert not runner.busy
+    return events
+
+
+def test_progress_and_result_are_delivered_on_the_ui_thread():
+    def job_func(job, value):
+        job.report(EXPORT)
+        job.report(EVALUATE)
+        return value * 2
+
+    events = run_job(job_func, 21)
+
+    assert [event[:2] for event in events] == [("progress", EXPORT), ("progress", EVALUATE), ("done", 42)]
+    assert all(event[2] is threading.main_thread() for event in events)
+
+
+def test_errors_are_delivered_to_on_error():
+    def job_func(job):
+        raise ValueError("bad file")
+
+    (event,) = run_job(job_func)
+    assert event[0] == "error"
+    assert str(event[1]) == "bad file"
+
+
+def test_cancel_stops_the_job_at_the_next_stage():
+    started, release, reached = threading.Event(), threading.Event(), []
+
+    def job_func(job):
+        job.report(EXPORT)
+        started.set()
+        release.wait(5)
+        job.report(EVALUATE)
+        reached.append(EVALUATE)
+
+    root, events = FakeRoot(), []
+    runner = JobRunner(root)
+    job = runner.submit(job_func, on_cancelled=lambda: events.append("cancelled"))
+    started.wait(5)
+    job.cancel()
+    release.set()
+    root.run_pending()
+
+    assert events == ["cancelled"]
+    assert reached == []
+
+
+def test_discard_drops_callbacks():
+    release = threading.Event()
+    root, events = FakeRoot(), []
+    runner = JobRunner(root)
+    job = runner.submit(lambda job: release.wait(5), on_done=events.append)
+
+    runner.discard()
+    release.set()
+
+    assert job.cancelled
+    assert not root.scheduled
+    assert events == []
+
+
+def test_runners_share_one_executor():
+    first, second = JobRunner(FakeRoot()), JobRunner(FakeRoot())
+
+    assert first._executor is second._executor
+
+
+if __name__ == "__main__":
+    pytest.main()
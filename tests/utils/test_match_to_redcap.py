@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+from unittest.mock import Mock
+from src.utils import reader_prep
+from src.utils.reader_prep import match_to_redcap, clear_record_label_index
+
+
+@pytest.fixture(autouse=True)
+def empty_index_cache():
+    clear_record_label_index()
+    yield
+    clear_record_label_index()
+
+
+def make_project(records):
+    project = Mock(url="https://redcap.example.org/api/", token="1" * 32, def_field="record_id", record_label_field="study_id")
+    project.export_records.return_value = records
+    return project
+
+
+def olo_data(sample_ids):
+    return pd.DataFrame({
+        "sample_id": pd.array(sample_ids, dtype="string"),
+        "hgb_gl": pd.array([130 + i for i in range(len(sample_ids))], dtype="Int64"),
+    })
+
+
+def test_only_the_id_fields_are_exported_and_matched():
+    project = make_project([
+        {"record_id": "1", "redcap_event_name": "visit_1_arm_1", "study_id": "MD1003"},
+        {"record_id": "1", "redcap_event_name": "visit_2_arm_1", "study_id": ""},
+        {"record_id": "2", "redcap_event_name": "visit_1_arm_1", "study_id": "3-1502"},
+    ])
+
+    matched = match_to_redcap(olo_data(["3-1502", "MD1003"]), project)
+
+    project.export_records.assert_called_once_with(format_type="json", fields=["record_id", "study_id"])
+    assert matched.columns.tolist() == ["record_id", "study_id", "hgb_gl"]
+    assert matched.to_dict("records") == [
+        {"record_id": "2", "study_id": "3-1502", "hgb_gl": 130},
+        {"record_id": "1", "study_id": "MD1003", "hgb_gl": 131},
+    ]
+
+
+def test_mapping_is_cached_and_reexported_for_unknown_samples(monkeypatch):
+    project = make_project([{"record_id": "1", "study_id": "MD1003"}])
+
+    match_to_redcap(olo_data(["MD1003"]), project)
+    match_to_redcap(olo_data(["MD1003"]), project)
+    assert project.export_records.call_count == 1
+
+    # A sample not in the cached mapping may have been registered since
+    project.export_records.return_value = [{"record_id": "1", "study_id": "MD1003"}, {"record_id": "2", "study_id": "AB0001"}]
+    monkeypatch.setattr(reader_prep, "RECORD_INDEX_RECHECK_AGE", 0)
+    matched = match_to_redcap(olo_data(["MD1003", "AB0001", "ZZ9999"]), project)
+
+    assert project.export_records.call_count == 2
+    assert matched["study_id"].tolist() == ["MD1003", "AB0001"]
+
+
+def test_fresh_mapping_is_not_exported_twice():
+    project = make_project([{"record_id": "1", "study_id": "MD1003"}])
+
+    matched = match_to_redcap(olo_data(["MD1003", "ZZ9999"]), project)
+
+    assert project.export_records.call_count == 1
+    assert matched["record_id"].tolist() == ["1"]
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,8 +1,11 @@
+import json
 import pytest
-from src.utils.parsing import parse_conditions
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.parsing import parse_conditions, get_parser, cache_info, clear_cache, load_cache, save_cache, normalize_condition
 import pandas as pd
 from unittest.mock import Mock
 from src.utils.alert_handling import create_alerts_from_dataframe
+from src.models.alert import Alert, Operator, Predicate
 
 
 def test_parse_conditions():
@@ -123,5 +126,90 @@ def test_create_alerts_from_dataframe():
     project_instance.add_alert.assert_any_call('Alert 2', alerts[1].alert_dict, False)
 
 
+def test_parse_conditions_compiled():
+    condition_str = '''(([bp_right_sys] <> "" and ([bp_right_sys] < 80 or [bp_right_sys] > 180)) or
+        (abs([bp_right_sys] - [bp_left_sys]) > 20))'''
+
+    output = parse_conditions(condition_str, compiled=True)
+
+    assert output["bp_right_sys"]["predicates"] == [
+        Predicate(Operator.NOT_EMPTY),
+        Predicate(Operator.LT, 80),
+        Predicate(Operator.GT, 180),
+    ]
+    assert output["bp_right_sys"]["reference_interval"] == '80.0 < x < 180.0'
+    assert output["bp_right_sys,bp_left_sys"]["predicates"] == [
+        Predicate(Operator.ABS_DIFF_GT, 20, ("bp_right_sys", "bp_left_sys"))
+    ]
+
+
+def test_alert_compiles_condition_strings():
+    alert = Alert("Alert 1", {
+        "bp_right_sys": {"condition": "not empty, < 80, > 180, abs(bp_right_sys - bp_left_sys) > 20", "reference_interval": "80.0 < x < 180.0"},
+        "wbc_109l": {"condition": "not empty, < 3.5, > 12", "reference_interval": "3.5 < x < 12.0"}
+    }, True)
+
+    assert alert.predicates["bp_right_sys"][-1] == Predicate(Operator.ABS_DIFF_GT, 20, ("bp_right_sys", "bp_left_sys"))
+    assert alert.predicates["wbc_109l"] == [
+        Predicate(Operator.NOT_EMPTY),
+        Predicate(Operator.LT, 3.5),
+        Predicate(Operator.GT, 12),
+    ]
+    assert str(alert.predicates["wbc_109l"][1]) == "< 3.5"
+
+
+def test_parser_is_built_once_and_thread_safe():
+    assert get_parser() is get_parser()
+
+    conditions = [
+        f'([var_{i}] <> "" and ([var_{i}] < {i} or [var_{i}] > {i + 10}))' for i in range(50)
+    ]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outputs = list(executor.map(parse_conditions, conditions))
+
+    for i, output in enumerate(outputs):
+        assert output == {f"var_{i}": {"conditions": f"not empty, < {i}, > {i + 10}", "reference_interval": f"{float(i):.1f} < x < {float(i + 10):.1f}"}}
+
+
+def test_parse_conditions_cache_hits_and_misses():
+    clear_cache()
+    condition_str = '([hgb_gl] <> "" and ([hgb_gl] < 117 or [hgb_gl] > 170))'
+
+    first = parse_conditions(condition_str)
+    second = parse_conditions("  " + condition_str.replace(" and ", "\n   and "))
+
+    assert first == second
+    info = cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_parse_conditions_cache_persists_next_to_csv(tmp_path):
+    condition_str = '(([bp_right_sys] <> "" and [bp_right_sys] < 80) or (abs([bp_right_sys] - [bp_left_sys]) > 20))'
+    csv_path = tmp_path / "alerts.csv"
+    pd.DataFrame({'alert-title': ['Alert 1'], 'alert-condition': [condition_str], 'alert-deactivated': ['N']}).to_csv(csv_path, index=False)
+
+    clear_cache()
+    expected = parse_conditions(condition_str, compiled=True)
+    save_cache(str(csv_path))
+
+    clear_cache()
+    assert load_cache(str(csv_path)) is True
+    assert parse_conditions(condition_str, compiled=True) == expected
+    assert cache_info().hits == 1
+    assert cache_info().misses == 0
+
+    # Conditions parsed for other alert files are not written next to this one
+    other_condition = '([hgb_gl] <> "" and [hgb_gl] < 117)'
+    parse_conditions(other_condition)
+    save_cache(str(csv_path))
+    stored = json.loads((tmp_path / "alerts.csv.conditions-cache.json").read_text())
+    assert list(stored["entries"]) == [normalize_condition(condition_str)]
+
+    # Editing the CSV invalidates the stored cache
+    csv_path.write_text(csv_path.read_text() + "\n")
+    clear_cache()
+    assert load_cache(str(csv_path)) is False
+
+
 if __name__ == "__main__":
     pytest.main()
\ No newline at end of file
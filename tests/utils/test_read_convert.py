@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import Mock
+from src.utils.reader_prep import read_convert, clean_olo
+
+
+def write_exports(folder, frames):
+    for name, df in frames.items():
+        df.to_csv(folder / name, index=False)
+
+
+def olo_export(sample_ids, hgb):
+    return pd.DataFrame({
+        "sample_id": sample_ids,
+        "hgb [g/dL]": hgb,
+        "plt [10^3/uL]": [250.4] * len(sample_ids),
+    })
+
+
+def test_files_are_merged_in_name_order(tmp_path):
+    write_exports(tmp_path, {
+        "c.csv": olo_export(["S5"], [13.0]),
+        "a.csv": olo_export(["S1", "S2"], [12.1, 14.0]),
+        "b.csv": olo_export(["S3", "S4"], [1.0, 15.5]),
+    })
+
+    serial = read_convert(str(tmp_path), max_workers=1)
+    parallel = read_convert(str(tmp_path), max_workers=2)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert serial["sample_id"].tolist() == ["S1", "S2", "S3", "S4", "S5"]
+    assert serial["hgb [g/L]"].tolist() == [121, 140, 160, 155, 130]
+    assert serial["hgb [g/L]"].dtype == "Int64"
+    assert serial["plt [10^9/L]"].tolist() == [250] * 5
+    assert serial["sample_id"].dtype == "string"
+
+
+def test_missing_values_stay_missing_until_serialized(tmp_path):
+    write_exports(tmp_path, {"a.csv": olo_export(["S1", "S2"], [12.1, np.nan]).assign(flags=["x", np.nan])})
+
+    data = read_convert(str(tmp_path), max_workers=1)
+
+    assert data["hgb [g/L]"].isna().tolist() == [False, True]
+    assert data["flags"].isna().tolist() == [False, True]
+    assert data.to_csv(index=False).splitlines()[1:] == ["S1,121,250,x", "S2,,250,"]
+
+
+def test_differing_columns_are_logged(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    data.mkdir()
+    (tmp_path / "logs").mkdir()
+    extra = olo_export(["S3"], [13.0]).assign(extra_column=[1])
+    write_exports(data, {"a.csv": olo_export(["S1"], [12.0]), "b.csv": extra})
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(ValueError, match="Column names differ"):
+        read_convert(str(data), max_workers=2)
+
+    log = (tmp_path / "logs" / "differing_columns_log.txt").read_text()
+    assert f"File: {data / 'b.csv'}" in log
+    assert "Differing columns: extra_column" in log
+
+
+def olo_cleaning_input(rows):
+    """OLO data as read_convert returns it, clean_olo renames its 57 columns by position."""
+    named = {0: "sample_id", 43: "reject_reason", 44: "scan_date", 45: "scan_time"}
+    rows = pd.DataFrame(rows, columns=list(named.values()))
+    data = pd.DataFrame({
+        named.get(i, f"column_{i}"): rows[named[i]] if i in named else 1.5 for i in range(57)
+    })
+    return data.convert_dtypes(convert_integer=False)
+
+
+def test_clean_olo_filters_with_string_ops():
+    data = olo_cleaning_input([
+        ["S1", None, "2024-01-02", "08:15:30"],
+        ["Test-1", None, "2024-01-02", "08:16:00"],
+        ["S2", "Clotted", "2024-01-02", "08:17:00"],
+        ["S3", " ", "2024-01-02", "08:18"],
+        ["S1", None, "2024-01-02", "08:15:59"],
+    ])
+
+    cleaned = clean_olo(data, Mock(field_names=[]))
+
+    assert cleaned["sample_id"].tolist() == ["S1", "S3"]
+    assert cleaned["scan_time"].tolist() == ["08:15", "08:18"]
+    assert cleaned["hgb_gl"].tolist() == [1.5, 1.5]
+    assert cleaned["reject_reason"].isna().all()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.models.alert import Alert
+from src.utils.alert_handling import DeviationRecords, sort_key
+
+
+def make_records():
+    redcap_data = pd.DataFrame({
+        'record_id': ['MD1003', '3-1502', 'AB0001'],
+        'wbc_109l': [2.0, 4.0, np.nan],
+        'plt_109l': [100, 200, 300],
+    })
+    alerts = [
+        Alert("Alert 1", {
+            "wbc_109l": {"condition": "< 3.5", "reference_interval": "3.5 < x < 12.0"},
+            "hgb_gl": {"condition": "< 117", "reference_interval": "117 < x < 153.0"},
+        }, True),
+        Alert("Alert 2", {
+            "plt_109l": {"condition": "< 145", "reference_interval": "145 < x < 387.0"},
+        }, True),
+    ]
+    deviating_vars = {'MD1003': ['wbc_109l', 'plt_109l'], 'AB0001': ['plt_109l'], 'ZZ9999': ['wbc_109l']}
+    return DeviationRecords(deviating_vars, alerts, redcap_data, 'record_id')
+
+
+def test_rows_are_assembled_per_study_id():
+    records = make_records()
+
+    assert records.study_ids == ['AB0001', 'MD1003', 'ZZ9999']
+    assert records.rows(1) == [
+        ('wbc_109l', '2.0', '3.5 < x < 12.0', True),
+        ('hgb_gl', 'N/A', '117 < x < 153.0', False),
+        ('plt_109l', '100', '145 < x < 387.0', True),
+    ]
+    assert records.rows(0)[0] == ('wbc_109l', 'N/A', '3.5 < x < 12.0', False)
+    # IDs without an exported record show N/A for every variable
+    assert [row[1] for row in records.rows(2)] == ['N/A', 'N/A', 'N/A']
+    assert records.rows(1) is records.rows(1)
+
+
+def test_find_study_id():
+    records = make_records()
+
+    assert records.find('md1003 ') == 1
+    assert records.find('ZZ9999') == 2
+    assert records.find('3-1502') == -1
+
+
+def test_matrix_marks_deviating_cells():
+    values, deviated = make_records().matrix()
+
+    assert list(values.index) == ['AB0001', 'MD1003', 'ZZ9999']
+    assert list(values.columns) == ['wbc_109l', 'hgb_gl', 'plt_109l']
+    assert values.at['MD1003', 'plt_109l'] == 100
+    assert values.loc['ZZ9999'].isna().all()
+    assert deviated.to_numpy().tolist() == [
+        [False, False, True],
+        [True, False, True],
+        [True, False, False],
+    ]
+
+
+def test_export_csv_and_xlsx(tmp_path):
+    records = make_records()
+
+    records.export(str(tmp_path / "deviations.csv"))
+    exported = pd.read_csv(tmp_path / "deviations.csv", index_col='record_id')
+    assert exported.at['MD1003', 'deviating_variables'] == 'wbc_109l, plt_109l'
+    assert exported.at['AB0001', 'plt_109l'] == 300
+
+    openpyxl = pytest.importorskip("openpyxl")
+    records.export(str(tmp_path / "deviations.xlsx"))
+    sheet = openpyxl.load_workbook(tmp_path / "deviations.xlsx")['Deviations']
+    assert sheet.cell(row=3, column=1).value == 'MD1003'
+    assert sheet.cell(row=3, column=2).font.bold
+    assert not sheet.cell(row=3, column=3).font.bold
+
+
+def test_sort_key_orders_numbers_text_and_missing():
+    assert sorted(['N/A', '10', 'abc', '9.5', 'ABB'], key=sort_key) == ['9.5', '10', 'ABB', 'abc', 'N/A']
+
+
+if __name__ == "__main__":
+    pytest.main()
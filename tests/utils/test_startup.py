@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Everything the menus and the kfcap command import before a feature is used
+STARTUP_MODULES = [
+    "src.cli",
+    "src.utils.alert_handling",
+    "src.utils.jobs",
+    "src.utils.parsing",
+    "src.utils.reader_prep",
+    "src.utils.token_validation",
+]
+# Only loaded once a feature needs them
+LAZY_MODULES = ["pandas", "numpy", "ply", "openpyxl", "requests", "redcap"]
+# Cumulative import time, in microseconds, allowed for STARTUP_MODULES
+STARTUP_BUDGET_US = 500_000
+
+
+def import_times(modules):
+    """
+    Imports modules in a fresh interpreter with -X importtime, returning
+    {module: cumulative microseconds} and the names of all imported modules.
+    """
+    code = f"import sys; import {', '.join(modules)}; print(' '.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=ROOT, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Top level imports are not indented, their cumulative time includes their dependencies
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times, set(result.stdout.split())
+
+
+def test_heavy_dependencies_are_imported_lazily():
+    _, imported = import_times(STARTUP_MODULES)
+
+    assert [name for name in LAZY_MODULES if name in imported] == []
+
+
+def test_startup_imports_stay_within_budget():
+    times, _ = import_times(STARTUP_MODULES)
+
+    total = sum(elapsed for name, elapsed in times.items() if name.split(".")[0] == "src")
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:5]
+    assert total < STARTUP_BUDGET_US, f"Start-up imports took {total} us, slowest: {slowest}"
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,69 @@
+import threading
+import pytest
+from unittest.mock import Mock
+from src.models.session_manager import session_manager
+from src.utils.token_validation import TokenValidator, check_api_token
+from fake_tk import FakeRoot
+
+TOKEN_A = "A" * 32
+TOKEN_B = "B" * 32
+
+
+def test_only_the_last_token_is_checked():
+    root, results = FakeRoot(), []
+    check = Mock(side_effect=lambda token: f"project {token[0]}")
+    validator = TokenValidator(root, lambda *result: results.append(result), check=check)
+
+    validator.validate(TOKEN_A)
+    validator.validate(TOKEN_B)
+    root.run_pending()
+
+    check.assert_called_once_with(TOKEN_B)
+    assert results == [(TOKEN_B, "project B", None)]
+
+
+def test_short_token_is_rejected_without_a_check():
+    root, results = FakeRoot(), []
+    check = Mock()
+    validator = TokenValidator(root, lambda *result: results.append(result), check=check)
+
+    validator.validate("A" * 10)
+
+    check.assert_not_called()
+    assert not root.scheduled
+    assert results[0][:2] == ("A" * 10, None)
+
+
+def test_stale_running_check_is_dropped():
+    root, results = FakeRoot(), []
+    release = threading.Event()
+
+    def check(token):
+        if token == TOKEN_A:
+            release.wait(5)
+            return "project A"
+        raise ValueError("rejected")
+
+    validator = TokenValidator(root, lambda *result: results.append(result), check=check)
+    validator.validate(TOKEN_A)
+    root.run_next()  # check of TOKEN_A is now running on the worker
+
+    validator.validate(TOKEN_B)
+    release.set()
+    root.run_pending()
+
+    assert len(results) == 1
+    token, project, error = results[0]
+    assert (token, project) == (TOKEN_B, None)
+    assert isinstance(error, ValueError)
+
+
+def test_check_api_token_reuses_session_project(monkeypatch):
+    project = Mock(token=TOKEN_A, url='https://redcap.ki.se/api/')
+    monkeypatch.setattr(session_manager, "project_instance", project)
+
+    assert check_api_token(TOKEN_A) is project
+
+
+if __name__ == "__main__":
+    pytest.main()
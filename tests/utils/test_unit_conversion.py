@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.reader_prep import convert_units_OLO, UNIT_CONVERSIONS, UnitConversion
+
+
+def test_source_units_are_converted_and_renamed():
+    df = pd.DataFrame({
+        "sample_id": ["S1", "S2"],
+        "hgb [g/dL]": [13.52, 1.0],
+        "mchc [mmol/L]": [20.1, "x"],
+        "mch [amol]": [1950.0, 30.0],
+        "plt [10^3/uL]": [250.4, np.nan],
+        "hct [%]": [41.234, 38.0],
+        "neut# [10^3/uL]": [3.1, 2.2],
+    })
+
+    result = convert_units_OLO(df)
+
+    assert result.columns.tolist() == [
+        "sample_id", "hgb [g/L]", "mchc [g/L]", "mch [pg]", "plt [10^9/L]", "hct [L/L]", "neut# [10^9/L]"
+    ]
+    assert result["hgb [g/L]"].tolist() == [135, 160]
+    assert result["hgb [g/L]"].dtype == "Int64"
+    assert result["mchc [g/L]"].tolist()[0] == 322
+    assert result["mchc [g/L]"].isna().tolist() == [False, True]
+    assert result["mch [pg]"].tolist() == [30.2, 30.0]
+    assert result["plt [10^9/L]"].tolist()[0] == 250
+    assert result["plt [10^9/L]"].isna().tolist() == [False, True]
+    assert result["hct [L/L]"].tolist() == [0.41, 0.38]
+    assert result["neut# [10^9/L]"].tolist() == [3.1, 2.2]
+
+
+def test_heuristics_leave_unaffected_columns_untouched():
+    df = pd.DataFrame({"mch [pg]": [29, 31]})
+
+    result = convert_units_OLO(df)
+
+    # No value above the threshold, so integers are not turned into floats
+    assert result["mch [pg]"].dtype == np.int64
+    assert result["mch [pg]"].tolist() == [29, 31]
+
+
+def test_new_analytes_only_need_a_table_entry(monkeypatch):
+    conversions = UNIT_CONVERSIONS + [UnitConversion("crp [mg/L]", [("crp [mg/dL]", '*', 10)], None, 0, 'Int64')]
+    monkeypatch.setattr("src.utils.reader_prep.UNIT_CONVERSIONS", conversions)
+
+    result = convert_units_OLO(pd.DataFrame({"crp [mg/dL]": [0.54, 1.2]}))
+
+    assert result["crp [mg/L]"].tolist() == [5, 12]
+
+
+if __name__ == "__main__":
+    pytest.main()